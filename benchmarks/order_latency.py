@@ -0,0 +1,112 @@
+"""Order-submission latency against a local stand-in for the Trading 212 API.
+
+Compares the generic request path (``model_dump`` + ``json=``) with
+``orders.submit`` and shows what a cold connection costs the first order::
+
+    python benchmarks/order_latency.py --iterations 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from t212 import Trading212Client
+from t212._base import _parse_rate_limit
+from t212.models.orders import LimitOrderRequest, Order
+
+ORDER_BODY = json.dumps(
+    {
+        "id": 1,
+        "ticker": "AAPL_US_EQ",
+        "type": "LIMIT",
+        "status": "NEW",
+        "quantity": 1.0,
+        "limitPrice": 150.0,
+        "createdAt": "2024-01-01T00:00:00Z",
+    }
+).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(ORDER_BODY)))
+        self.end_headers()
+        self.wfile.write(ORDER_BODY)
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *_args: object) -> None:
+        pass
+
+
+def _measure(fn: Callable[[], object], iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def _report(name: str, samples: list[float]) -> None:
+    quantiles = statistics.quantiles(samples, n=100)
+    print(
+        f"{name:<28} p50 {quantiles[49]:8.1f} µs   p99 {quantiles[98]:8.1f} µs"
+        f"   n={len(samples)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--cold-samples", type=int, default=20)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    request = LimitOrderRequest(ticker="AAPL_US_EQ", quantity=1.0, limit_price=150.0)
+
+    with Trading212Client("key", "secret", base_url=base_url, low_latency=True) as client:
+        engine = client._engine
+        client.warm()
+
+        def generic() -> object:
+            response = engine.post(
+                "/api/v0/equity/orders/limit",
+                json=request.model_dump(by_alias=True, exclude_none=True),
+            )
+            return Order.model_validate(response.json()), _parse_rate_limit(response.headers)
+
+        _measure(generic, 50)  # warm-up
+        _report("generic path (warm)", _measure(generic, args.iterations))
+        submit = _measure(lambda: client.orders.submit(request), args.iterations)
+        _report("orders.submit (warm)", submit)
+
+    def cold() -> float:
+        with Trading212Client("key", "secret", base_url=base_url) as fresh:
+            start = time.perf_counter()
+            fresh.orders.submit(request)
+            return (time.perf_counter() - start) * 1e6
+
+    cold_samples = [cold() for _ in range(args.cold_samples)]
+    _report("orders.submit (cold)", cold_samples)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,108 @@
 """Trading 212 Public API Python client."""
 
-from ._base import APIResponse, RateLimitInfo
+from ._adaptive import AdaptiveConcurrency
+from ._base import APIResponse
+from ._circuit import CircuitBreaker, CircuitState, CircuitStatus
+from ._metrics import ClientMetrics, ThreadMetrics
+from ._priority import Priority
+from ._ratelimit import (
+    FileRateLimitStore,
+    MemoryRateLimitStore,
+    RateLimitInfo,
+    RateLimitStore,
+    RedisRateLimitStore,
+)
 from ._version import __version__
+from .api.orders import ReplaceResult
+from .brackets import EmulatedOrder, EmulationStatus, OrderEmulator
 from .client import AsyncTrading212Client, Trading212Client
 from .exceptions import (
     AuthenticationError,
+    CircuitOpenError,
     ForbiddenError,
     NotFoundError,
+    PreflightError,
     RateLimitError,
     ServerError,
     TimeoutError,
     Trading212Error,
     ValidationError,
 )
+from .gateway import Gateway
+from .ledger import LedgerEntry, LedgerKind
 from .models.enums import Environment
+from .preflight import InstrumentCatalog, Preflight
+from .scheduler import Feed, PollScheduler, Subscription
+from .simulator import SimulatedExchange
+from .snapshot import AccountSnapshot, TickerView
+from .store import OrderStore
+from .tracking import (
+    AsyncOrderTracker,
+    AsyncPositionsTracker,
+    OrderEvent,
+    OrderEventType,
+    OrderTracker,
+    PortfolioTotals,
+    PositionEvent,
+    PositionEventType,
+    PositionsTracker,
+)
+from .twap import TwapExecutor, TwapOrder, TwapProgress
 
 __all__ = [
     "__version__",
+    "AccountSnapshot",
+    "AdaptiveConcurrency",
     "APIResponse",
+    "AsyncOrderTracker",
+    "AsyncPositionsTracker",
     "AsyncTrading212Client",
     "AuthenticationError",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "CircuitStatus",
+    "ClientMetrics",
+    "EmulatedOrder",
+    "EmulationStatus",
     "Environment",
+    "Feed",
+    "FileRateLimitStore",
     "ForbiddenError",
+    "Gateway",
+    "InstrumentCatalog",
+    "LedgerEntry",
+    "LedgerKind",
+    "MemoryRateLimitStore",
     "NotFoundError",
+    "OrderEmulator",
+    "OrderEvent",
+    "OrderEventType",
+    "OrderStore",
+    "OrderTracker",
+    "PollScheduler",
+    "Priority",
+    "PortfolioTotals",
+    "PositionEvent",
+    "PositionEventType",
+    "PositionsTracker",
+    "Preflight",
+    "PreflightError",
     "RateLimitError",
     "RateLimitInfo",
+    "RateLimitStore",
+    "RedisRateLimitStore",
+    "ReplaceResult",
     "ServerError",
+    "SimulatedExchange",
+    "Subscription",
+    "ThreadMetrics",
+    "TickerView",
     "TimeoutError",
     "Trading212Client",
     "Trading212Error",
+    "TwapExecutor",
+    "TwapOrder",
+    "TwapProgress",
     "ValidationError",
 ]
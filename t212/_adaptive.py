@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+
+from ._ratelimit import RateLimitInfo
+
+# Absolute jitter allowance so sub-millisecond noise on a fast link isn't read as congestion.
+_LATENCY_SLACK = 0.005
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on in-flight requests, driven by latency and the remaining budget.
+
+    While responses are fast and ``x-ratelimit-remaining`` stays above
+    ``healthy_budget_ratio`` of the limit, the limit grows by ``increase`` for every
+    ``limit`` responses completed at full concurrency. A 429, a timeout, or a smoothed
+    latency above ``latency_tolerance`` times the best seen (plus 5ms for jitter)
+    multiplies it by ``decrease``, at most once per round trip. The limit stays within
+    ``[min_limit, max_limit]``.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        healthy_budget_ratio: float = 0.2,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.healthy_budget_ratio = healthy_budget_ratio
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._baseline: float | None = None
+        self._smoothed: float | None = None
+        self._last_decrease = float("-inf")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def on_response(
+        self,
+        latency: float,
+        status_code: int,
+        rate_limit: RateLimitInfo | None,
+        in_flight: int,
+        now: float | None = None,
+    ) -> int:
+        """Feed back one completed request; returns the (possibly new) limit."""
+        now = time.monotonic() if now is None else now
+        if status_code == 429:
+            return self._back_off(now)
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Let the baseline drift up slowly so a faster-than-usual outlier is forgotten.
+            self._baseline += (latency - self._baseline) * 0.01
+        self._smoothed = latency if self._smoothed is None else 0.8 * self._smoothed + 0.2 * latency
+        if self._smoothed > self.latency_tolerance * self._baseline + _LATENCY_SLACK:
+            return self._back_off(now)
+        if not self._budget_healthy(rate_limit) or in_flight < self.limit:
+            return self.limit
+        self._limit = min(self.max_limit, self._limit + self.increase / self._limit)
+        return self.limit
+
+    def on_timeout(self, now: float | None = None) -> int:
+        return self._back_off(time.monotonic() if now is None else now)
+
+    def _budget_healthy(self, rate_limit: RateLimitInfo | None) -> bool:
+        if rate_limit is None or rate_limit.remaining is None or not rate_limit.limit:
+            return True
+        return rate_limit.remaining / rate_limit.limit >= self.healthy_budget_ratio
+
+    def _back_off(self, now: float) -> int:
+        # Responses already in flight when we backed off carry the same signal; skip them.
+        if now - self._last_decrease >= (self._smoothed or 0.0):
+            self._limit = max(float(self.min_limit), self._limit * self.decrease)
+            self._last_decrease = now
+            if self._baseline is not None:
+                self._smoothed = self._baseline
+        return self.limit
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import base64
+import contextlib
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Self, TypeVar
 
 import httpx
 
+from ._adaptive import AdaptiveConcurrency
+from ._circuit import CircuitBreaker, is_failure
+from ._metrics import ClientMetrics, _RequestCounters
+from ._priority import _AsyncPriorityGate, _PriorityGate, request_priority
+from ._ratelimit import MemoryRateLimitStore, RateLimitInfo, RateLimitStore, endpoint_key
+from ._serialize import JSON_HEADERS
 from .exceptions import (
     AuthenticationError,
     ForbiddenError,
@@ -24,14 +36,9 @@ _BASE_URLS = {
     Environment.LIVE: "https://live.trading212.com",
 }
 
-
-@dataclass(frozen=True)
-class RateLimitInfo:
-    limit: int | None
-    period: int | None
-    remaining: int | None
-    reset: int | None
-    used: int | None
+# Low-latency mode: ping the pool often enough that idle connections are never expired.
+_KEEPALIVE_INTERVAL = 15.0
+_KEEPALIVE_EXPIRY = 60.0
 
 
 @dataclass(frozen=True)
@@ -63,6 +70,12 @@ def _parse_rate_limit(headers: httpx.Headers) -> RateLimitInfo:
     )
 
 
+def _record_rate_limit(store: RateLimitStore, key: str, response: httpx.Response) -> None:
+    info = _parse_rate_limit(response.headers)
+    if info.remaining is not None:
+        store.set(key, info)
+
+
 def _raise_for_status(response: httpx.Response) -> None:
     code = response.status_code
     if code == 200:
@@ -88,95 +101,330 @@ def _raise_for_status(response: httpx.Response) -> None:
     response.raise_for_status()
 
 
-class _HttpEngine:
-    """Synchronous HTTP engine backed by httpx."""
+class _Engine(ABC):
+    """What clients and resources need from a synchronous engine.
 
-    def __init__(
-        self,
-        api_key: str,
-        api_secret: str,
-        env: Environment = Environment.DEMO,
-        **httpx_kwargs: Any,
-    ) -> None:
-        base_url = _BASE_URLS[env]
-        self._client = httpx.Client(
-            base_url=base_url,
-            headers={"Authorization": _build_auth_header(api_key, api_secret)},
-            **httpx_kwargs,
-        )
+    Subclasses send requests in :meth:`_request` and provide the limits state below:
+    :class:`_HttpEngine` talks to the API, :class:`~t212.gateway.GatewayEngine` to a
+    local gateway.
+    """
+
+    rate_limit_store: RateLimitStore
+    gate: _PriorityGate
+    circuit_breaker: CircuitBreaker
+    counters: _RequestCounters
 
     def get(self, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
-        response = self._client.get(path, params=params)
-        _raise_for_status(response)
-        return response
+        return self._request("GET", path, params=params)
 
     def post(self, path: str, json: Any = None) -> httpx.Response:
-        response = self._client.post(path, json=json)
-        _raise_for_status(response)
-        return response
+        return self._request("POST", path, json=json)
 
     def put(self, path: str, json: Any = None) -> httpx.Response:
-        response = self._client.put(path, json=json)
-        _raise_for_status(response)
-        return response
+        return self._request("PUT", path, json=json)
 
     def delete(self, path: str) -> httpx.Response:
-        response = self._client.delete(path)
-        _raise_for_status(response)
-        return response
+        return self._request("DELETE", path)
 
-    def close(self) -> None:
-        self._client.close()
+    def post_raw(self, path: str, content: bytes) -> httpx.Response:
+        """POST an already-encoded JSON body."""
+        return self._request("POST", path, content=content, headers=JSON_HEADERS)
+
+    @abstractmethod
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response: ...
+
+    @abstractmethod
+    def warm(self) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
 
-    def __enter__(self) -> _HttpEngine:
+    def metrics(self) -> ClientMetrics:
+        return ClientMetrics(
+            circuits=self.circuit_breaker.status(),
+            max_in_flight=self.gate.max_in_flight,
+            threads=self.counters.snapshot(),
+        )
+
+    def __enter__(self) -> Self:
         return self
 
     def __exit__(self, *_args: Any) -> None:
         self.close()
 
 
-class _AsyncHttpEngine:
-    """Asynchronous HTTP engine backed by httpx."""
+class _AsyncEngine(ABC):
+    """What clients and resources need from an asynchronous engine; see :class:`_Engine`."""
+
+    rate_limit_store: RateLimitStore
+    gate: _AsyncPriorityGate
+    circuit_breaker: CircuitBreaker
+    counters: _RequestCounters
+
+    async def get(self, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
+        return await self._request("GET", path, params=params)
+
+    async def post(self, path: str, json: Any = None) -> httpx.Response:
+        return await self._request("POST", path, json=json)
+
+    async def put(self, path: str, json: Any = None) -> httpx.Response:
+        return await self._request("PUT", path, json=json)
+
+    async def delete(self, path: str) -> httpx.Response:
+        return await self._request("DELETE", path)
+
+    async def post_raw(self, path: str, content: bytes) -> httpx.Response:
+        """POST an already-encoded JSON body."""
+        return await self._request("POST", path, content=content, headers=JSON_HEADERS)
+
+    @abstractmethod
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response: ...
+
+    @abstractmethod
+    async def warm(self) -> None: ...
+
+    @abstractmethod
+    async def aclose(self) -> None: ...
+
+    def metrics(self) -> ClientMetrics:
+        return ClientMetrics(
+            circuits=self.circuit_breaker.status(),
+            max_in_flight=self.gate.max_in_flight,
+            threads=self.counters.snapshot(),
+        )
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        await self.aclose()
+
+
+class _HttpEngine(_Engine):
+    """Synchronous HTTP engine backed by httpx.
+
+    Requests pass through a priority gate (see :class:`~t212.Priority`); set
+    ``max_in_flight`` to also cap the number of concurrent requests. Before sending, the
+    engine claims a request from ``rate_limit_store`` and sleeps until the window resets
+    if the endpoint's budget is exhausted. Requests to an endpoint whose circuit is open
+    (see :class:`~t212.CircuitBreaker`) fail fast with :class:`~t212.CircuitOpenError`.
+    """
 
     def __init__(
         self,
         api_key: str,
         api_secret: str,
         env: Environment = Environment.DEMO,
+        max_in_flight: int | None = None,
+        rate_limit_store: RateLimitStore | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        low_latency: bool = False,
         **httpx_kwargs: Any,
     ) -> None:
-        base_url = _BASE_URLS[env]
-        self._client = httpx.AsyncClient(
-            base_url=base_url,
-            headers={"Authorization": _build_auth_header(api_key, api_secret)},
+        self._client_kwargs: dict[str, Any] = {
+            "base_url": _BASE_URLS[env],
+            "headers": {"Authorization": _build_auth_header(api_key, api_secret)},
             **httpx_kwargs,
-        )
-
-    async def get(self, path: str, params: dict[str, Any] | None = None) -> httpx.Response:
-        response = await self._client.get(path, params=params)
+        }
+        if low_latency:
+            limits = httpx.Limits(keepalive_expiry=_KEEPALIVE_EXPIRY)
+            self._client_kwargs.setdefault("limits", limits)
+        self.low_latency = low_latency
+        self._client = httpx.Client(**self._client_kwargs)
+        self._pid = os.getpid()
+        self.rate_limit_store = rate_limit_store or MemoryRateLimitStore()
+        self.gate = _PriorityGate(max_in_flight)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.counters = _RequestCounters()
+        self._closed = threading.Event()
+        self._keepalive_thread: threading.Thread | None = None
+        if low_latency:
+            self._start_keepalive()
+
+    def warm(self) -> None:
+        """Open a pooled connection now so the next request skips DNS, TCP and TLS setup."""
+        with contextlib.suppress(httpx.HTTPError):
+            self._client.head("/")
+
+    def _start_keepalive(self) -> None:
+        thread = threading.Thread(target=self._keepalive, name="t212-keepalive", daemon=True)
+        self._keepalive_thread = thread
+        thread.start()
+
+    def _keepalive(self) -> None:
+        self.warm()
+        while not self._closed.wait(_KEEPALIVE_INTERVAL):
+            self.warm()
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+        key = endpoint_key(method, path)
+        probe = self.circuit_breaker.before(key)
+        failed: bool | None = None
+        started: float | None = None
+        try:
+            with self.gate.slot(request_priority(key)):
+                delay = self.rate_limit_store.consume(key, time.time())
+                if delay > 0:
+                    time.sleep(delay)
+                started = time.monotonic()
+                response = self._client.request(method, path, **kwargs)
+            self.counters.record(time.monotonic() - started, response.status_code != 200)
+            failed = is_failure(response.status_code)
+        except httpx.TransportError:
+            failed = True
+            if started is not None:
+                self.counters.record(time.monotonic() - started, True)
+            raise
+        finally:
+            self.circuit_breaker.record(key, failed, probe)
+        _record_rate_limit(self.rate_limit_store, key, response)
         _raise_for_status(response)
         return response
 
-    async def post(self, path: str, json: Any = None) -> httpx.Response:
-        response = await self._client.post(path, json=json)
-        _raise_for_status(response)
-        return response
+    def _reset_after_fork(self) -> None:
+        # The parent's connection pool and locks must not be shared with a forked child.
+        self._pid = os.getpid()
+        self._client = httpx.Client(**self._client_kwargs)
+        self.gate = _PriorityGate(self.gate.max_in_flight)
+        self.rate_limit_store.reset_after_fork()
+        self.circuit_breaker.reset_after_fork()
+        self.counters = _RequestCounters()
+        if self.low_latency:
+            self._start_keepalive()
 
-    async def put(self, path: str, json: Any = None) -> httpx.Response:
-        response = await self._client.put(path, json=json)
-        _raise_for_status(response)
-        return response
+    def close(self) -> None:
+        self._closed.set()
+        # Let a warm() in progress finish before its client is closed under it.
+        thread = self._keepalive_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._client.close()
 
-    async def delete(self, path: str) -> httpx.Response:
-        response = await self._client.delete(path)
+
+class _AsyncHttpEngine(_AsyncEngine):
+    """Asynchronous HTTP engine backed by httpx.
+
+    Requests pass through a priority gate (see :class:`~t212.Priority`); set
+    ``max_in_flight`` to also cap the number of concurrent requests. Before sending, the
+    engine claims a request from ``rate_limit_store`` and sleeps until the window resets
+    if the endpoint's budget is exhausted. Requests to an endpoint whose circuit is open
+    (see :class:`~t212.CircuitBreaker`) fail fast with :class:`~t212.CircuitOpenError`.
+    With ``adaptive_concurrency`` the in-flight cap is tuned from each response instead
+    (see :class:`~t212.AdaptiveConcurrency`), with ``max_in_flight`` as its ceiling.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        env: Environment = Environment.DEMO,
+        max_in_flight: int | None = None,
+        rate_limit_store: RateLimitStore | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        low_latency: bool = False,
+        adaptive_concurrency: AdaptiveConcurrency | None = None,
+        **httpx_kwargs: Any,
+    ) -> None:
+        self._client_kwargs: dict[str, Any] = {
+            "base_url": _BASE_URLS[env],
+            "headers": {"Authorization": _build_auth_header(api_key, api_secret)},
+            **httpx_kwargs,
+        }
+        if low_latency:
+            limits = httpx.Limits(keepalive_expiry=_KEEPALIVE_EXPIRY)
+            self._client_kwargs.setdefault("limits", limits)
+        self.low_latency = low_latency
+        self._client = httpx.AsyncClient(**self._client_kwargs)
+        self._pid = os.getpid()
+        self.rate_limit_store = rate_limit_store or MemoryRateLimitStore()
+        self.adaptive = adaptive_concurrency
+        if adaptive_concurrency is not None:
+            if max_in_flight is not None:
+                adaptive_concurrency.max_limit = min(adaptive_concurrency.max_limit, max_in_flight)
+            max_in_flight = adaptive_concurrency.limit
+        self.gate = _AsyncPriorityGate(max_in_flight)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.counters = _RequestCounters()
+        self._keepalive_task: asyncio.Task[None] | None = None
+
+    async def warm(self) -> None:
+        """Open a pooled connection now so the next request skips DNS, TCP and TLS setup.
+
+        In low-latency mode this also starts the keep-alive pings, which otherwise begin
+        with the first request.
+        """
+        if self.low_latency and self._keepalive_task is None:
+            self._keepalive_task = asyncio.get_running_loop().create_task(self._keepalive())
+        with contextlib.suppress(httpx.HTTPError):
+            await self._client.head("/")
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(_KEEPALIVE_INTERVAL)
+            with contextlib.suppress(httpx.HTTPError):
+                await self._client.head("/")
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+        if self.low_latency and self._keepalive_task is None:
+            self._keepalive_task = asyncio.get_running_loop().create_task(self._keepalive())
+        key = endpoint_key(method, path)
+        probe = self.circuit_breaker.before(key)
+        failed: bool | None = None
+        started: float | None = None
+        try:
+            async with self.gate.slot(request_priority(key)):
+                delay = self.rate_limit_store.consume(key, time.time())
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                started = time.monotonic()
+                response = await self._client.request(method, path, **kwargs)
+                latency = time.monotonic() - started
+                if self.adaptive is not None:
+                    await self._adapt(latency, response)
+            self.counters.record(latency, response.status_code != 200)
+            failed = is_failure(response.status_code)
+        except httpx.TransportError as exc:
+            failed = True
+            if started is not None:
+                self.counters.record(time.monotonic() - started, True)
+            if self.adaptive is not None and isinstance(exc, httpx.TimeoutException):
+                await self.gate.set_capacity(self.adaptive.on_timeout())
+            raise
+        finally:
+            self.circuit_breaker.record(key, failed, probe)
+        _record_rate_limit(self.rate_limit_store, key, response)
         _raise_for_status(response)
         return response
 
+    async def _adapt(self, latency: float, response: httpx.Response) -> None:
+        assert self.adaptive is not None
+        limit = self.adaptive.on_response(
+            latency,
+            response.status_code,
+            _parse_rate_limit(response.headers),
+            in_flight=self.gate.in_flight,
+        )
+        if limit != self.gate.max_in_flight:
+            await self.gate.set_capacity(limit)
+
+    def _reset_after_fork(self) -> None:
+        # The parent's connection pool and locks must not be shared with a forked child.
+        self._pid = os.getpid()
+        self._client = httpx.AsyncClient(**self._client_kwargs)
+        self.gate = _AsyncPriorityGate(self.gate.max_in_flight)
+        self.rate_limit_store.reset_after_fork()
+        self.circuit_breaker.reset_after_fork()
+        self.counters = _RequestCounters()
+        self._keepalive_task = None
+
     async def aclose(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._keepalive_task
+            self._keepalive_task = None
         await self._client.aclose()
-
-    async def __aenter__(self) -> _AsyncHttpEngine:
-        return self
-
-    async def __aexit__(self, *_args: Any) -> None:
-        await self.aclose()
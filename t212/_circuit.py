@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import StrEnum
+
+from .exceptions import CircuitOpenError
+
+
+class CircuitState(StrEnum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+@dataclass(frozen=True)
+class CircuitStatus:
+    state: CircuitState
+    requests: int
+    failures: int
+    trips: int
+    retry_after: float | None
+
+
+@dataclass
+class _Circuit:
+    outcomes: deque[bool]
+    state: CircuitState = CircuitState.CLOSED
+    opened_at: float = 0.0
+    probes: int = 0
+    probe_successes: int = 0
+    trips: int = 0
+
+
+def is_failure(status_code: int) -> bool:
+    """Whether a response counts against an endpoint's circuit (5xx and 408)."""
+    return status_code >= 500 or status_code == 408
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker shared by an engine's requests.
+
+    An endpoint's circuit opens once at least ``min_requests`` of its last ``window``
+    responses were seen and ``failure_rate`` of them were server errors, timeouts or
+    transport failures. While open, requests fail fast with
+    :class:`~t212.CircuitOpenError`. After ``reset_timeout`` seconds the circuit is
+    half-open and up to ``half_open_probes`` requests are let through; it closes once
+    that many succeed and re-opens on the first failure. Rate limiting (429) and
+    client errors never count as failures.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window: int = 20,
+        min_requests: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def before(self, key: str) -> bool:
+        """Admit a request to ``key`` or raise; returns whether it is a half-open probe."""
+        circuit = self._circuits.get(key)
+        if circuit is None or circuit.state is CircuitState.CLOSED:
+            return False  # the common case needs no lock
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state is CircuitState.CLOSED:
+                return False
+            now = time.monotonic()
+            if circuit.state is CircuitState.OPEN:
+                retry_after = circuit.opened_at + self.reset_timeout - now
+                if retry_after > 0:
+                    raise CircuitOpenError(key, retry_after)
+                circuit.state = CircuitState.HALF_OPEN
+                circuit.probes = circuit.probe_successes = 0
+            if circuit.probes + circuit.probe_successes >= self.half_open_probes:
+                raise CircuitOpenError(key, 0.0)
+            circuit.probes += 1
+            return True
+
+    def record(self, key: str, failed: bool | None, probe: bool = False) -> None:
+        """Record a request's outcome; ``failed=None`` means it never completed."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                circuit = self._circuits[key] = _Circuit(deque(maxlen=self.window))
+            if probe:
+                circuit.probes -= 1
+                if failed:
+                    self._trip(circuit)
+                elif failed is False:
+                    circuit.probe_successes += 1
+                    if circuit.probe_successes >= self.half_open_probes:
+                        circuit.state = CircuitState.CLOSED
+                        circuit.outcomes.clear()
+                return
+            if failed is None or circuit.state is not CircuitState.CLOSED:
+                return
+            circuit.outcomes.append(failed)
+            requests = len(circuit.outcomes)
+            if (
+                requests >= self.min_requests
+                and sum(circuit.outcomes) >= self.failure_rate * requests
+            ):
+                self._trip(circuit)
+
+    def _trip(self, circuit: _Circuit) -> None:
+        circuit.state = CircuitState.OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.trips += 1
+        circuit.outcomes.clear()
+
+    def state(self, key: str) -> CircuitState:
+        circuit = self._circuits.get(key)
+        return circuit.state if circuit else CircuitState.CLOSED
+
+    def status(self) -> dict[str, CircuitStatus]:
+        """Current state of every endpoint seen so far."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: CircuitStatus(
+                    state=circuit.state,
+                    requests=len(circuit.outcomes),
+                    failures=sum(circuit.outcomes),
+                    trips=circuit.trips,
+                    retry_after=(
+                        max(0.0, circuit.opened_at + self.reset_timeout - now)
+                        if circuit.state is CircuitState.OPEN
+                        else None
+                    ),
+                )
+                for key, circuit in self._circuits.items()
+            }
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
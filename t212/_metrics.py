@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+
+from ._circuit import CircuitStatus
+
+
+@dataclass(frozen=True)
+class ThreadMetrics:
+    requests: int
+    errors: int
+    total_latency: float
+
+    @property
+    def mean_latency(self) -> float | None:
+        return self.total_latency / self.requests if self.requests else None
+
+
+@dataclass(frozen=True)
+class ClientMetrics:
+    """Point-in-time view of an engine's internal state, from ``client.metrics()``."""
+
+    circuits: dict[str, CircuitStatus]
+    max_in_flight: int | None = None
+    threads: dict[str, ThreadMetrics] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return sum(t.requests for t in self.threads.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(t.errors for t in self.threads.values())
+
+
+class _Counter:
+    __slots__ = ("name", "requests", "errors", "total_latency")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+
+
+class _RequestCounters:
+    """Request counters kept per thread: each thread only writes its own, so no locking."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._counters: list[_Counter] = []
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, error: bool) -> None:
+        counter: _Counter | None = getattr(self._local, "counter", None)
+        if counter is None:
+            counter = self._local.counter = _Counter(threading.current_thread().name)
+            with self._lock:
+                self._counters.append(counter)
+        counter.requests += 1
+        counter.errors += error
+        counter.total_latency += latency
+
+    def snapshot(self) -> dict[str, ThreadMetrics]:
+        with self._lock:
+            counters = list(self._counters)
+        threads: dict[str, ThreadMetrics] = {}
+        for c in counters:
+            seen = threads.get(c.name)
+            threads[c.name] = ThreadMetrics(
+                requests=c.requests + (seen.requests if seen else 0),
+                errors=c.errors + (seen.errors if seen else 0),
+                total_latency=c.total_latency + (seen.total_latency if seen else 0.0),
+            )
+        return threads
@@ -5,13 +5,13 @@ from typing import Any, TypeVar
 
 from pydantic import BaseModel
 
-from ._base import _AsyncHttpEngine, _HttpEngine
+from ._base import _AsyncEngine, _Engine
 
 T = TypeVar("T", bound=BaseModel)
 
 
 def paginate_sync(
-    engine: _HttpEngine,
+    engine: _Engine,
     path: str,
     item_type: type[T],
     params: dict[str, Any] | None = None,
@@ -34,7 +34,7 @@ def paginate_sync(
 
 
 async def paginate_async(
-    engine: _AsyncHttpEngine,
+    engine: _AsyncEngine,
     path: str,
     item_type: type[T],
     params: dict[str, Any] | None = None,
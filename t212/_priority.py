@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+from collections.abc import AsyncIterator, Iterator
+from contextvars import ContextVar
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """Request priority classes; lower values are served first."""
+
+    CRITICAL = 0
+    NORMAL = 1
+    BULK = 2
+
+
+_override: ContextVar[Priority | None] = ContextVar("t212_priority", default=None)
+
+
+def classify(key: str) -> Priority:
+    """Default priority for an ``endpoint_key``: order placement and cancellation are
+    critical; history, exports and instrument metadata are bulk; everything else is normal.
+    """
+    method, path = key.split(" ", 1)
+    if path.startswith("/api/v0/equity/orders") and method in ("POST", "DELETE"):
+        return Priority.CRITICAL
+    if path.startswith(("/api/v0/equity/history", "/api/v0/equity/metadata")):
+        return Priority.BULK
+    return Priority.NORMAL
+
+
+def request_priority(key: str) -> Priority:
+    override = _override.get()
+    return classify(key) if override is None else override
+
+
+@contextlib.contextmanager
+def prioritized(priority: Priority) -> Iterator[None]:
+    """Send every request made in this context (thread or task) with ``priority``."""
+    token = _override.set(priority)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+class _GateState:
+    """Admission bookkeeping shared by the sync and async gates.
+
+    A request may start only when no higher-priority request is waiting. With
+    ``max_in_flight`` set, non-critical requests are also kept out of the slots held by
+    :meth:`reserve`; without it a reservation simply pauses bulk requests.
+    """
+
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.reserved = 0
+        self.waiting = [0] * len(Priority)
+
+    def _can_start(self, priority: Priority) -> bool:
+        if any(self.waiting[:priority]):
+            return False
+        limit = self.max_in_flight
+        if priority is not Priority.CRITICAL and self.reserved:
+            if limit is None:
+                return priority is not Priority.BULK
+            limit -= self.reserved
+        return limit is None or self.in_flight < limit
+
+
+class _PriorityGate(_GateState):
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        super().__init__(max_in_flight)
+        self._cond = threading.Condition()
+
+    @contextlib.contextmanager
+    def slot(self, priority: Priority) -> Iterator[None]:
+        if self.max_in_flight is None and not self.reserved:
+            # Uncapped and unreserved: there is nothing to arbitrate, so skip the lock.
+            # in_flight is only tracked while a cap or reservation is in force.
+            yield
+            return
+        with self._cond:
+            if not self._can_start(priority):
+                self.waiting[priority] += 1
+                try:
+                    self._cond.wait_for(lambda: self._can_start(priority))
+                finally:
+                    self.waiting[priority] -= 1
+                # Let lower-priority waiters re-check now that we are no longer queued.
+                self._cond.notify_all()
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def reserve(self, slots: int = 1) -> Iterator[None]:
+        with self._cond:
+            self.reserved += slots
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.reserved -= slots
+                self._cond.notify_all()
+
+    def set_capacity(self, max_in_flight: int | None) -> None:
+        with self._cond:
+            self.max_in_flight = max_in_flight
+            self._cond.notify_all()
+
+
+class _AsyncPriorityGate(_GateState):
+    def __init__(self, max_in_flight: int | None = None) -> None:
+        super().__init__(max_in_flight)
+        self._cond = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        if self._can_start(priority):
+            self.in_flight += 1
+        else:
+            async with self._cond:
+                self.waiting[priority] += 1
+                try:
+                    await self._cond.wait_for(lambda: self._can_start(priority))
+                finally:
+                    self.waiting[priority] -= 1
+                self.in_flight += 1
+                self._cond.notify_all()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            await self._notify()
+
+    @contextlib.asynccontextmanager
+    async def reserve(self, slots: int = 1) -> AsyncIterator[None]:
+        self.reserved += slots
+        try:
+            yield
+        finally:
+            self.reserved -= slots
+            await self._notify()
+
+    async def set_capacity(self, max_in_flight: int | None) -> None:
+        self.max_in_flight = max_in_flight
+        await self._notify()
+
+    async def _notify(self) -> None:
+        if any(self.waiting):
+            async with self._cond:
+                self._cond.notify_all()
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+
+@dataclass(frozen=True)
+class RateLimitInfo:
+    limit: int | None
+    period: int | None
+    remaining: int | None
+    reset: int | None
+    used: int | None
+
+
+@dataclass(frozen=True)
+class EndpointLimit:
+    requests: int
+    period: float
+
+    @property
+    def interval(self) -> float:
+        """Minimum spacing between evenly paced requests, in seconds."""
+        return self.period / self.requests
+
+
+# Published per-account limits, from the endpoint reference in spec/api.yaml.
+_ENDPOINT_LIMITS: dict[str, EndpointLimit] = {
+    "GET /api/v0/equity/account/summary": EndpointLimit(1, 5),
+    "GET /api/v0/equity/history/dividends": EndpointLimit(6, 60),
+    "GET /api/v0/equity/history/exports": EndpointLimit(1, 60),
+    "POST /api/v0/equity/history/exports": EndpointLimit(1, 30),
+    "GET /api/v0/equity/history/orders": EndpointLimit(6, 60),
+    "GET /api/v0/equity/history/transactions": EndpointLimit(6, 60),
+    "GET /api/v0/equity/metadata/exchanges": EndpointLimit(1, 30),
+    "GET /api/v0/equity/metadata/instruments": EndpointLimit(1, 50),
+    "GET /api/v0/equity/orders": EndpointLimit(1, 5),
+    "POST /api/v0/equity/orders/limit": EndpointLimit(1, 2),
+    "POST /api/v0/equity/orders/market": EndpointLimit(50, 60),
+    "POST /api/v0/equity/orders/stop": EndpointLimit(1, 2),
+    "POST /api/v0/equity/orders/stop_limit": EndpointLimit(1, 2),
+    "DELETE /api/v0/equity/orders/{id}": EndpointLimit(50, 60),
+    "GET /api/v0/equity/orders/{id}": EndpointLimit(1, 1),
+    "GET /api/v0/equity/pies": EndpointLimit(1, 30),
+    "POST /api/v0/equity/pies": EndpointLimit(1, 5),
+    "DELETE /api/v0/equity/pies/{id}": EndpointLimit(1, 5),
+    "GET /api/v0/equity/pies/{id}": EndpointLimit(1, 5),
+    "POST /api/v0/equity/pies/{id}": EndpointLimit(1, 5),
+    "POST /api/v0/equity/pies/{id}/duplicate": EndpointLimit(1, 5),
+    "GET /api/v0/equity/positions": EndpointLimit(1, 1),
+}
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Normalise a request to its endpoint, e.g. ``GET /api/v0/equity/orders/{id}``."""
+    path = path.split("?", 1)[0]
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+def endpoint_limit(key: str) -> EndpointLimit | None:
+    return _ENDPOINT_LIMITS.get(key)
+
+
+def _claim(info: RateLimitInfo | None, now: float) -> tuple[RateLimitInfo | None, float]:
+    """Take one request from a window: the updated state and how long to wait first."""
+    if info is None or info.remaining is None:
+        return info, 0.0
+    if info.reset is not None and info.reset <= now:
+        return None, 0.0
+    if info.remaining > 0:
+        used = None if info.used is None else info.used + 1
+        return replace(info, remaining=info.remaining - 1, used=used), 0.0
+    return info, 0.0 if info.reset is None else info.reset - now
+
+
+class RateLimitStore(ABC):
+    """Where engines keep the last rate-limit state seen for each endpoint.
+
+    Engines call :meth:`consume` before every request and :meth:`set` with the headers of
+    every response. Subclasses implement :meth:`get` and :meth:`set`; backends shared
+    between processes should also override :meth:`consume` to make it atomic.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> RateLimitInfo | None: ...
+
+    @abstractmethod
+    def set(self, key: str, info: RateLimitInfo) -> None: ...
+
+    def consume(self, key: str, now: float) -> float:
+        """Claim one request for ``key``; return the seconds to wait before sending it."""
+        info, delay = _claim(self.get(key), now)
+        if info is not None:
+            self.set(key, info)
+        return delay
+
+    def reset_after_fork(self) -> None:
+        """Drop per-process state (e.g. locks) inherited across ``os.fork()``."""
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Per-process store; the default."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, RateLimitInfo] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> RateLimitInfo | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, info: RateLimitInfo) -> None:
+        self._entries[key] = info
+
+    def consume(self, key: str, now: float) -> float:
+        info = self._entries.get(key)
+        if info is None or info.remaining is None:
+            return 0.0  # nothing to claim from, so no lock needed
+        with self._lock:
+            return super().consume(key, now)
+
+    def reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+
+class FileRateLimitStore(RateLimitStore):
+    """JSON file shared by every process on the host, guarded by ``flock``.
+
+    The file outlives the processes using it, so a restarted worker starts from the
+    budget the account actually has left rather than bursting into 429s.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+
+    def get(self, key: str) -> RateLimitInfo | None:
+        with self._locked() as entries:
+            return entries.get(key)
+
+    def set(self, key: str, info: RateLimitInfo) -> None:
+        with self._locked(write=True) as entries:
+            entries[key] = info
+
+    def consume(self, key: str, now: float) -> float:
+        with self._locked(write=True) as entries:
+            info, delay = _claim(entries.get(key), now)
+            if info is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = info
+            return delay
+
+    @contextlib.contextmanager
+    def _locked(self, write: bool = False) -> Iterator[dict[str, RateLimitInfo]]:
+        import fcntl  # POSIX only; imported here so the module still loads elsewhere
+
+        with open(self.path + ".lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                entries = self._read()
+                yield entries
+                if write:
+                    self._write(entries)
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> dict[str, RateLimitInfo]:
+        try:
+            with open(self.path) as f:
+                raw = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {key: RateLimitInfo(**value) for key, value in raw.items()}
+
+    def _write(self, entries: dict[str, RateLimitInfo]) -> None:
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({key: asdict(info) for key, info in entries.items()}, f)
+        os.replace(tmp, self.path)
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """Store backed by a Redis-compatible client, for workers spread over several hosts.
+
+    ``client`` needs ``get(name)`` and ``set(name, value, ex=seconds)`` as in redis-py.
+    :meth:`consume` is a read-then-write here, so concurrent workers may occasionally
+    both claim the last request of a window.
+    """
+
+    def __init__(self, client: Any, prefix: str = "t212:ratelimit:") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    def get(self, key: str) -> RateLimitInfo | None:
+        raw = self._client.get(self._prefix + key)
+        if raw is None:
+            return None
+        return RateLimitInfo(**json.loads(raw))
+
+    def set(self, key: str, info: RateLimitInfo) -> None:
+        # Expire with the window so a stale entry never throttles a fresh one.
+        ttl = info.reset - int(time.time()) if info.reset is not None else info.period or 60
+        ttl = max(1, ttl)
+        self._client.set(self._prefix + key, json.dumps(asdict(info)), ex=ttl)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+
+from pydantic import BaseModel
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+@functools.cache
+def _encoder(model: type[BaseModel]) -> Callable[[BaseModel], bytes]:
+    # Bind the model's compiled serializer once; skips model_dump's dict + json.dumps.
+    return functools.partial(
+        model.__pydantic_serializer__.to_json, by_alias=True, exclude_none=True
+    )
+
+
+def encode(request: BaseModel) -> bytes:
+    """Serialise a request model to the JSON body the API expects."""
+    return _encoder(type(request))(request)
@@ -0,0 +1,43 @@
+"""Columnar analytics over account history.
+
+Requires numpy: ``pip install 't212-api[analytics]'``.
+"""
+
+try:
+    import numpy  # noqa: F401
+except ImportError as exc:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "t212.analytics requires numpy; install it with pip install 't212-api[analytics]'"
+    ) from exc
+
+from .dividends import DividendAggregator, DividendTable
+from .execution import ExecutionStats, ExecutionTable
+from .exposure import Concentration, Exposure, ExposureEngine
+from .fees import FeeLedger
+from .fills import FillTable
+from .lots import CostMethod, LotEngine, LotReport, OpenLots, RealizedLots, compute_lots
+from .performance import DailySeries, PerformanceEngine, compute_performance
+from .rebalance import RebalancePlan, Rebalancer
+
+__all__ = [
+    "Concentration",
+    "CostMethod",
+    "DailySeries",
+    "DividendAggregator",
+    "DividendTable",
+    "ExecutionStats",
+    "ExecutionTable",
+    "Exposure",
+    "ExposureEngine",
+    "FeeLedger",
+    "FillTable",
+    "LotEngine",
+    "LotReport",
+    "OpenLots",
+    "PerformanceEngine",
+    "RealizedLots",
+    "RebalancePlan",
+    "Rebalancer",
+    "compute_lots",
+    "compute_performance",
+]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+_NAT = np.iinfo(np.int64).min
+
+
+def timestamps(values: Iterable[datetime | None]) -> npt.NDArray[np.datetime64]:
+    """UTC ``datetime64[us]`` column; ``None`` (and naive values are taken as UTC) → NaT."""
+    micros = [
+        _NAT
+        if v is None
+        else int((v if v.tzinfo else v.replace(tzinfo=UTC)).timestamp() * 1_000_000)
+        for v in values
+    ]
+    return np.array(micros, dtype=np.int64).view("datetime64[us]")
+
+
+def floats(values: Iterable[float | None]) -> npt.NDArray[np.float64]:
+    """``float64`` column; ``None`` → NaN."""
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def labels(values: Iterable[str | None]) -> npt.NDArray[np.str_]:
+    """String column; ``None`` → ``""``."""
+    return np.array([v or "" for v in values], dtype=np.str_)
+
+
+def group(
+    keys: Sequence[npt.NDArray[Any]],
+) -> tuple[list[tuple[Any, ...]], npt.NDArray[np.intp]]:
+    """Distinct combinations of the ``keys`` columns, and each row's index into them."""
+    uniques: list[npt.NDArray[Any]] = []
+    codes: list[npt.NDArray[np.intp]] = []
+    for column in keys:
+        unique, inverse = np.unique(column, return_inverse=True)
+        uniques.append(unique)
+        codes.append(inverse.reshape(-1))
+    flat = np.ravel_multi_index(codes, [len(u) for u in uniques])
+    groups, inverse = np.unique(flat, return_inverse=True)
+    index = np.unravel_index(groups, [len(u) for u in uniques])
+    names = zip(*(u[i].tolist() for u, i in zip(uniques, index, strict=True)), strict=True)
+    return list(names), inverse.reshape(-1)
+
+
+def sum_by(
+    keys: Sequence[npt.NDArray[Any]], values: npt.NDArray[np.float64]
+) -> dict[tuple[Any, ...], float]:
+    """Sum ``values`` per distinct combination of the ``keys`` columns, in one pass."""
+    if not len(values):
+        return {}
+    if not keys:
+        return {(): float(values.sum())}
+    names, inverse = group(keys)
+    totals = np.bincount(inverse, weights=values, minlength=len(names))
+    return dict(zip(names, totals.tolist(), strict=True))
+
+
+def truncate(times: npt.NDArray[np.datetime64], period: str) -> npt.NDArray[np.datetime64]:
+    """Round timestamps down to their period: ``"D"``, ``"W"`` (Mondays), ``"M"`` or ``"Y"``."""
+    if period == "W":
+        # datetime64 weeks start on Thursdays (the epoch); shift so they start on Mondays.
+        days = times.astype("datetime64[D]")
+        offset = ((days.view(np.int64) - 4) % 7).astype("timedelta64[D]")
+        monday: npt.NDArray[np.datetime64] = days - offset
+        return monday
+    return times.astype(f"datetime64[{period}]")
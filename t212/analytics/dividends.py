@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime, timedelta
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from ..models.history import HistoryDividendItem
+from ._columns import floats, labels, sum_by, timestamps, truncate
+
+DividendKey = Literal["ticker", "type", "currency", "period"]
+
+
+@dataclass(frozen=True)
+class DividendTable:
+    """Dividend payments as columns, one row per payment.
+
+    ``amount`` is what was received, in the account ``currency``;
+    ``gross_amount_per_share`` is in the instrument's ``ticker_currency``.
+    """
+
+    reference: npt.NDArray[np.str_]
+    ticker: npt.NDArray[np.str_]
+    type: npt.NDArray[np.str_]
+    paid_on: npt.NDArray[np.datetime64]
+    quantity: npt.NDArray[np.float64]
+    amount: npt.NDArray[np.float64]
+    amount_in_euro: npt.NDArray[np.float64]
+    gross_amount_per_share: npt.NDArray[np.float64]
+    currency: npt.NDArray[np.str_]
+    ticker_currency: npt.NDArray[np.str_]
+
+    @classmethod
+    def from_history(cls, items: Iterable[HistoryDividendItem]) -> DividendTable:
+        rows = list(items)
+        return cls(
+            reference=labels(d.reference for d in rows),
+            ticker=labels(d.ticker for d in rows),
+            type=labels(d.type for d in rows),
+            paid_on=timestamps(d.paid_on for d in rows),
+            quantity=floats(d.quantity for d in rows),
+            amount=floats(d.amount for d in rows),
+            amount_in_euro=floats(d.amount_in_euro for d in rows),
+            gross_amount_per_share=floats(d.gross_amount_per_share for d in rows),
+            currency=labels(d.currency for d in rows),
+            ticker_currency=labels(d.ticker_currency for d in rows),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence[DividendTable]) -> DividendTable:
+        return cls(
+            **{f.name: np.concatenate([getattr(t, f.name) for t in tables]) for f in fields(cls)}
+        )
+
+    def __len__(self) -> int:
+        return len(self.reference)
+
+    @property
+    def gross(self) -> npt.NDArray[np.float64]:
+        """Gross payment in the instrument's currency."""
+        return self.gross_amount_per_share * self.quantity
+
+    def total_by(self, *keys: DividendKey, period: str = "M") -> dict[tuple[Any, ...], float]:
+        """Total ``amount`` received per combination of ``keys``.
+
+        ``"period"`` groups by ``paid_on`` rounded down to ``period`` (``"D"``, ``"W"``,
+        ``"M"`` or ``"Y"``), labelled with the period's first day.
+        """
+        columns = {
+            "ticker": self.ticker,
+            "type": self.type,
+            "currency": self.currency,
+            "period": truncate(self.paid_on, period),
+        }
+        return sum_by([columns[key] for key in keys], np.nan_to_num(self.amount))
+
+    def withheld(self, fx_rates: Mapping[str, float] | None = None) -> npt.NDArray[np.float64]:
+        """Estimated tax withheld from each payment, in the account currency.
+
+        The gross payment is converted with ``fx_rates[ticker_currency]`` (account
+        currency per unit) when it differs from the account currency; payments with no
+        rate are NaN.
+        """
+        rates = fx_rates or {}
+        same = self.ticker_currency == self.currency
+        rate = np.array([rates.get(c, np.nan) for c in self.ticker_currency.tolist()])
+        gross = self.gross * np.where(same, 1.0, rate)
+        withheld: npt.NDArray[np.float64] = gross - self.amount
+        return withheld
+
+    def withholding_rate(self, fx_rates: Mapping[str, float] | None = None) -> dict[str, float]:
+        """Effective withholding rate per ticker over the payments it can be estimated for."""
+        withheld = self.withheld(fx_rates)
+        known = ~np.isnan(withheld)
+        gross = withheld + self.amount
+        taken = sum_by([self.ticker[known]], withheld[known])
+        paid = sum_by([self.ticker[known]], gross[known])
+        return {key[0]: taken[key] / paid[key] for key in taken if paid[key]}
+
+    def yield_on_cost(
+        self,
+        average_cost: Mapping[str, float],
+        as_of: datetime | None = None,
+        window: timedelta = timedelta(days=365),
+    ) -> dict[str, float]:
+        """Gross dividends per share paid in ``window`` up to ``as_of``, over average cost.
+
+        ``average_cost`` is per share in the instrument's currency, e.g. from
+        :meth:`~t212.analytics.LotReport.average_cost`.
+        """
+        end = timestamps([as_of or datetime.now(UTC)])[0]
+        start = end - np.timedelta64(window)
+        recent = (self.paid_on > start) & (self.paid_on <= end)
+        per_share = sum_by(
+            [self.ticker[recent]], np.nan_to_num(self.gross_amount_per_share[recent])
+        )
+        return {
+            key[0]: total / average_cost[key[0]]
+            for key, total in per_share.items()
+            if average_cost.get(key[0])
+        }
+
+
+class DividendAggregator:
+    """Running dividend totals, updated with only the payments not seen before.
+
+    Payments are de-duplicated by ``reference``, so overlapping pages from repeated
+    ``iter_dividends`` calls can be fed in as they come.
+    """
+
+    def __init__(self, *keys: DividendKey, period: str = "M") -> None:
+        self.keys = keys or ("ticker",)
+        self.period = period
+        self.totals: dict[tuple[Any, ...], float] = {}
+        self._seen: set[str] = set()
+
+    def add(self, items: Iterable[HistoryDividendItem]) -> DividendTable:
+        """Fold new payments into :attr:`totals`; returns the ones that were new."""
+        new = []
+        for item in items:
+            if item.reference is not None:
+                if item.reference in self._seen:
+                    continue
+                self._seen.add(item.reference)
+            new.append(item)
+        table = DividendTable.from_history(new)
+        for key, total in table.total_by(*self.keys, period=self.period).items():
+            self.totals[key] = self.totals.get(key, 0.0) + total
+        return table
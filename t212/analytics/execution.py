@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, fields
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from ..models.enums import OrderSide, OrderStatus, OrderType
+from ..models.history import HistoricalOrder
+from ._columns import floats, group, labels, timestamps, truncate
+
+ExecutionKey = Literal[
+    "ticker", "type", "side", "initiated_from", "trading_method", "status", "period"
+]
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+_EPS = 1e-9
+
+
+@dataclass(frozen=True)
+class ExecutionStats:
+    """Execution quality for one group of orders.
+
+    ``orders``, ``filled`` and ``partial`` count distinct orders, however many fills
+    each had. ``latency`` maps each quantile to the placement-to-fill time in seconds,
+    over the fills; ``slippage`` is the mean in basis points over the fills with a
+    reference price, positive when the fill was worse than the reference.
+    """
+
+    orders: int
+    filled: int
+    partial: int
+    latency: dict[float, float]
+    mean_latency: float
+    slippage: float
+
+    @property
+    def fill_rate(self) -> float:
+        return self.filled / self.orders if self.orders else 0.0
+
+    @property
+    def partial_rate(self) -> float:
+        return self.partial / self.orders if self.orders else 0.0
+
+
+@dataclass(frozen=True)
+class ExecutionTable:
+    """Orders from order history as columns, one row per item, filled or not.
+
+    History has an item per fill, so an order filled in several parts has several rows.
+
+    ``quantity`` and ``filled_quantity`` are unsigned; ``price`` and ``filled_at``
+    come from the fill and are NaN/NaT when there is none. Enum columns hold values.
+    """
+
+    order_id: npt.NDArray[np.int64]
+    ticker: npt.NDArray[np.str_]
+    type: npt.NDArray[np.str_]
+    side: npt.NDArray[np.str_]
+    status: npt.NDArray[np.str_]
+    initiated_from: npt.NDArray[np.str_]
+    trading_method: npt.NDArray[np.str_]
+    created_at: npt.NDArray[np.datetime64]
+    filled_at: npt.NDArray[np.datetime64]
+    quantity: npt.NDArray[np.float64]
+    filled_quantity: npt.NDArray[np.float64]
+    value: npt.NDArray[np.float64]
+    filled_value: npt.NDArray[np.float64]
+    limit_price: npt.NDArray[np.float64]
+    stop_price: npt.NDArray[np.float64]
+    price: npt.NDArray[np.float64]
+
+    @classmethod
+    def from_history(cls, items: Iterable[HistoricalOrder]) -> ExecutionTable:
+        rows = [(item.order, item.fill) for item in items if item.order is not None]
+        return cls(
+            order_id=np.array([order.id or 0 for order, _ in rows], dtype=np.int64),
+            ticker=labels(order.ticker for order, _ in rows),
+            type=labels(order.type for order, _ in rows),
+            side=labels(order.side for order, _ in rows),
+            status=labels(order.status for order, _ in rows),
+            initiated_from=labels(order.initiated_from for order, _ in rows),
+            trading_method=labels(fill.trading_method if fill else None for _, fill in rows),
+            created_at=timestamps(order.created_at for order, _ in rows),
+            filled_at=timestamps(fill.filled_at if fill else None for _, fill in rows),
+            quantity=np.abs(floats(order.quantity for order, _ in rows)),
+            filled_quantity=np.abs(
+                floats(
+                    order.filled_quantity
+                    if order.filled_quantity is not None
+                    else (fill.quantity if fill else None)
+                    for order, fill in rows
+                )
+            ),
+            value=np.abs(floats(order.value for order, _ in rows)),
+            filled_value=np.abs(floats(order.filled_value for order, _ in rows)),
+            limit_price=floats(order.limit_price for order, _ in rows),
+            stop_price=floats(order.stop_price for order, _ in rows),
+            price=floats(fill.price if fill else None for _, fill in rows),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence[ExecutionTable]) -> ExecutionTable:
+        return cls(
+            **{
+                f.name: np.concatenate([getattr(t, f.name) for t in tables])
+                for f in fields(cls)
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.order_id)
+
+    def latency(self) -> npt.NDArray[np.float64]:
+        """Seconds from placement to fill; NaN without both timestamps."""
+        known = ~(np.isnat(self.created_at) | np.isnat(self.filled_at))
+        micros = (self.filled_at - self.created_at).view(np.int64)
+        return np.where(known, micros / 1e6, np.nan)
+
+    def fill_ratio(self) -> npt.NDArray[np.float64]:
+        """Share of each order filled, by quantity, or by value for value orders."""
+        by_quantity = self.filled_quantity / np.where(self.quantity > 0, self.quantity, np.nan)
+        by_value = self.filled_value / np.where(self.value > 0, self.value, np.nan)
+        ratio = np.where(np.isnan(by_quantity), by_value, by_quantity)
+        filled = self.status == OrderStatus.FILLED.value
+        ratio = np.where(np.isnan(ratio) & filled, 1.0, ratio)
+        return np.nan_to_num(ratio)
+
+    def reference_price(
+        self, reference: Mapping[int, float] | None = None
+    ) -> npt.NDArray[np.float64]:
+        """The price each fill is measured against.
+
+        ``reference`` maps order ids to a price such as the mid at placement; orders
+        without one fall back to their limit price (limit and stop-limit orders) or stop
+        price (stop orders). Market orders have no fallback.
+        """
+        limit = np.isin(self.type, [OrderType.LIMIT.value, OrderType.STOP_LIMIT.value])
+        stop = self.type == OrderType.STOP.value
+        fallback = np.where(limit, self.limit_price, np.where(stop, self.stop_price, np.nan))
+        if not reference:
+            return fallback
+        ids = np.fromiter(reference.keys(), dtype=np.int64, count=len(reference))
+        prices = np.fromiter(reference.values(), dtype=np.float64, count=len(reference))
+        order = np.argsort(ids)
+        ids, prices = ids[order], prices[order]
+        at = np.minimum(np.searchsorted(ids, self.order_id), len(ids) - 1)
+        found = ids[at] == self.order_id
+        return np.where(found, prices[at], fallback)
+
+    def slippage(self, reference: Mapping[int, float] | None = None) -> npt.NDArray[np.float64]:
+        """Fill price against :meth:`reference_price` in basis points; positive is worse."""
+        ref = self.reference_price(reference)
+        ref = np.where(ref > 0, ref, np.nan)
+        sign = np.where(self.side == OrderSide.SELL.value, -1.0, 1.0)
+        slippage: npt.NDArray[np.float64] = sign * (self.price - ref) / ref * 1e4
+        return slippage
+
+    def summary(
+        self,
+        *keys: ExecutionKey,
+        period: str = "D",
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        reference: Mapping[int, float] | None = None,
+    ) -> dict[tuple[Any, ...], ExecutionStats]:
+        """:class:`ExecutionStats` per combination of ``keys``, e.g. ``summary("ticker")``.
+
+        ``"period"`` groups by ``created_at`` rounded down to ``period`` (``"D"``,
+        ``"W"``, ``"M"`` or ``"Y"``). With no keys, one group covers every order.
+        """
+        if not len(self):
+            return {}
+        columns = {
+            "ticker": self.ticker,
+            "type": self.type,
+            "side": self.side,
+            "status": self.status,
+            "initiated_from": self.initiated_from,
+            "trading_method": self.trading_method,
+        }
+        if keys:
+            extra = {"period": truncate(self.created_at, period)} if "period" in keys else {}
+            names, codes = group([{**columns, **extra}[key] for key in keys])
+        else:
+            names, codes = [()], np.zeros(len(self), dtype=np.intp)
+        size = len(names)
+
+        # Counts are per order, each at the most filled of its rows.
+        pairs, order_of = group([codes, self.order_id])
+        ratio = np.zeros(len(pairs))
+        np.maximum.at(ratio, order_of, self.fill_ratio())
+        order_codes = np.array([code for code, _ in pairs], dtype=np.intp)
+        full = ratio >= 1.0 - _EPS
+        partial = (ratio > _EPS) & ~full
+        orders = np.bincount(order_codes, minlength=size)
+        filled = np.bincount(order_codes[full], minlength=size)
+        partials = np.bincount(order_codes[partial], minlength=size)
+
+        latency = self.latency()
+        timed = ~np.isnan(latency)
+        mean_latency = _mean(codes[timed], latency[timed], size)
+        points = _quantiles(codes[timed], latency[timed], size, quantiles)
+        slippage = self.slippage(reference)
+        measured = ~np.isnan(slippage)
+        mean_slippage = _mean(codes[measured], slippage[measured], size)
+
+        return {
+            name: ExecutionStats(
+                orders=int(orders[i]),
+                filled=int(filled[i]),
+                partial=int(partials[i]),
+                latency=dict(zip(quantiles, points[i].tolist(), strict=True)),
+                mean_latency=float(mean_latency[i]),
+                slippage=float(mean_slippage[i]),
+            )
+            for i, name in enumerate(names)
+        }
+
+
+def _mean(
+    codes: npt.NDArray[np.intp], values: npt.NDArray[np.float64], size: int
+) -> npt.NDArray[np.float64]:
+    counts = np.bincount(codes, minlength=size)
+    totals = np.bincount(codes, weights=values, minlength=size)
+    return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+
+
+def _quantiles(
+    codes: npt.NDArray[np.intp],
+    values: npt.NDArray[np.float64],
+    size: int,
+    quantiles: Sequence[float],
+) -> npt.NDArray[np.float64]:
+    """Linearly interpolated quantiles per group, with one sort for all groups."""
+    order = np.lexsort((values, codes))
+    values = values[order]
+    counts = np.bincount(codes, minlength=size)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    result = np.full((size, len(quantiles)), np.nan)
+    has = counts > 0
+    for j, q in enumerate(quantiles):
+        position = q * (counts[has] - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        lo = values[starts[has] + low]
+        hi = values[starts[has] + high]
+        result[has, j] = lo + (hi - lo) * (position - low)
+    return result
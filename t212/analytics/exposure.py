@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import numpy as np
+
+from ..models.positions import Position
+from ..preflight import InstrumentCatalog
+from ..tracking import PositionEvent, PositionEventType
+from ._columns import group
+
+ExposureKey = Literal["ticker", "currency", "instrument_type", "exchange"]
+
+_KEYS: tuple[ExposureKey, ...] = ("ticker", "currency", "instrument_type", "exchange")
+
+
+@dataclass(frozen=True)
+class Exposure:
+    """Gross (sum of absolute) and net (signed) exposure, in the account currency."""
+
+    gross: float = 0.0
+    net: float = 0.0
+
+
+@dataclass(frozen=True)
+class Concentration:
+    """How concentrated gross exposure is across groups.
+
+    ``hhi`` is the Herfindahl-Hirschman index (sum of squared weights, 1.0 when everything
+    is in one group) and ``effective_count`` its inverse; ``top_share`` is the weight of
+    the ``top`` largest groups together.
+    """
+
+    hhi: float
+    effective_count: float
+    largest: float
+    top_share: float
+
+
+class ExposureEngine:
+    """Positions joined to instrument metadata, aggregated into exposure and risk figures.
+
+    Each position is one row of numpy columns. Instrument currency, type and exchange
+    are looked up in ``catalog`` once, when a ticker first appears; after that a poll
+    only rewrites the value of the rows that changed, and aggregates are a ``bincount``
+    over the current rows. Feed it full ``positions.get()`` snapshots with
+    :meth:`update`, or the events of a :class:`~t212.PositionsTracker` with :meth:`apply`.
+
+    Values are each position's wallet-impact current value in the account currency,
+    falling back to ``quantity * current_price`` when the wallet impact is missing.
+    """
+
+    def __init__(self, catalog: InstrumentCatalog, capacity: int = 64) -> None:
+        self.catalog = catalog
+        self.account_currency: str | None = None
+        self._rows: dict[str, int] = {}
+        self._positions: dict[str, Position] = {}  # the snapshot each row was set from
+        self._value = np.zeros(capacity)
+        self._fx_impact = np.zeros(capacity)
+        self._labels = {key: np.empty(capacity, dtype=object) for key in _KEYS}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def update(self, positions: Iterable[Position]) -> None:
+        """Replace the book with a full positions snapshot."""
+        seen: set[str] = set()
+        for position in positions:
+            ticker = _ticker(position)
+            if ticker is not None:
+                seen.add(ticker)
+                if self._positions.get(ticker) != position:
+                    self._set(ticker, position)
+        for ticker in self._rows.keys() - seen:
+            self._remove(ticker)
+
+    def apply(self, events: Iterable[PositionEvent]) -> None:
+        """Apply position changes as reported by :class:`~t212.PositionsTracker`."""
+        for event in events:
+            if event.type is PositionEventType.CLOSED:
+                self._remove(event.ticker)
+            else:
+                self._set(event.ticker, event.position)
+
+    def values(self) -> dict[str, float]:
+        """Signed value per ticker."""
+        size = len(self._rows)
+        tickers = self._labels["ticker"][:size].tolist()
+        return dict(zip(tickers, self._value[:size].tolist(), strict=True))
+
+    def total(self) -> Exposure:
+        value = self._value[: len(self._rows)]
+        return Exposure(float(np.abs(value).sum()), float(value.sum()))
+
+    def exposure(self, *keys: ExposureKey) -> dict[tuple[Any, ...], Exposure]:
+        """Gross and net exposure per combination of ``keys``, e.g. ``exposure("currency")``.
+
+        Instruments missing from the catalog are grouped under ``""``.
+        """
+        size = len(self._rows)
+        if not size:
+            return {}
+        if not keys:
+            return {(): self.total()}
+        names, codes = group([self._labels[key][:size] for key in keys])
+        value = self._value[:size]
+        gross = np.bincount(codes, weights=np.abs(value), minlength=len(names))
+        net = np.bincount(codes, weights=value, minlength=len(names))
+        return {
+            name: Exposure(float(g), float(n))
+            for name, g, n in zip(names, gross.tolist(), net.tolist(), strict=True)
+        }
+
+    def fx_sensitivity(self, shock: float = 0.01) -> dict[str, float]:
+        """Change in account-currency value if each foreign currency moves by ``shock``.
+
+        A ``shock`` of 0.01 is the foreign currency strengthening 1% against the account
+        currency; the result is linear, so -0.01 gives the negated figures.
+        """
+        return {
+            currency: exposure.net * shock
+            for (currency,), exposure in self.exposure("currency").items()
+            if currency and currency != self.account_currency
+        }
+
+    def fx_impact(self) -> dict[str, float]:
+        """FX gain or loss to date per instrument currency, from the wallet impacts."""
+        size = len(self._rows)
+        if not size:
+            return {}
+        names, codes = group([self._labels["currency"][:size]])
+        totals = np.bincount(codes, weights=self._fx_impact[:size], minlength=len(names))
+        return {name: total for (name,), total in zip(names, totals.tolist(), strict=True)}
+
+    def concentration(self, key: ExposureKey = "ticker", top: int = 5) -> Concentration:
+        """Concentration of gross exposure across ``key`` groups."""
+        gross = np.array([e.gross for e in self.exposure(key).values()])
+        total = gross.sum()
+        if not total:
+            return Concentration(0.0, 0.0, 0.0, 0.0)
+        weights = np.sort(gross / total)[::-1]
+        hhi = float(np.square(weights).sum())
+        return Concentration(hhi, 1.0 / hhi, float(weights[0]), float(weights[:top].sum()))
+
+    def _set(self, ticker: str, position: Position) -> None:
+        row = self._rows.get(ticker)
+        if row is None:
+            row = self._add(ticker, position)
+        impact = position.wallet_impact
+        quantity = position.quantity or 0.0
+        if impact is not None and impact.current_value is not None:
+            value = abs(impact.current_value)
+            self.account_currency = impact.currency or self.account_currency
+        else:
+            value = abs(quantity * (position.current_price or 0.0))
+        self._value[row] = -value if quantity < 0 else value
+        self._fx_impact[row] = (impact.fx_impact or 0.0) if impact else 0.0
+        self._positions[ticker] = position
+
+    def _add(self, ticker: str, position: Position) -> int:
+        row = len(self._rows)
+        if row == len(self._value):
+            size = max(2 * row, 1)
+            self._value = np.resize(self._value, size)
+            self._fx_impact = np.resize(self._fx_impact, size)
+            self._labels = {k: np.resize(v, size) for k, v in self._labels.items()}
+        instrument = self.catalog.instruments.get(ticker)
+        exchange = self.catalog.exchange(ticker)
+        currency = instrument.currency_code if instrument else None
+        if currency is None and position.instrument is not None:
+            currency = position.instrument.currency
+        self._labels["ticker"][row] = ticker
+        self._labels["currency"][row] = currency or ""
+        self._labels["instrument_type"][row] = (instrument.type or "") if instrument else ""
+        self._labels["exchange"][row] = (exchange.name or "") if exchange else ""
+        self._rows[ticker] = row
+        return row
+
+    def _remove(self, ticker: str) -> None:
+        row = self._rows.pop(ticker, None)
+        if row is None:
+            return
+        del self._positions[ticker]
+        # Keep the rows packed: move the last row into the freed slot.
+        last = len(self._rows)
+        if row != last:
+            moved = self._labels["ticker"][last]
+            self._value[row] = self._value[last]
+            self._fx_impact[row] = self._fx_impact[last]
+            for column in self._labels.values():
+                column[row] = column[last]
+            self._rows[moved] = row
+
+
+def _ticker(position: Position) -> str | None:
+    return position.instrument.ticker if position.instrument is not None else None
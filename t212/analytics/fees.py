@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, fields
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from ..models.history import HistoricalOrder
+from ._columns import floats, labels, sum_by, timestamps, truncate
+
+FeeKey = Literal["name", "ticker", "currency", "period"]
+
+
+@dataclass(frozen=True)
+class FeeLedger:
+    """Taxes and fees from fill wallet impacts as columns, one row per charge.
+
+    ``quantity`` is the charge in its own ``currency``; ``amount`` is the same charge
+    in the account currency (``account_currency``), converted with the fill's
+    ``fx_rate`` when the two currencies differ. A charge that needs converting but has
+    no rate is NaN in ``amount``.
+    """
+
+    order_id: npt.NDArray[np.int64]
+    fill_id: npt.NDArray[np.int64]
+    ticker: npt.NDArray[np.str_]
+    name: npt.NDArray[np.str_]
+    currency: npt.NDArray[np.str_]
+    account_currency: npt.NDArray[np.str_]
+    charged_at: npt.NDArray[np.datetime64]
+    quantity: npt.NDArray[np.float64]
+    amount: npt.NDArray[np.float64]
+
+    @classmethod
+    def from_history(cls, items: Iterable[HistoricalOrder]) -> FeeLedger:
+        rows = []
+        for item in items:
+            fill, order = item.fill, item.order
+            impact = fill.wallet_impact if fill is not None else None
+            if fill is None or impact is None or not impact.taxes:
+                continue
+            for tax in impact.taxes:
+                rows.append((order, fill, impact, tax))
+        quantity = floats(tax.quantity for *_, tax in rows)
+        fx_rate = floats(impact.fx_rate for _, _, impact, _ in rows)
+        currency = labels(tax.currency for *_, tax in rows)
+        account_currency = labels(impact.currency for _, _, impact, _ in rows)
+        converted = currency != account_currency
+        return cls(
+            order_id=np.array(
+                [(order.id or 0) if order else 0 for order, *_ in rows], dtype=np.int64
+            ),
+            fill_id=np.array([fill.id or 0 for _, fill, *_ in rows], dtype=np.int64),
+            ticker=labels(order.ticker if order else None for order, *_ in rows),
+            name=labels(tax.name for *_, tax in rows),
+            currency=currency,
+            account_currency=account_currency,
+            charged_at=timestamps(tax.charged_at or fill.filled_at for _, fill, _, tax in rows),
+            quantity=quantity,
+            amount=np.where(converted, quantity * fx_rate, quantity),
+        )
+
+    @classmethod
+    def concat(cls, ledgers: Sequence[FeeLedger]) -> FeeLedger:
+        return cls(
+            **{
+                f.name: np.concatenate([getattr(ledger, f.name) for ledger in ledgers])
+                for f in fields(cls)
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.order_id)
+
+    def total_by(
+        self, *keys: FeeKey, period: str = "D", converted: bool = True
+    ) -> dict[tuple[Any, ...], float]:
+        """Total charges per combination of ``keys``, e.g. ``total_by("name", "period")``.
+
+        ``"period"`` groups by ``charged_at`` rounded down to ``period`` (``"D"``,
+        ``"W"``, ``"M"`` or ``"Y"``) and is labelled with the period's first day. Sums
+        ``amount`` (account currency) unless ``converted`` is false, in which case sum
+        ``quantity`` and include ``"currency"`` in ``keys`` to keep currencies apart.
+        Charges with no converted amount are left out.
+        """
+        columns = {
+            "name": self.name,
+            "ticker": self.ticker,
+            "currency": self.currency,
+            "period": truncate(self.charged_at, period),
+        }
+        values = self.amount if converted else self.quantity
+        known = ~np.isnan(values)
+        return sum_by([columns[key][known] for key in keys], values[known])
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, fields
+
+import numpy as np
+import numpy.typing as npt
+
+from ..models.enums import FillType, OrderSide
+from ..models.history import HistoricalOrder
+from ..models.orders import Fill, Order
+from ._columns import floats, labels, timestamps
+
+
+@dataclass(frozen=True)
+class FillTable:
+    """Fills from order history as columns, one row per fill.
+
+    ``quantity`` is signed (negative for sells) and ``type`` holds the
+    :class:`~t212.models.enums.FillType` value. Items without a fill are skipped.
+    """
+
+    order_id: npt.NDArray[np.int64]
+    ticker: npt.NDArray[np.str_]
+    filled_at: npt.NDArray[np.datetime64]
+    quantity: npt.NDArray[np.float64]
+    price: npt.NDArray[np.float64]
+    type: npt.NDArray[np.str_]
+
+    @classmethod
+    def from_history(cls, items: Iterable[HistoricalOrder]) -> FillTable:
+        rows = [
+            (item.order, item.fill)
+            for item in items
+            if item.fill is not None and item.fill.quantity and item.order is not None
+        ]
+        return cls(
+            order_id=np.array([order.id or 0 for order, _ in rows], dtype=np.int64),
+            ticker=labels(order.ticker for order, _ in rows),
+            filled_at=timestamps(fill.filled_at for _, fill in rows),
+            quantity=np.array(
+                [signed_quantity(order, fill) for order, fill in rows], dtype=np.float64
+            ),
+            price=floats(fill.price for _, fill in rows),
+            type=labels(fill.type or FillType.TRADE for _, fill in rows),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence[FillTable]) -> FillTable:
+        return cls(
+            **{
+                f.name: np.concatenate([getattr(t, f.name) for t in tables])
+                for f in fields(cls)
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.order_id)
+
+    def take(self, index: npt.ArrayLike) -> FillTable:
+        """Rows selected by an index array or boolean mask."""
+        return type(self)(**{f.name: getattr(self, f.name)[index] for f in fields(self)})
+
+    def sorted(self) -> FillTable:
+        """Rows ordered by ticker, then fill time (stable for equal times)."""
+        return self.take(np.lexsort((self.filled_at, self.ticker)))
+
+
+def signed_quantity(order: Order | None, fill: Fill) -> float:
+    """The fill's quantity, negative for sells."""
+    size = abs(fill.quantity or 0.0)
+    sell = (order is not None and order.side == OrderSide.SELL) or (fill.quantity or 0.0) < 0
+    return -size if sell else size
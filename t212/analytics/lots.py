@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from enum import StrEnum
+
+import numpy as np
+import numpy.typing as npt
+
+from ..models.enums import FillType
+from ..models.history import HistoricalOrder
+from ._columns import labels, sum_by
+from .fills import FillTable
+
+_NAT = int(np.iinfo(np.int64).min)
+_EPS = 1e-9
+
+
+class CostMethod(StrEnum):
+    FIFO = "FIFO"
+    LIFO = "LIFO"
+    AVERAGE = "AVERAGE"
+
+
+@dataclass(frozen=True)
+class OpenLots:
+    """Open tax lots as columns; ``cost`` is each lot's total cost basis."""
+
+    ticker: npt.NDArray[np.str_]
+    opened_at: npt.NDArray[np.datetime64]
+    quantity: npt.NDArray[np.float64]
+    cost: npt.NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class RealizedLots:
+    """One row per lot (or part of a lot) closed by a sell.
+
+    Sells beyond the holdings on record, e.g. when history starts mid-position, are
+    realized against a zero cost basis with an unknown (NaT) ``opened_at``.
+    """
+
+    ticker: npt.NDArray[np.str_]
+    opened_at: npt.NDArray[np.datetime64]
+    closed_at: npt.NDArray[np.datetime64]
+    quantity: npt.NDArray[np.float64]
+    cost: npt.NDArray[np.float64]
+    proceeds: npt.NDArray[np.float64]
+
+    @property
+    def pnl(self) -> npt.NDArray[np.float64]:
+        return self.proceeds - self.cost
+
+
+@dataclass(frozen=True)
+class LotReport:
+    """Lots and realized P&L under one cost method, in each instrument's price currency."""
+
+    method: CostMethod
+    open: OpenLots
+    realized: RealizedLots
+
+    def position(self) -> dict[str, float]:
+        return _by_ticker(self.open.ticker, self.open.quantity)
+
+    def average_cost(self) -> dict[str, float]:
+        quantity = self.position()
+        cost = _by_ticker(self.open.ticker, self.open.cost)
+        return {ticker: cost[ticker] / quantity[ticker] for ticker in quantity}
+
+    def realized_pnl(self) -> dict[str, float]:
+        return _by_ticker(self.realized.ticker, self.realized.pnl)
+
+
+def _by_ticker(tickers: npt.NDArray[np.str_], values: npt.NDArray[np.float64]) -> dict[str, float]:
+    return {ticker: total for (ticker,), total in sum_by([tickers], values).items()}
+
+
+@dataclass
+class _TickerState:
+    # Each lot is [opened_at_us, quantity, cost]; oldest first.
+    lots: deque[list[float]] = field(default_factory=deque)
+    last: int = _NAT
+
+
+_Rows = tuple[list[int], list[int], list[float], list[float], list[float]]
+_Job = tuple[CostMethod, _TickerState, list[int], list[float], list[float], list[bool]]
+
+
+def _run(job: _Job) -> tuple[_TickerState, _Rows]:
+    """Match one ticker's fills against its lots, in time order."""
+    method, state, times, quantities, prices, splits = job
+    lots = state.lots
+    opened: list[int] = []
+    closed: list[int] = []
+    sizes: list[float] = []
+    costs: list[float] = []
+    proceeds: list[float] = []
+    for t, q, p, split in zip(times, quantities, prices, splits, strict=True):
+        if split:
+            held = sum(lot[1] for lot in lots)
+            if held > _EPS:
+                ratio = (held + q) / held
+                for lot in lots:
+                    lot[1] *= ratio
+        elif q > 0:
+            if method is CostMethod.AVERAGE and lots:
+                lots[0][1] += q
+                lots[0][2] += q * p
+            else:
+                lots.append([t, q, q * p])
+        else:
+            remaining = -q
+            while remaining > _EPS and lots:
+                lot = lots[-1] if method is CostMethod.LIFO else lots[0]
+                take = min(remaining, lot[1])
+                part = lot[2] * take / lot[1]
+                opened.append(int(lot[0]))
+                closed.append(t)
+                sizes.append(take)
+                costs.append(part)
+                proceeds.append(take * p)
+                lot[1] -= take
+                lot[2] -= part
+                remaining -= take
+                if lot[1] <= _EPS and method is CostMethod.LIFO:
+                    lots.pop()
+                elif lot[1] <= _EPS:
+                    lots.popleft()
+            if remaining > _EPS:
+                opened.append(_NAT)
+                closed.append(t)
+                sizes.append(remaining)
+                costs.append(0.0)
+                proceeds.append(remaining * p)
+    if times:
+        state.last = times[-1]
+    return state, (opened, closed, sizes, costs, proceeds)
+
+
+def _datetimes(micros: list[int]) -> npt.NDArray[np.datetime64]:
+    return np.array(micros, dtype=np.int64).view("datetime64[us]")
+
+
+def _realized(names: list[str], rows: _Rows) -> RealizedLots:
+    opened, closed, sizes, costs, proceeds = rows
+    return RealizedLots(
+        ticker=labels(names),
+        opened_at=_datetimes(opened),
+        closed_at=_datetimes(closed),
+        quantity=np.array(sizes, dtype=np.float64),
+        cost=np.array(costs, dtype=np.float64),
+        proceeds=np.array(proceeds, dtype=np.float64),
+    )
+
+
+class LotEngine:
+    """Incremental tax-lot accounting over fill history.
+
+    Lot matching is path-dependent, so each ticker's fills are matched in time order;
+    tickers are independent and with ``workers`` run in parallel processes. Fills are
+    loaded and aggregated as numpy columns. ``STOCK_SPLIT`` fills rescale the open lots
+    and keep their cost; every other fill type adds or closes lots at its fill price,
+    so stock distributions come in at their (usually zero) price.
+
+    Call :meth:`update` with new fills as they arrive; fills older than ones already
+    processed for the same ticker are rejected.
+    """
+
+    def __init__(self, method: CostMethod = CostMethod.FIFO) -> None:
+        self.method = CostMethod(method)
+        self._states: dict[str, _TickerState] = {}
+        self._realized: list[RealizedLots] = [_realized([], ([], [], [], [], []))]
+
+    def update(
+        self, fills: FillTable | Iterable[HistoricalOrder], workers: int | None = None
+    ) -> RealizedLots:
+        """Process new fills; returns the lots they realized."""
+        table = fills if isinstance(fills, FillTable) else FillTable.from_history(fills)
+        table = table.sorted()
+        tickers, starts = np.unique(table.ticker, return_index=True)
+        bounds = [*starts.tolist(), len(table)]
+        times = table.filled_at.view(np.int64)
+        prices = np.nan_to_num(table.price)
+        splits = table.type == FillType.STOCK_SPLIT.value
+        jobs: list[_Job] = []
+        for i, ticker in enumerate(tickers.tolist()):
+            lo, hi = bounds[i], bounds[i + 1]
+            state = self._states.get(ticker, _TickerState())
+            if times[lo] < state.last:
+                raise ValueError(f"Fills for {ticker} are older than ones already processed")
+            jobs.append(
+                (
+                    self.method,
+                    state,
+                    times[lo:hi].tolist(),
+                    table.quantity[lo:hi].tolist(),
+                    prices[lo:hi].tolist(),
+                    splits[lo:hi].tolist(),
+                )
+            )
+        if workers is not None and workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(_run, jobs, chunksize=max(1, len(jobs) // workers)))
+        else:
+            results = [_run(job) for job in jobs]
+        names: list[str] = []
+        opened: list[int] = []
+        closed: list[int] = []
+        sizes: list[float] = []
+        costs: list[float] = []
+        proceeds: list[float] = []
+        for ticker, (state, rows) in zip(tickers.tolist(), results, strict=True):
+            self._states[ticker] = state
+            names.extend([ticker] * len(rows[2]))
+            opened.extend(rows[0])
+            closed.extend(rows[1])
+            sizes.extend(rows[2])
+            costs.extend(rows[3])
+            proceeds.extend(rows[4])
+        realized = _realized(names, (opened, closed, sizes, costs, proceeds))
+        self._realized.append(realized)
+        return realized
+
+    def report(self) -> LotReport:
+        names: list[str] = []
+        lots: list[list[float]] = []
+        for ticker, state in self._states.items():
+            names.extend([ticker] * len(state.lots))
+            lots.extend(state.lots)
+        table = np.array(lots, dtype=np.float64).reshape(-1, 3)
+        open_lots = OpenLots(
+            ticker=labels(names),
+            opened_at=_datetimes([int(lot[0]) for lot in lots]),
+            quantity=table[:, 1],
+            cost=table[:, 2],
+        )
+        realized = RealizedLots(
+            **{
+                f.name: np.concatenate([getattr(chunk, f.name) for chunk in self._realized])
+                for f in fields(RealizedLots)
+            }
+        )
+        return LotReport(self.method, open_lots, realized)
+
+
+def compute_lots(
+    fills: FillTable | Iterable[HistoricalOrder],
+    method: CostMethod = CostMethod.FIFO,
+    workers: int | None = None,
+) -> LotReport:
+    """Open lots and realized P&L for a complete fill history."""
+    engine = LotEngine(method)
+    engine.update(fills, workers)
+    return engine.report()
@@ -0,0 +1,333 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, replace
+from datetime import date
+
+import numpy as np
+import numpy.typing as npt
+
+from ..ledger import LedgerEntry, LedgerKind
+from ..models.enums import TransactionType
+from ..models.history import HistoricalOrder, HistoryTransactionItem
+from ._columns import floats, labels, timestamps
+from .fills import signed_quantity
+
+_EPS = 1e-9
+_YEAR = 365.0
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+@dataclass(frozen=True)
+class DailySeries:
+    """End-of-day cash and holdings for one account, one row per calendar (UTC) day.
+
+    ``flows`` are external flows on each day (deposits, withdrawals and transfers);
+    ``income`` is dividends received. ``quantity`` and ``cost`` hold each ticker's
+    position and its average cost basis, so ``invested`` is valued at cost until
+    :meth:`valued` is given prices. ``opening`` is the NAV before the first day.
+    """
+
+    date: npt.NDArray[np.datetime64]
+    cash: npt.NDArray[np.float64]
+    flows: npt.NDArray[np.float64]
+    income: npt.NDArray[np.float64]
+    invested: npt.NDArray[np.float64]
+    quantity: dict[str, npt.NDArray[np.float64]]
+    cost: dict[str, npt.NDArray[np.float64]]
+    opening: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    @property
+    def nav(self) -> npt.NDArray[np.float64]:
+        nav: npt.NDArray[np.float64] = self.cash + self.invested
+        return nav
+
+    def valued(self, prices: Mapping[str, npt.ArrayLike]) -> DailySeries:
+        """The same series with holdings at market value.
+
+        ``prices`` are daily closes in the account currency, aligned with :attr:`date`;
+        gaps (NaN) carry the previous close forward. Tickers without prices stay at cost.
+        """
+        invested = np.zeros(len(self))
+        for ticker, quantity in self.quantity.items():
+            if ticker in prices:
+                value = quantity * _ffill(np.asarray(prices[ticker], dtype=np.float64))
+            else:
+                value = self.cost[ticker]
+            invested += np.where(np.abs(quantity) > _EPS, np.nan_to_num(value), 0.0)
+        return replace(self, invested=invested)
+
+    def returns(self) -> npt.NDArray[np.float64]:
+        """Daily returns, with each day's external flows taken at the start of the day."""
+        nav = self.nav
+        previous = np.concatenate([[self.opening], nav[:-1]]) + self.flows
+        safe = np.where(previous > _EPS, previous, 1.0)
+        returns: npt.NDArray[np.float64] = np.where(previous > _EPS, nav / safe - 1.0, 0.0)
+        return returns
+
+    def twr_curve(self) -> npt.NDArray[np.float64]:
+        """Cumulative time-weighted return at the end of each day."""
+        curve: npt.NDArray[np.float64] = np.cumprod(1.0 + self.returns(), dtype=np.float64) - 1.0
+        return curve
+
+    def twr(self) -> float:
+        """Time-weighted return over the whole series (not annualized)."""
+        return float(np.prod(1.0 + self.returns()) - 1.0) if len(self) else 0.0
+
+    def mwr(self) -> float:
+        """Money-weighted return: the annualized internal rate of return of the flows.
+
+        The opening NAV counts as invested before the first day and the closing NAV as
+        withdrawn after the last. NaN when there is no solution.
+        """
+        if not len(self):
+            return 0.0
+        days = np.arange(len(self), dtype=np.float64)
+        times = np.concatenate([[0.0], days, [days[-1] + 1.0]]) / _YEAR
+        amounts = np.concatenate([[-self.opening], -self.flows, [self.nav[-1]]])
+        return _irr(times, amounts)
+
+    @classmethod
+    def concat(cls, chunks: Sequence[DailySeries]) -> DailySeries:
+        tickers = {ticker for chunk in chunks for ticker in chunk.quantity}
+        return cls(
+            date=np.concatenate([c.date for c in chunks]),
+            cash=np.concatenate([c.cash for c in chunks]),
+            flows=np.concatenate([c.flows for c in chunks]),
+            income=np.concatenate([c.income for c in chunks]),
+            invested=np.concatenate([c.invested for c in chunks]),
+            quantity={t: _joined([c.quantity for c in chunks], chunks, t) for t in tickers},
+            cost={t: _joined([c.cost for c in chunks], chunks, t) for t in tickers},
+            opening=chunks[0].opening if chunks else 0.0,
+        )
+
+
+def _joined(
+    columns: list[dict[str, npt.NDArray[np.float64]]],
+    chunks: Sequence[DailySeries],
+    ticker: str,
+) -> npt.NDArray[np.float64]:
+    """One ticker's column across chunks, zero before the ticker first appears."""
+    return np.concatenate(
+        [c.get(ticker, np.zeros(len(chunk))) for c, chunk in zip(columns, chunks, strict=True)]
+    )
+
+
+def _ffill(values: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    index = np.where(np.isnan(values), 0, np.arange(len(values)))
+    np.maximum.accumulate(index, out=index)
+    filled: npt.NDArray[np.float64] = values[index]
+    return filled
+
+
+def _irr(times: npt.NDArray[np.float64], amounts: npt.NDArray[np.float64]) -> float:
+    def npv(rate: float) -> float:
+        return float(np.sum(amounts * (1.0 + rate) ** -times))
+
+    # Newton from a modest guess, then bisection if it strays or fails to converge.
+    rate = 0.1
+    for _ in range(50):
+        growth = (1.0 + rate) ** -times
+        value = float(np.sum(amounts * growth))
+        slope = float(np.sum(-times * amounts * growth / (1.0 + rate)))
+        if abs(value) < 1e-10:
+            return rate
+        if slope == 0 or not np.isfinite(slope):
+            break
+        rate -= value / slope
+        if rate <= -1.0 or not np.isfinite(rate):
+            break
+    low, high = -0.9999, 10.0
+    if npv(low) * npv(high) > 0:
+        return float("nan")
+    for _ in range(200):
+        mid = (low + high) / 2
+        if npv(low) * npv(mid) <= 0:
+            high = mid
+        else:
+            low = mid
+    return (low + high) / 2
+
+
+def _daily(
+    index: npt.NDArray[np.int64], values: npt.NDArray[np.float64], days: int
+) -> npt.NDArray[np.float64]:
+    return np.bincount(index, weights=values, minlength=days).astype(np.float64)
+
+
+def _is_flow(entry: LedgerEntry) -> bool:
+    item = entry.item
+    return isinstance(item, HistoryTransactionItem) and item.type != TransactionType.FEE
+
+
+def _quantity(entry: LedgerEntry) -> float:
+    item = entry.item
+    if isinstance(item, HistoricalOrder) and item.fill is not None:
+        return signed_quantity(item.order, item.fill)
+    return 0.0
+
+
+def _cost_changes(
+    slots: npt.NDArray[np.int64],
+    quantities: npt.NDArray[np.float64],
+    paid: npt.NDArray[np.float64],
+    quantity: list[float],
+    cost: list[float],
+) -> npt.NDArray[np.float64]:
+    """Each fill's change to its ticker's cost basis, for fills in time order.
+
+    Buys into a position add what was paid; sells take out the average cost of the
+    quantity sold, and a position going flat drops its basis to zero. ``quantity`` and
+    ``cost`` hold each slot's running position and are updated in place.
+    """
+    changes = np.zeros(len(slots))
+    for i, (slot, traded, amount) in enumerate(zip(slots.tolist(), quantities, paid, strict=True)):
+        held, basis = quantity[slot], cost[slot]
+        if abs(held) <= _EPS or held * traded > 0:
+            after = basis + amount
+        else:
+            closed = min(abs(traded), abs(held))
+            after = basis * (1.0 - closed / abs(held))
+            if abs(traded) > closed:  # flipped through flat: the rest opens a new position
+                after += amount * (1.0 - closed / abs(traded))
+        held += traded
+        if abs(held) <= _EPS:
+            held, after = 0.0, 0.0
+        changes[i] = after - basis
+        quantity[slot], cost[slot] = held, after
+    return changes
+
+
+class PerformanceEngine:
+    """Daily cash, holdings, NAV and returns for one account, built from ledger entries.
+
+    Call :meth:`extend` with entries for days after those already processed, e.g. each
+    night with the previous day's entries; earlier days are not recomputed. Within a
+    batch everything is bucketed by day and accumulated with vectorized sums, so the
+    entries may come in any order, such as newest first from ``iter_ledger``.
+    """
+
+    def __init__(self, opening_cash: float = 0.0) -> None:
+        self._cash = opening_cash
+        self._quantity: dict[str, float] = {}
+        self._cost: dict[str, float] = {}
+        self._last: int | None = None  # days since the epoch
+        self._chunks: list[DailySeries] = []
+
+    @property
+    def last_day(self) -> date | None:
+        """The last day processed; later entries go to days after it."""
+        return None if self._last is None else date.fromordinal(self._last + _EPOCH)
+
+    def extend(self, entries: Iterable[LedgerEntry], until: date | None = None) -> DailySeries:
+        """Add the days up to ``until`` (default: the last entry's day); returns them."""
+        rows = [entry for entry in entries if entry.at is not None]
+        days = timestamps(entry.at for entry in rows).astype("datetime64[D]").view(np.int64)
+        ends = [int(days.max())] if len(days) else []
+        if until is not None:
+            ends.append(until.toordinal() - _EPOCH)
+        if self._last is not None:
+            start = self._last + 1
+            if len(days) and days.min() < start:
+                raise ValueError(f"Entries on or before {self.last_day} were already processed")
+        elif ends:
+            start = int(days.min()) if len(days) else ends[0]
+        else:
+            return self._empty()
+        end = max(ends, default=start - 1)
+        n = end - start + 1
+        if n <= 0:
+            return self._empty()
+
+        index = days - start
+        amount = floats(entry.amount for entry in rows)
+        kind = labels(entry.kind for entry in rows)
+        external = np.array([_is_flow(entry) for entry in rows], dtype=bool)
+        orders = kind == LedgerKind.ORDER.value
+        opening = self._nav()
+
+        cash = self._cash + np.cumsum(_daily(index, amount, n))
+        flows = _daily(index[external], amount[external], n)
+        dividends = kind == LedgerKind.DIVIDEND.value
+        income = _daily(index[dividends], amount[dividends], n)
+
+        tickers = labels(entry.ticker for entry in rows)[orders]
+        names, slot = np.unique(tickers, return_inverse=True)
+        slot = slot.reshape(-1)
+        cells = index[orders] * len(names) + slot
+        size = n * len(names)
+        quantities = floats(_quantity(entry) for entry in rows)[orders]
+        # The cost basis depends on the order of fills, so it is walked in time order.
+        ordered = np.argsort(timestamps(entry.at for entry in rows)[orders], kind="stable")
+        changes = np.zeros(len(slot))
+        changes[ordered] = _cost_changes(
+            slot[ordered],
+            quantities[ordered],
+            -amount[orders][ordered],
+            [self._quantity.get(t, 0.0) for t in names.tolist()],
+            [self._cost.get(t, 0.0) for t in names.tolist()],
+        )
+        traded = np.bincount(cells, weights=quantities, minlength=size).reshape(n, -1)
+        paid = np.bincount(cells, weights=changes, minlength=size).reshape(n, -1)
+        traded, paid = traded.cumsum(axis=0), paid.cumsum(axis=0)
+
+        quantity: dict[str, npt.NDArray[np.float64]] = {}
+        cost: dict[str, npt.NDArray[np.float64]] = {}
+        for ticker in self._quantity.keys() | set(names.tolist()):
+            quantity[ticker] = np.full(n, self._quantity.get(ticker, 0.0))
+            cost[ticker] = np.full(n, self._cost.get(ticker, 0.0))
+        for i, ticker in enumerate(names.tolist()):
+            quantity[ticker] = quantity[ticker] + traded[:, i]
+            cost[ticker] = cost[ticker] + paid[:, i]
+        invested = np.zeros(n)
+        for ticker in quantity:
+            invested += np.where(np.abs(quantity[ticker]) > _EPS, cost[ticker], 0.0)
+
+        series = DailySeries(
+            date=np.arange(start, end + 1).astype("datetime64[D]"),
+            cash=cash,
+            flows=flows,
+            income=income,
+            invested=invested,
+            quantity=quantity,
+            cost=cost,
+            opening=opening,
+        )
+        self._cash = float(cash[-1])
+        self._quantity = {t: float(q[-1]) for t, q in quantity.items()}
+        self._cost = {t: float(c[-1]) for t, c in cost.items()}
+        self._last = end
+        self._chunks.append(series)
+        return series
+
+    def series(self) -> DailySeries:
+        """Every day processed so far."""
+        if not self._chunks:
+            return self._empty()
+        if len(self._chunks) > 1:
+            self._chunks = [DailySeries.concat(self._chunks)]
+        return self._chunks[0]
+
+    def _nav(self) -> float:
+        invested = sum(
+            cost for t, cost in self._cost.items() if abs(self._quantity.get(t, 0.0)) > _EPS
+        )
+        return self._cash + invested
+
+    def _empty(self) -> DailySeries:
+        empty = np.zeros(0)
+        return DailySeries(
+            np.array([], dtype="datetime64[D]"), empty, empty, empty, empty, {}, {}, self._nav()
+        )
+
+
+def compute_performance(
+    entries: Iterable[LedgerEntry], opening_cash: float = 0.0, until: date | None = None
+) -> DailySeries:
+    """Daily series for a complete ledger history."""
+    engine = PerformanceEngine(opening_cash)
+    engine.extend(entries, until)
+    return engine.series()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from ..models.account import Cash
+from ..models.enums import OrderSide
+from ..models.orders import LimitOrderRequest, MarketOrderRequest, Order
+from ..models.positions import Position
+from ..preflight import InstrumentCatalog
+from ..store import OPEN_STATUSES
+from ._columns import floats, labels
+
+RebalanceOrder = MarketOrderRequest | LimitOrderRequest
+
+
+@dataclass(frozen=True)
+class RebalancePlan:
+    """Orders that move an account towards its target weights, sells first.
+
+    Columns are per ticker: ``current`` is the position plus what open orders will add
+    or remove, ``trade`` the signed quantity to order and ``price`` the price per share
+    in the account currency. ``cash`` is the free cash expected once everything fills.
+    """
+
+    orders: list[RebalanceOrder]
+    ticker: npt.NDArray[np.str_]
+    weight: npt.NDArray[np.float64]
+    current: npt.NDArray[np.float64]
+    trade: npt.NDArray[np.float64]
+    price: npt.NDArray[np.float64]
+    nav: float
+    cash: float
+
+    def weights_after(self) -> dict[str, float]:
+        """Each ticker's weight once the orders fill at :attr:`price`."""
+        values = (self.current + self.trade) * self.price
+        return dict(zip(self.ticker.tolist(), (values / self.nav).tolist(), strict=True))
+
+
+class Rebalancer:
+    """Turn target weights into buy and sell orders, for many accounts at a time.
+
+    A plan covers every ticker that is targeted, held or has open orders, computed as
+    numpy columns in one pass. Quantities are netted against open orders, buys are
+    capped at the instrument's ``max_open_quantity`` from ``catalog`` and sells at the
+    quantity available for trading, and buys are scaled down if cash (plus what the
+    sells raise) does not cover them.
+
+    With ``step`` set (one value, or per ticker), quantities are rounded towards zero to
+    a multiple of it, e.g. ``1.0`` for instruments without fractional shares. Trades
+    worth less than ``min_value`` are dropped. With ``limit_offset`` set, orders are
+    limit orders priced that fraction through the current price (above it for buys,
+    below for sells); otherwise they are market orders.
+    """
+
+    def __init__(
+        self,
+        catalog: InstrumentCatalog | None = None,
+        step: float | Mapping[str, float] | None = None,
+        min_value: float = 0.0,
+        limit_offset: float | None = None,
+    ) -> None:
+        self.catalog = catalog
+        self.step = step
+        self.min_value = min_value
+        self.limit_offset = limit_offset
+
+    def plan(
+        self,
+        targets: Mapping[str, float],
+        positions: Sequence[Position],
+        cash: Cash,
+        open_orders: Sequence[Order] = (),
+        prices: Mapping[str, float] | None = None,
+        fx_rates: Mapping[str, float] | None = None,
+    ) -> RebalancePlan:
+        """Plan the orders for one account.
+
+        ``targets`` are weights of the account's value (positions plus cash); held
+        tickers missing from it are sold. ``prices`` are in each instrument's currency
+        and are needed for tickers not held; ``fx_rates`` (account currency per unit)
+        convert them when that currency is not the account's.
+        """
+        held = {p.instrument.ticker: p for p in positions if p.instrument and p.instrument.ticker}
+        pending = [o for o in open_orders if o.ticker and o.status in OPEN_STATUSES]
+        tickers = sorted(targets.keys() | held.keys() | {o.ticker for o in pending if o.ticker})
+        index = {ticker: i for i, ticker in enumerate(tickers)}
+        size = len(tickers)
+
+        weight = np.array([targets.get(t, 0.0) for t in tickers], dtype=np.float64)
+        quantity = floats(held[t].quantity if t in held else 0.0 for t in tickers)
+        quantity = np.nan_to_num(quantity)
+        available = floats(
+            held[t].quantity_available_for_trading if t in held else 0.0 for t in tickers
+        )
+        available = np.where(np.isnan(available), quantity, available)
+        local, rate = self._prices(tickers, held, prices or {}, fx_rates or {})
+        price = local * rate
+
+        buying = np.zeros(size)
+        selling = np.zeros(size)
+        for order in pending:
+            remaining = abs(order.quantity or 0.0) - abs(order.filled_quantity or 0.0)
+            sell = order.side == OrderSide.SELL or (order.quantity or 0.0) < 0
+            (selling if sell else buying)[index[order.ticker or ""]] += max(remaining, 0.0)
+
+        missing = (np.isnan(price) | (price <= 0)) & ((weight > 0) | (quantity != 0))
+        if missing.any():
+            names = ", ".join(np.array(tickers)[missing].tolist())
+            raise ValueError(f"No price for {names}; pass it in prices (and fx_rates)")
+        price = np.where(missing, 0.0, np.nan_to_num(price))
+
+        free = (cash.available_to_trade or 0.0) + (cash.reserved_for_orders or 0.0)
+        nav = float((quantity * price).sum()) + free
+        current = quantity + buying - selling
+        budget = free - float(((buying - selling) * price).sum())
+
+        safe = np.where(price > 0, price, 1.0)
+        target = np.where(price > 0, weight * nav / safe, 0.0)
+        trade = target - current
+        limit = self._max_open(tickers)
+        trade = np.where(trade > 0, np.minimum(trade, np.maximum(limit - current, 0.0)), trade)
+        trade = np.maximum(trade, -np.maximum(available - selling, 0.0))
+        trade = self._round(trade, tickers, price)
+
+        sells = np.where(trade < 0, -trade * price, 0.0)
+        buys = np.where(trade > 0, trade * price, 0.0)
+        funds = budget + sells.sum()
+        if buys.sum() > max(funds, 0.0):
+            scale = max(funds, 0.0) / buys.sum()
+            trade = np.where(trade > 0, self._round(trade * scale, tickers, price), trade)
+            buys = np.where(trade > 0, trade * price, 0.0)
+
+        orders = self._orders(tickers, trade, local, price)
+        return RebalancePlan(
+            orders=orders,
+            ticker=labels(tickers),
+            weight=weight,
+            current=current,
+            trade=trade,
+            price=price,
+            nav=nav,
+            cash=budget + float(sells.sum() - buys.sum()),
+        )
+
+    def _prices(
+        self,
+        tickers: list[str],
+        held: dict[str, Position],
+        prices: Mapping[str, float],
+        fx_rates: Mapping[str, float],
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Per-share prices in instrument currency, and the rate to the account currency.
+
+        Held positions imply their rate from the wallet impact's current value. Without
+        a rate, prices in an unknown currency are taken to be in the account currency.
+        """
+        account = next(
+            (p.wallet_impact.currency for p in held.values() if p.wallet_impact), None
+        )
+        local = np.full(len(tickers), np.nan)
+        rate = np.full(len(tickers), np.nan)
+        for i, ticker in enumerate(tickers):
+            position = held.get(ticker)
+            instrument = self.catalog.instruments.get(ticker) if self.catalog else None
+            currency = instrument.currency_code if instrument else None
+            if currency is None and position is not None and position.instrument:
+                currency = position.instrument.currency
+            if position is not None and position.current_price:
+                local[i] = position.current_price
+                impact = position.wallet_impact
+                shares = position.quantity or 0.0
+                if impact and impact.current_value is not None and shares:
+                    rate[i] = impact.current_value / (shares * position.current_price)
+            if ticker in prices:
+                local[i] = prices[ticker]
+            if np.isnan(rate[i]):
+                if currency is not None and currency in fx_rates:
+                    rate[i] = fx_rates[currency]
+                elif currency is None or account is None or currency == account:
+                    rate[i] = 1.0
+        return local, rate
+
+    def _max_open(self, tickers: list[str]) -> npt.NDArray[np.float64]:
+        catalog = self.catalog
+        limits = [
+            catalog.instruments[t].max_open_quantity
+            if catalog is not None and t in catalog.instruments
+            else None
+            for t in tickers
+        ]
+        return np.array([np.inf if v is None else v for v in limits], dtype=np.float64)
+
+    def _round(
+        self,
+        trade: npt.NDArray[np.float64],
+        tickers: list[str],
+        price: npt.NDArray[np.float64],
+    ) -> npt.NDArray[np.float64]:
+        """Round towards zero to the step, then drop trades worth less than min_value."""
+        if self.step is None:
+            rounded = trade
+        else:
+            step = (
+                np.array([self.step.get(t, 0.0) for t in tickers], dtype=np.float64)
+                if isinstance(self.step, Mapping)
+                else np.full(len(tickers), self.step)
+            )
+            stepped = step > 0
+            safe = np.where(stepped, step, 1.0)
+            # Nudge up before flooring so 2.9999999 shares round to 3, not 2.
+            floored = np.sign(trade) * np.floor(np.abs(trade) / safe + 1e-9) * safe
+            rounded = np.where(stepped, floored, trade)
+        return np.where(np.abs(rounded) * price < self.min_value, 0.0, rounded)
+
+    def _orders(
+        self,
+        tickers: list[str],
+        trade: npt.NDArray[np.float64],
+        local: npt.NDArray[np.float64],
+        price: npt.NDArray[np.float64],
+    ) -> list[RebalanceOrder]:
+        # Sells first, each side largest first.
+        order = np.lexsort((-np.abs(trade) * price, trade > 0))
+        orders: list[RebalanceOrder] = []
+        for i in order[trade[order] != 0].tolist():
+            ticker, quantity = tickers[i], float(trade[i])
+            if self.limit_offset is None:
+                orders.append(MarketOrderRequest(ticker=ticker, quantity=quantity))
+            else:
+                through = self.limit_offset if quantity > 0 else -self.limit_offset
+                limit_price = round(float(local[i]) * (1.0 + through), 2)
+                orders.append(
+                    LimitOrderRequest(ticker=ticker, quantity=quantity, limit_price=limit_price)
+                )
+        return orders
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
-from .._base import _AsyncHttpEngine, _HttpEngine
+from .._base import _AsyncEngine, _Engine
 
 
 class SyncResource:
     """Base class for synchronous API resources."""
 
-    def __init__(self, engine: _HttpEngine) -> None:
+    def __init__(self, engine: _Engine) -> None:
         self._engine = engine
 
 
 class AsyncResource:
     """Base class for asynchronous API resources."""
 
-    def __init__(self, engine: _AsyncHttpEngine) -> None:
+    def __init__(self, engine: _AsyncEngine) -> None:
         self._engine = engine
@@ -5,6 +5,7 @@ from typing import Any
 
 from .._base import APIResponse, _parse_rate_limit
 from .._pagination import paginate_async, paginate_sync
+from ..ledger import DEFAULT_BUFFER, LedgerEntry, amerge_ledger, merge_ledger
 from ..models.history import (
     EnqueuedReportResponse,
     HistoricalOrder,
@@ -96,6 +97,15 @@ class HistoryResource(SyncResource):
             self._engine, _TRANSACTIONS_PATH, HistoryTransactionItem, params or None
         )
 
+    def iter_ledger(self, buffer: int = DEFAULT_BUFFER) -> Iterator[LedgerEntry]:
+        """Orders, dividends and transactions merged into one cash ledger, newest first.
+
+        The three histories are paged concurrently; see :func:`t212.ledger.merge_ledger`.
+        """
+        return merge_ledger(
+            self.iter_orders(), self.iter_dividends(), self.iter_transactions(), buffer
+        )
+
     def get_reports(self) -> APIResponse[list[ReportResponse]]:
         response = self._engine.get(_EXPORTS_PATH)
         reports = [ReportResponse.model_validate(item) for item in response.json()]
@@ -196,6 +206,15 @@ class AsyncHistoryResource(AsyncResource):
         ):
             yield item
 
+    def iter_ledger(self, buffer: int = DEFAULT_BUFFER) -> AsyncIterator[LedgerEntry]:
+        """Orders, dividends and transactions merged into one cash ledger, newest first.
+
+        The three histories are paged concurrently; see :func:`t212.ledger.amerge_ledger`.
+        """
+        return amerge_ledger(
+            self.iter_orders(), self.iter_dividends(), self.iter_transactions(), buffer
+        )
+
     async def get_reports(self) -> APIResponse[list[ReportResponse]]:
         response = await self._engine.get(_EXPORTS_PATH)
         reports = [ReportResponse.model_validate(item) for item in response.json()]
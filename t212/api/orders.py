@@ -1,22 +1,114 @@
 from __future__ import annotations
 
-from .._base import APIResponse, _parse_rate_limit
+import asyncio
+import math
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .._base import APIResponse, _AsyncEngine, _Engine, _parse_rate_limit
+from .._ratelimit import RateLimitStore, endpoint_key
+from .._serialize import encode
+from ..exceptions import NotFoundError, ValidationError
+from ..models.enums import OrderStatus
+from ..models.history import HistoricalOrder
 from ..models.orders import (
     LimitOrderRequest,
     MarketOrderRequest,
     Order,
+    OrderRequest,
     StopLimitOrderRequest,
     StopOrderRequest,
 )
+from ..preflight import InstrumentCatalog, Preflight
+from ..store import TERMINAL_STATUSES, OrderStore
 from ._resource import AsyncResource, SyncResource
+from .history import AsyncHistoryResource, HistoryResource
+from .instruments import AsyncInstrumentsResource, InstrumentsResource
 
 _BASE_PATH = "/api/v0/equity/orders"
 
+_ORDER_PATHS: dict[type[OrderRequest], str] = {
+    MarketOrderRequest: f"{_BASE_PATH}/market",
+    LimitOrderRequest: f"{_BASE_PATH}/limit",
+    StopOrderRequest: f"{_BASE_PATH}/stop",
+    StopLimitOrderRequest: f"{_BASE_PATH}/stop_limit",
+}
+
+_LIST_KEY = endpoint_key("GET", _BASE_PATH)
+_GET_KEY = endpoint_key("GET", f"{_BASE_PATH}/0")
+_GET_INTERVAL = 1.0  # GET /orders/{id}: 1 req / 1s
+_HISTORY_PAGE_SIZE = 50
+_CONFIRM_POLL = 0.05  # pause between cancel checks; the GET budget does the real pacing
+
+
+@dataclass(frozen=True)
+class ReplaceResult:
+    """Outcome of :meth:`OrdersResource.replace`.
+
+    ``previous`` is the old order's final snapshot (None if it was found neither open nor
+    in history) and ``order`` the new order, or None if it was not placed because the old
+    one was not confirmed cancelled or had already filled the whole request. ``gap`` is
+    the seconds from sending the cancel until the new order was acknowledged (or the
+    replace gave up), and ``cancel_confirmed`` the seconds until the cancel was confirmed.
+    """
+
+    previous: Order | None
+    order: Order | None
+    gap: float
+    cancel_confirmed: float
+
+
+# An order's items in order history, newest first; aliased here because the resources'
+# own list() methods shadow the builtin inside their class bodies.
+_HistoryItems = list[HistoricalOrder]
+
+
+def _budget_wait(store: RateLimitStore, key: str) -> float:
+    """Seconds until ``key`` has budget again, from the last rate-limit headers seen."""
+    info = store.get(key)
+    if info is None or info.remaining is None or info.remaining > 0 or info.reset is None:
+        return 0.0
+    return max(0.0, info.reset - time.time())
+
+
+def _use_list(store: RateLimitStore, count: int) -> bool:
+    """Whether one ``list()`` answers ``count`` lookups sooner than targeted ``get``s."""
+    gets = _budget_wait(store, _GET_KEY) + (count - 1) * _GET_INTERVAL
+    return _budget_wait(store, _LIST_KEY) < gets
+
+
+def _ordered(ids: list[int], found: dict[int, Order]) -> dict[int, Order]:
+    return {order_id: found[order_id] for order_id in ids if order_id in found}
+
+
+def _unfilled(request: OrderRequest, previous: Order) -> OrderRequest | None:
+    """``request`` less what ``previous`` filled before its cancel; None if nothing is left."""
+    filled = abs(previous.filled_quantity or 0.0)
+    if not filled:
+        return request
+    remaining = abs(request.quantity) - filled
+    if remaining <= 0:
+        return None
+    return request.model_copy(update={"quantity": math.copysign(remaining, request.quantity)})
+
 
 class OrdersResource(SyncResource):
+    def __init__(
+        self,
+        engine: _Engine,
+        store: OrderStore | None = None,
+        preflight: Preflight | None = None,
+    ) -> None:
+        super().__init__(engine)
+        self.store = store if store is not None else OrderStore()
+        self.preflight = preflight
+
     def list(self) -> APIResponse[list[Order]]:
+        sent = time.monotonic()
         response = self._engine.get(_BASE_PATH)
         orders = [Order.model_validate(item) for item in response.json()]
+        self.store.reconcile(orders, sent)
         return APIResponse(
             data=orders,
             rate_limit=_parse_rate_limit(response.headers),
@@ -25,69 +117,195 @@ class OrdersResource(SyncResource):
 
     def get(self, order_id: int) -> APIResponse[Order]:
         response = self._engine.get(f"{_BASE_PATH}/{order_id}")
+        order = Order.model_validate(response.json())
+        self.store.apply(order)
         return APIResponse(
-            data=Order.model_validate(response.json()),
+            data=order,
             rate_limit=_parse_rate_limit(response.headers),
             status_code=response.status_code,
         )
 
+    def lookup(self, order_id: int, max_age: float = 1.0) -> Order:
+        """Read an order from :attr:`store` if fresh, otherwise fetch it with :meth:`get`.
+
+        Terminal orders are always fresh; others must have been updated within ``max_age``
+        seconds, e.g. by a ``list()`` made for another purpose.
+        """
+        cached = self.store.get(order_id, max_age)
+        if cached is not None:
+            return cached
+        return self.get(order_id).data
+
     def cancel(self, order_id: int) -> APIResponse[None]:
         response = self._engine.delete(f"{_BASE_PATH}/{order_id}")
+        self.store.mark(order_id, OrderStatus.CANCELLING)
         return APIResponse(
             data=None,
             rate_limit=_parse_rate_limit(response.headers),
             status_code=response.status_code,
         )
 
-    def place_market(self, request: MarketOrderRequest) -> APIResponse[Order]:
-        response = self._engine.post(
-            f"{_BASE_PATH}/market",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
+    def get_many(self, ids: Iterable[int], history: bool = True) -> dict[int, Order]:
+        """Look up many orders with as few requests as the budget allows, keyed by id.
+
+        Open orders come from a single ``list()`` call, or from targeted ``get`` calls
+        when there are few ids and the list budget is exhausted. Ids that are not open
+        are searched for in order history (newest first, stopping once older than the
+        oldest missing id) unless ``history`` is false. Unknown ids are left out.
+        """
+        wanted = list(dict.fromkeys(ids))
+        missing = set(wanted)
+        found: dict[int, Order] = {}
+        if not wanted:
+            return found
+        if _use_list(self._engine.rate_limit_store, len(wanted)):
+            open_orders = self.list().data
+            found = {o.id: o for o in open_orders if o.id is not None and o.id in missing}
+        else:
+            for order_id in wanted:
+                try:
+                    found[order_id] = self.get(order_id).data
+                except NotFoundError:
+                    pass
+        missing -= found.keys()
+        if history and missing:
+            found.update(self.find_in_history(missing))
+        return _ordered(wanted, found)
+
+    def find_in_history(self, ids: Iterable[int]) -> dict[int, Order]:
+        """Look up orders that are no longer open in order history, keyed by id.
+
+        Each order's latest snapshot wins; unknown ids are left out.
+        """
+        found = self.history_of(ids)
+        return {i: order for i, items in found.items() if (order := items[0].order) is not None}
+
+    def history_of(self, ids: Iterable[int]) -> dict[int, _HistoryItems]:
+        """Every order-history item of ``ids`` (e.g. one per fill), newest first, keyed by id.
+
+        History is read newest first, stopping once older than the oldest id. Each
+        order's latest snapshot is written to :attr:`store`.
+        """
+        wanted = set(ids)
+        found: dict[int, _HistoryItems] = {}
+        if not wanted:
+            return found
+        oldest = min(wanted)
+        for item in HistoryResource(self._engine).iter_orders(limit=_HISTORY_PAGE_SIZE):
+            order = item.order
+            if order is None or order.id is None:
+                continue
+            if order.id < oldest:
+                break
+            if order.id in wanted:
+                if order.id not in found:
+                    self.store.apply(order)
+                found.setdefault(order.id, []).append(item)
+        return found
+
+    def load_preflight(self) -> Preflight:
+        """Fetch instrument and exchange metadata and check every :meth:`submit` against it.
+
+        Uses one request from each of the (slow) metadata budgets; call again to refresh
+        the exchange schedules, which only cover the coming days.
+        """
+        instruments = InstrumentsResource(self._engine)
+        catalog = InstrumentCatalog(instruments.list().data, instruments.get_exchanges().data)
+        self.preflight = Preflight(catalog, self.store)
+        return self.preflight
+
+    def submit(self, request: OrderRequest) -> APIResponse[Order]:
+        """Place any order request with as little work as possible before it is sent.
+
+        The body is encoded by the request type's cached serializer and posted as bytes.
+        With :attr:`preflight` set, the request is checked locally first and a
+        :class:`~t212.PreflightError` raised instead of spending order budget.
+        """
+        if self.preflight is not None:
+            self.preflight.check(request)
+        return self._post(_ORDER_PATHS[type(request)], encode(request))
+
+    def replace(self, order_id: int, request: OrderRequest, timeout: float = 10.0) -> ReplaceResult:
+        """Cancel an order and place ``request`` in its stead, keeping the gap short.
+
+        ``request`` is checked and encoded before the cancel goes out. The cancel is then
+        confirmed with ``get`` calls paced by that endpoint's budget, and the new order
+        is sent as soon as the old one is no longer working, waiting only for the new
+        order's own endpoint budget. ``get`` only serves pending orders, so once the old
+        order is gone its final status is read from order history. Only a cancelled order
+        is replaced: if it filled instead, is still cancelling (or replacing) after
+        ``timeout`` seconds, or cannot be found, nothing is placed. If it partly filled
+        before the cancel, the new order is reduced by the filled quantity.
+        """
+        if self.preflight is not None:
+            self.preflight.check(request)
+        path, body = _ORDER_PATHS[type(request)], encode(request)
+        started = time.monotonic()
+        try:
+            self.cancel(order_id)
+        except (NotFoundError, ValidationError):
+            pass  # already gone or no longer cancellable; the check below says which
+        previous = self._confirm_cancel(order_id, started + timeout)
+        confirmed = time.monotonic() - started
+        remaining = None
+        if previous is not None and previous.status == OrderStatus.CANCELLED:
+            remaining = _unfilled(request, previous)
+        if remaining is None:
+            return ReplaceResult(previous, None, confirmed, confirmed)
+        if remaining is not request:
+            body = encode(remaining)
+        order = self._post(path, body).data
+        return ReplaceResult(previous, order, time.monotonic() - started, confirmed)
+
+    def _confirm_cancel(self, order_id: int, deadline: float) -> Order | None:
+        while True:
+            try:
+                order = self.get(order_id).data
+            except NotFoundError:
+                return self.find_in_history({order_id}).get(order_id)
+            if order.status in TERMINAL_STATUSES or time.monotonic() >= deadline:
+                return order
+            time.sleep(_CONFIRM_POLL)
+
+    def _post(self, path: str, body: bytes) -> APIResponse[Order]:
+        response = self._engine.post_raw(path, body)
+        order = Order.model_validate_json(response.content)
+        self.store.apply(order)
         return APIResponse(
-            data=Order.model_validate(response.json()),
+            data=order,
             rate_limit=_parse_rate_limit(response.headers),
             status_code=response.status_code,
         )
 
+    def place_market(self, request: MarketOrderRequest) -> APIResponse[Order]:
+        return self.submit(request)
+
     def place_limit(self, request: LimitOrderRequest) -> APIResponse[Order]:
-        response = self._engine.post(
-            f"{_BASE_PATH}/limit",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return APIResponse(
-            data=Order.model_validate(response.json()),
-            rate_limit=_parse_rate_limit(response.headers),
-            status_code=response.status_code,
-        )
+        return self.submit(request)
 
     def place_stop(self, request: StopOrderRequest) -> APIResponse[Order]:
-        response = self._engine.post(
-            f"{_BASE_PATH}/stop",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return APIResponse(
-            data=Order.model_validate(response.json()),
-            rate_limit=_parse_rate_limit(response.headers),
-            status_code=response.status_code,
-        )
+        return self.submit(request)
 
     def place_stop_limit(self, request: StopLimitOrderRequest) -> APIResponse[Order]:
-        response = self._engine.post(
-            f"{_BASE_PATH}/stop_limit",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return APIResponse(
-            data=Order.model_validate(response.json()),
-            rate_limit=_parse_rate_limit(response.headers),
-            status_code=response.status_code,
-        )
+        return self.submit(request)
 
 
 class AsyncOrdersResource(AsyncResource):
+    def __init__(
+        self,
+        engine: _AsyncEngine,
+        store: OrderStore | None = None,
+        preflight: Preflight | None = None,
+    ) -> None:
+        super().__init__(engine)
+        self.store = store if store is not None else OrderStore()
+        self.preflight = preflight
+
     async def list(self) -> APIResponse[list[Order]]:
+        sent = time.monotonic()
         response = await self._engine.get(_BASE_PATH)
         orders = [Order.model_validate(item) for item in response.json()]
+        self.store.reconcile(orders, sent)
         return APIResponse(
             data=orders,
             rate_limit=_parse_rate_limit(response.headers),
@@ -96,60 +314,178 @@ class AsyncOrdersResource(AsyncResource):
 
     async def get(self, order_id: int) -> APIResponse[Order]:
         response = await self._engine.get(f"{_BASE_PATH}/{order_id}")
+        order = Order.model_validate(response.json())
+        self.store.apply(order)
         return APIResponse(
-            data=Order.model_validate(response.json()),
+            data=order,
             rate_limit=_parse_rate_limit(response.headers),
             status_code=response.status_code,
         )
 
+    async def lookup(self, order_id: int, max_age: float = 1.0) -> Order:
+        """Read an order from :attr:`store` if fresh, otherwise fetch it with :meth:`get`.
+
+        Terminal orders are always fresh; others must have been updated within ``max_age``
+        seconds, e.g. by a ``list()`` made for another purpose.
+        """
+        cached = self.store.get(order_id, max_age)
+        if cached is not None:
+            return cached
+        return (await self.get(order_id)).data
+
     async def cancel(self, order_id: int) -> APIResponse[None]:
         response = await self._engine.delete(f"{_BASE_PATH}/{order_id}")
+        self.store.mark(order_id, OrderStatus.CANCELLING)
         return APIResponse(
             data=None,
             rate_limit=_parse_rate_limit(response.headers),
             status_code=response.status_code,
         )
 
-    async def place_market(self, request: MarketOrderRequest) -> APIResponse[Order]:
-        response = await self._engine.post(
-            f"{_BASE_PATH}/market",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
+    async def get_many(self, ids: Iterable[int], history: bool = True) -> dict[int, Order]:
+        """Look up many orders with as few requests as the budget allows, keyed by id.
+
+        Open orders come from a single ``list()`` call, or from targeted ``get`` calls
+        when there are few ids and the list budget is exhausted. Ids that are not open
+        are searched for in order history (newest first, stopping once older than the
+        oldest missing id) unless ``history`` is false. Unknown ids are left out.
+        """
+        wanted = list(dict.fromkeys(ids))
+        missing = set(wanted)
+        found: dict[int, Order] = {}
+        if not wanted:
+            return found
+        if _use_list(self._engine.rate_limit_store, len(wanted)):
+            open_orders = (await self.list()).data
+            found = {o.id: o for o in open_orders if o.id is not None and o.id in missing}
+        else:
+            for order_id in wanted:
+                try:
+                    found[order_id] = (await self.get(order_id)).data
+                except NotFoundError:
+                    pass
+        missing -= found.keys()
+        if history and missing:
+            found.update(await self.find_in_history(missing))
+        return _ordered(wanted, found)
+
+    async def find_in_history(self, ids: Iterable[int]) -> dict[int, Order]:
+        """Look up orders that are no longer open in order history, keyed by id.
+
+        Each order's latest snapshot wins; unknown ids are left out.
+        """
+        found = await self.history_of(ids)
+        return {i: order for i, items in found.items() if (order := items[0].order) is not None}
+
+    async def history_of(self, ids: Iterable[int]) -> dict[int, _HistoryItems]:
+        """Every order-history item of ``ids`` (e.g. one per fill), newest first, keyed by id.
+
+        History is read newest first, stopping once older than the oldest id. Each
+        order's latest snapshot is written to :attr:`store`.
+        """
+        wanted = set(ids)
+        found: dict[int, _HistoryItems] = {}
+        if not wanted:
+            return found
+        oldest = min(wanted)
+        orders = AsyncHistoryResource(self._engine).iter_orders(limit=_HISTORY_PAGE_SIZE)
+        async for item in orders:
+            order = item.order
+            if order is None or order.id is None:
+                continue
+            if order.id < oldest:
+                break
+            if order.id in wanted:
+                if order.id not in found:
+                    self.store.apply(order)
+                found.setdefault(order.id, []).append(item)
+        return found
+
+    async def load_preflight(self) -> Preflight:
+        """Fetch instrument and exchange metadata and check every :meth:`submit` against it.
+
+        Uses one request from each of the (slow) metadata budgets; call again to refresh
+        the exchange schedules, which only cover the coming days.
+        """
+        instruments = AsyncInstrumentsResource(self._engine)
+        tradable = (await instruments.list()).data
+        exchanges = (await instruments.get_exchanges()).data
+        self.preflight = Preflight(InstrumentCatalog(tradable, exchanges), self.store)
+        return self.preflight
+
+    async def submit(self, request: OrderRequest) -> APIResponse[Order]:
+        """Place any order request with as little work as possible before it is sent.
+
+        The body is encoded by the request type's cached serializer and posted as bytes.
+        With :attr:`preflight` set, the request is checked locally first and a
+        :class:`~t212.PreflightError` raised instead of spending order budget.
+        """
+        if self.preflight is not None:
+            self.preflight.check(request)
+        return await self._post(_ORDER_PATHS[type(request)], encode(request))
+
+    async def replace(
+        self, order_id: int, request: OrderRequest, timeout: float = 10.0
+    ) -> ReplaceResult:
+        """Cancel an order and place ``request`` in its stead, keeping the gap short.
+
+        ``request`` is checked and encoded before the cancel goes out. The cancel is then
+        confirmed with ``get`` calls paced by that endpoint's budget, and the new order
+        is sent as soon as the old one is no longer working, waiting only for the new
+        order's own endpoint budget. ``get`` only serves pending orders, so once the old
+        order is gone its final status is read from order history. Only a cancelled order
+        is replaced: if it filled instead, is still cancelling (or replacing) after
+        ``timeout`` seconds, or cannot be found, nothing is placed. If it partly filled
+        before the cancel, the new order is reduced by the filled quantity.
+        """
+        if self.preflight is not None:
+            self.preflight.check(request)
+        path, body = _ORDER_PATHS[type(request)], encode(request)
+        started = time.monotonic()
+        try:
+            await self.cancel(order_id)
+        except (NotFoundError, ValidationError):
+            pass  # already gone or no longer cancellable; the check below says which
+        previous = await self._confirm_cancel(order_id, started + timeout)
+        confirmed = time.monotonic() - started
+        remaining = None
+        if previous is not None and previous.status == OrderStatus.CANCELLED:
+            remaining = _unfilled(request, previous)
+        if remaining is None:
+            return ReplaceResult(previous, None, confirmed, confirmed)
+        if remaining is not request:
+            body = encode(remaining)
+        order = (await self._post(path, body)).data
+        return ReplaceResult(previous, order, time.monotonic() - started, confirmed)
+
+    async def _confirm_cancel(self, order_id: int, deadline: float) -> Order | None:
+        while True:
+            try:
+                order = (await self.get(order_id)).data
+            except NotFoundError:
+                return (await self.find_in_history({order_id})).get(order_id)
+            if order.status in TERMINAL_STATUSES or time.monotonic() >= deadline:
+                return order
+            await asyncio.sleep(_CONFIRM_POLL)
+
+    async def _post(self, path: str, body: bytes) -> APIResponse[Order]:
+        response = await self._engine.post_raw(path, body)
+        order = Order.model_validate_json(response.content)
+        self.store.apply(order)
         return APIResponse(
-            data=Order.model_validate(response.json()),
+            data=order,
             rate_limit=_parse_rate_limit(response.headers),
             status_code=response.status_code,
         )
 
+    async def place_market(self, request: MarketOrderRequest) -> APIResponse[Order]:
+        return await self.submit(request)
+
     async def place_limit(self, request: LimitOrderRequest) -> APIResponse[Order]:
-        response = await self._engine.post(
-            f"{_BASE_PATH}/limit",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return APIResponse(
-            data=Order.model_validate(response.json()),
-            rate_limit=_parse_rate_limit(response.headers),
-            status_code=response.status_code,
-        )
+        return await self.submit(request)
 
     async def place_stop(self, request: StopOrderRequest) -> APIResponse[Order]:
-        response = await self._engine.post(
-            f"{_BASE_PATH}/stop",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return APIResponse(
-            data=Order.model_validate(response.json()),
-            rate_limit=_parse_rate_limit(response.headers),
-            status_code=response.status_code,
-        )
+        return await self.submit(request)
 
     async def place_stop_limit(self, request: StopLimitOrderRequest) -> APIResponse[Order]:
-        response = await self._engine.post(
-            f"{_BASE_PATH}/stop_limit",
-            json=request.model_dump(by_alias=True, exclude_none=True),
-        )
-        return APIResponse(
-            data=Order.model_validate(response.json()),
-            rate_limit=_parse_rate_limit(response.headers),
-            status_code=response.status_code,
-        )
+        return await self.submit(request)
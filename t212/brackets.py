@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections.abc import Iterable
+from enum import StrEnum
+from typing import Any
+
+import httpx
+
+from .api.orders import AsyncOrdersResource
+from .exceptions import NotFoundError, Trading212Error, ValidationError
+from .models.enums import OrderStatus, TimeValidity
+from .models.orders import LimitOrderRequest, Order, OrderRequest, StopOrderRequest
+from .store import TERMINAL_STATUSES
+
+
+class EmulationStatus(StrEnum):
+    PENDING = "PENDING"  # bracket entry working
+    ACTIVE = "ACTIVE"  # exit legs working
+    FILLED = "FILLED"  # legs filled (up to the protected quantity), the rest cancelled
+    CANCELLED = "CANCELLED"  # ended without an exit fill
+    OVERFILLED = "OVERFILLED"  # a sibling filled before its cancel or resize landed
+    FAILED = "FAILED"  # placing a leg failed; see ``error``
+
+
+_FINAL = frozenset(
+    {
+        EmulationStatus.FILLED,
+        EmulationStatus.CANCELLED,
+        EmulationStatus.OVERFILLED,
+        EmulationStatus.FAILED,
+    }
+)
+
+
+_EPSILON = 1e-9  # fractional share quantities are compared with this tolerance
+
+
+class EmulatedOrder:
+    """A bracket or one-cancels-other group worked by an :class:`OrderEmulator`.
+
+    ``legs`` holds the latest snapshot of each exit (or OCO) order by id, including legs
+    replaced by smaller ones after a partial fill, and ``filled`` the leg with the largest
+    fill. ``reaction_times`` records, for each fill acted on, the seconds from the poll
+    that saw it until the follow-up orders, resizes or cancels were acknowledged.
+    """
+
+    def __init__(self, entry: Order | None = None) -> None:
+        self.entry = entry
+        self.legs: dict[int, Order] = {}
+        self.status = EmulationStatus.PENDING if entry else EmulationStatus.ACTIVE
+        self.filled: Order | None = None
+        self.error: BaseException | None = None
+        self.reaction_times: list[float] = []
+        self._exits: tuple[float, float] | None = None
+        # Per leg id: the request it was placed from, and the unsigned quantity the leg
+        # (and any leg it was resized into) may fill in total.
+        self._requests: dict[int, OrderRequest] = {}
+        self._sizes: dict[int, float] = {}
+        self._resized: set[int] = set()
+        self._cancelling = False
+        self._cancel_requested = False
+        self._finished = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINAL
+
+    async def wait(self) -> EmulatedOrder:
+        await self._finished.wait()
+        return self
+
+    def _finish(self, status: EmulationStatus) -> None:
+        self.status = status
+        self._finished.set()
+
+
+class OrderEmulator:
+    """Emulate bracket and one-cancels-other orders on top of single orders.
+
+    Working orders are polled together every ``interval`` seconds with
+    :meth:`~t212.api.orders.AsyncOrdersResource.get_many`, which spends whichever of
+    the list, get and history budgets answers soonest. When a poll shows a fill the
+    follow-up requests go out at once and concurrently: a filled bracket entry places its
+    take-profit limit and stop-loss stop legs. A partial fill on one leg shrinks the
+    others to the quantity still open, by replacing them with smaller orders; once a leg
+    fills in full (or the fills cover the whole quantity) the others are cancelled.
+    Order placement and cancellation are critical-priority requests, so they overtake
+    polling, and the engine's rate-limit store keeps them within each endpoint's limit.
+
+    Usage::
+
+        async with OrderEmulator(client.orders) as emulator:
+            group = await emulator.bracket(entry, take_profit=190.0, stop_loss=170.0)
+            await group.wait()
+    """
+
+    def __init__(
+        self,
+        orders: AsyncOrdersResource,
+        interval: float = 1.0,
+        exit_validity: TimeValidity = TimeValidity.GOOD_TILL_CANCEL,
+    ) -> None:
+        self._orders = orders
+        self.interval = interval
+        self.exit_validity = exit_validity
+        self._watch: dict[int, EmulatedOrder] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
+
+    async def bracket(
+        self, entry: OrderRequest, take_profit: float, stop_loss: float
+    ) -> EmulatedOrder:
+        """Place ``entry``; once it fills, protect the filled quantity with exit legs."""
+        group = EmulatedOrder((await self._orders.submit(entry)).data)
+        group._exits = (take_profit, stop_loss)
+        self._track(group, [group.entry])
+        return group
+
+    async def oco(self, first: OrderRequest, second: OrderRequest) -> EmulatedOrder:
+        """Place two orders at once; a fill on either cancels the other."""
+        group = EmulatedOrder()
+        placed = await self._place(group, [first, second])
+        if group.error is not None:
+            raise group.error
+        self._track(group, placed)
+        return group
+
+    async def cancel(self, group: EmulatedOrder) -> None:
+        """Cancel every working order in ``group``; it ends once they are confirmed."""
+        group._cancel_requested = True
+        orders = [group.entry] if group.status is EmulationStatus.PENDING else []
+        orders += [leg for leg in group.legs.values() if leg.status not in TERMINAL_STATUSES]
+        await asyncio.gather(*(self._cancel(group, o) for o in orders if o is not None))
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def __aenter__(self) -> OrderEmulator:
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        await self.aclose()
+
+    def _track(self, group: EmulatedOrder, orders: Iterable[Order | None]) -> None:
+        for order in orders:
+            if order is not None and order.id is not None:
+                self._watch[order.id] = group
+                if order is not group.entry:
+                    group.legs[order.id] = order
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while self._watch:
+            started = time.monotonic()
+            try:
+                found = await self._orders.get_many(list(self._watch))
+            except (Trading212Error, httpx.HTTPError):
+                found = {}  # try again next round
+            updates: dict[EmulatedOrder, list[Order]] = {}
+            for order_id, order in found.items():
+                group = self._watch.get(order_id)
+                if group is not None:
+                    updates.setdefault(group, []).append(order)
+            await asyncio.gather(*(self._apply(g, o, started) for g, o in updates.items()))
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except TimeoutError:
+                pass
+
+    async def _apply(self, group: EmulatedOrder, orders: list[Order], seen_at: float) -> None:
+        for order in orders:
+            assert order.id is not None
+            if order.status in TERMINAL_STATUSES:
+                self._watch.pop(order.id, None)
+            if group.entry is not None and order.id == group.entry.id:
+                group.entry = order
+                if order.status in TERMINAL_STATUSES:
+                    await self._entry_done(group, order, seen_at)
+            else:
+                group.legs[order.id] = order
+        if group.legs and group.status is EmulationStatus.ACTIVE:
+            await self._legs_changed(group, seen_at)
+
+    async def _entry_done(self, group: EmulatedOrder, entry: Order, seen_at: float) -> None:
+        filled = entry.filled_quantity or 0.0
+        if not filled or group._cancel_requested or group._exits is None:
+            group._finish(EmulationStatus.CANCELLED)
+            return
+        assert entry.ticker is not None and entry.quantity is not None
+        quantity = -filled if entry.quantity > 0 else filled
+        take_profit, stop_loss = group._exits
+        exits: list[OrderRequest] = [
+            LimitOrderRequest(
+                ticker=entry.ticker,
+                quantity=quantity,
+                limit_price=take_profit,
+                time_validity=self.exit_validity,
+            ),
+            StopOrderRequest(
+                ticker=entry.ticker,
+                quantity=quantity,
+                stop_price=stop_loss,
+                time_validity=self.exit_validity,
+            ),
+        ]
+        placed = await self._place(group, exits)
+        group.reaction_times.append(time.monotonic() - seen_at)
+        if group.done:
+            return
+        group.status = EmulationStatus.ACTIVE
+        self._track(group, placed)
+
+    async def _legs_changed(self, group: EmulatedOrder, seen_at: float) -> None:
+        legs = list(group.legs.values())
+        filled = sum(abs(leg.filled_quantity or 0.0) for leg in legs)
+        working = [leg for leg in legs if leg.status not in TERMINAL_STATUSES]
+        ended = any(
+            leg.status == OrderStatus.FILLED
+            or (leg.status in TERMINAL_STATUSES and leg.id not in group._resized)
+            or filled >= self._size(group, leg) - _EPSILON
+            for leg in legs
+        )
+        if ended and not group._cancelling:
+            group._cancelling = True
+            await asyncio.gather(*(self._cancel(group, leg) for leg in working))
+            if working:
+                group.reaction_times.append(time.monotonic() - seen_at)
+        elif filled and not group._cancelling:
+            # Each working leg may only fill what the fills so far have left open.
+            oversized = [
+                leg
+                for leg in working
+                if abs(leg.quantity or 0.0) - abs(leg.filled_quantity or 0.0)
+                > self._size(group, leg) - filled + _EPSILON
+            ]
+            await asyncio.gather(*(self._resize(group, leg, filled) for leg in oversized))
+            if oversized:
+                group.reaction_times.append(time.monotonic() - seen_at)
+        legs = list(group.legs.values())
+        if any(leg.status not in TERMINAL_STATUSES for leg in legs):
+            return
+        fills = [leg for leg in legs if leg.filled_quantity]
+        group.filled = max(fills, key=lambda leg: abs(leg.filled_quantity or 0.0), default=None)
+        filled = sum(abs(leg.filled_quantity or 0.0) for leg in legs)
+        if group.error is not None:
+            group._finish(EmulationStatus.FAILED)
+        elif filled > max(self._size(group, leg) for leg in legs) + _EPSILON:
+            group._finish(EmulationStatus.OVERFILLED)
+        else:
+            group._finish(EmulationStatus.FILLED if filled else EmulationStatus.CANCELLED)
+
+    @staticmethod
+    def _size(group: EmulatedOrder, leg: Order) -> float:
+        assert leg.id is not None
+        return group._sizes.get(leg.id, abs(leg.quantity or 0.0))
+
+    async def _resize(self, group: EmulatedOrder, leg: Order, filled: float) -> None:
+        """Replace ``leg`` with an order for what the group's fills have left open."""
+        assert leg.id is not None
+        request = group._requests[leg.id]
+        # replace() takes off what the leg itself has filled by the time it is cancelled.
+        quantity = self._size(group, leg) - filled + abs(leg.filled_quantity or 0.0)
+        smaller = request.model_copy(update={"quantity": math.copysign(quantity, request.quantity)})
+        try:
+            result = await self._orders.replace(leg.id, smaller)
+        except (Trading212Error, httpx.HTTPError) as exc:
+            group.error = group.error or exc
+            return
+        if result.previous is not None:
+            group.legs[leg.id] = result.previous
+            if result.previous.status in TERMINAL_STATUSES:
+                self._watch.pop(leg.id, None)
+        order = result.order
+        if order is None or order.id is None:
+            return  # the leg filled or would not cancel; the next poll unwinds the group
+        group._resized.add(leg.id)
+        group._requests[order.id] = request
+        group._sizes[order.id] = self._size(group, leg)
+        self._track(group, [order])
+
+    async def _place(self, group: EmulatedOrder, requests: list[OrderRequest]) -> list[Order]:
+        results = await asyncio.gather(
+            *(self._orders.submit(r) for r in requests), return_exceptions=True
+        )
+        for request, result in zip(requests, results, strict=True):
+            if not isinstance(result, BaseException) and result.data.id is not None:
+                group._requests[result.data.id] = request
+                group._sizes[result.data.id] = abs(request.quantity)
+        placed = [r.data for r in results if not isinstance(r, BaseException)]
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            # Don't leave half a group working: pull back whatever did get placed.
+            group.error = errors[0]
+            group._cancelling = True
+            await asyncio.gather(*(self._cancel(group, order) for order in placed))
+            if not placed:
+                group._finish(EmulationStatus.FAILED)
+        return placed
+
+    async def _cancel(self, group: EmulatedOrder, order: Order) -> None:
+        assert order.id is not None
+        try:
+            await self._orders.cancel(order.id)
+        except (NotFoundError, ValidationError):
+            pass  # already filled or gone; the next poll shows which
+        except (Trading212Error, httpx.HTTPError) as exc:
+            group.error = group.error or exc
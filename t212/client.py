@@ -1,8 +1,17 @@
 from __future__ import annotations
 
-from typing import Any
-
-from ._base import _AsyncHttpEngine, _HttpEngine
+import contextvars
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
+from typing import Any, TypeVar
+
+from ._adaptive import AdaptiveConcurrency
+from ._base import _AsyncEngine, _AsyncHttpEngine, _Engine, _HttpEngine
+from ._circuit import CircuitBreaker
+from ._metrics import ClientMetrics
+from ._priority import Priority, prioritized
+from ._ratelimit import RateLimitStore
 from .api.account import AccountResource, AsyncAccountResource
 from .api.history import AsyncHistoryResource, HistoryResource
 from .api.instruments import AsyncInstrumentsResource, InstrumentsResource
@@ -10,11 +19,21 @@ from .api.orders import AsyncOrdersResource, OrdersResource
 from .api.pies import AsyncPiesResource, PiesResource
 from .api.positions import AsyncPositionsResource, PositionsResource
 from .models.enums import Environment
+from .scheduler import PollScheduler
+from .snapshot import AccountSnapshot, afetch_snapshot, fetch_snapshot
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DEFAULT_MAP_WORKERS = 8
 
 
 class Trading212Client:
     """Synchronous client for the Trading 212 Public API.
 
+    A client may be shared by any number of threads: they use one connection pool,
+    rate-limit budget and priority gate, and :meth:`metrics` reports requests per thread.
+
     Usage::
 
         with Trading212Client("key", "secret", env=Environment.LIVE) as client:
@@ -26,15 +45,75 @@ class Trading212Client:
         api_key: str,
         api_secret: str,
         env: Environment = Environment.DEMO,
+        max_in_flight: int | None = None,
+        rate_limit_store: RateLimitStore | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        low_latency: bool = False,
         **httpx_kwargs: Any,
     ) -> None:
-        self._engine = _HttpEngine(api_key, api_secret, env=env, **httpx_kwargs)
-        self.account = AccountResource(self._engine)
-        self.instruments = InstrumentsResource(self._engine)
-        self.orders = OrdersResource(self._engine)
-        self.positions = PositionsResource(self._engine)
-        self.history = HistoryResource(self._engine)
-        self.pies = PiesResource(self._engine)
+        self._engine: _Engine = _HttpEngine(
+            api_key,
+            api_secret,
+            env=env,
+            max_in_flight=max_in_flight,
+            rate_limit_store=rate_limit_store,
+            circuit_breaker=circuit_breaker,
+            low_latency=low_latency,
+            **httpx_kwargs,
+        )
+        self._bind(self._engine)
+
+    def _bind(self, engine: _Engine) -> None:
+        self._engine = engine
+        self.account: AccountResource = AccountResource(engine)
+        self.instruments: InstrumentsResource = InstrumentsResource(engine)
+        self.orders: OrdersResource = OrdersResource(engine)
+        self.positions: PositionsResource = PositionsResource(engine)
+        self.history: HistoryResource = HistoryResource(engine)
+        self.pies: PiesResource = PiesResource(engine)
+
+    @classmethod
+    def via_gateway(cls, socket_path: str) -> Trading212Client:
+        """Connect to a local :class:`~t212.gateway.Gateway` instead of the API."""
+        from .gateway import GatewayEngine
+
+        client = cls.__new__(cls)
+        client._bind(GatewayEngine(socket_path))
+        return client
+
+    def reserve(self, slots: int = 1) -> AbstractContextManager[None]:
+        """Hold ``slots`` request slots for critical requests, pausing bulk work meanwhile."""
+        return self._engine.gate.reserve(slots)
+
+    def prioritized(self, priority: Priority) -> AbstractContextManager[None]:
+        """Override the priority class of requests made inside this context."""
+        return prioritized(priority)
+
+    def metrics(self) -> ClientMetrics:
+        """Snapshot of the engine's internal state, e.g. per-endpoint circuit breakers."""
+        return self._engine.metrics()
+
+    def warm(self) -> None:
+        """Open a connection ahead of time so the next order skips connection setup."""
+        self._engine.warm()
+
+    def snapshot(self) -> AccountSnapshot:
+        """Fetch the account summary, positions and open orders concurrently."""
+        return fetch_snapshot(self)
+
+    def map(
+        self, fn: Callable[[T], R], items: Iterable[T], max_workers: int | None = None
+    ) -> list[R]:
+        """Call ``fn(item)`` for every item on a thread pool and return results in order.
+
+        Calls share this client's limits, so ``max_workers`` (default: ``max_in_flight``,
+        else 8) only bounds the threads. The caller's context, e.g. :meth:`prioritized`,
+        carries over to each call. The first exception raised by ``fn`` propagates.
+        """
+        workers = max_workers or self._engine.gate.max_in_flight or _DEFAULT_MAP_WORKERS
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(workers, thread_name_prefix="t212-map") as pool:
+            return list(pool.map(lambda item: context.copy().run(fn, item), items))
 
     def close(self) -> None:
         self._engine.close()
@@ -60,17 +139,69 @@ class AsyncTrading212Client:
         api_key: str,
         api_secret: str,
         env: Environment = Environment.DEMO,
+        max_in_flight: int | None = None,
+        rate_limit_store: RateLimitStore | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        low_latency: bool = False,
+        adaptive_concurrency: AdaptiveConcurrency | None = None,
         **httpx_kwargs: Any,
     ) -> None:
-        self._engine = _AsyncHttpEngine(api_key, api_secret, env=env, **httpx_kwargs)
-        self.account = AsyncAccountResource(self._engine)
-        self.instruments = AsyncInstrumentsResource(self._engine)
-        self.orders = AsyncOrdersResource(self._engine)
-        self.positions = AsyncPositionsResource(self._engine)
-        self.history = AsyncHistoryResource(self._engine)
-        self.pies = AsyncPiesResource(self._engine)
+        self._engine: _AsyncEngine = _AsyncHttpEngine(
+            api_key,
+            api_secret,
+            env=env,
+            max_in_flight=max_in_flight,
+            rate_limit_store=rate_limit_store,
+            circuit_breaker=circuit_breaker,
+            low_latency=low_latency,
+            adaptive_concurrency=adaptive_concurrency,
+            **httpx_kwargs,
+        )
+        self._bind(self._engine)
+
+    def _bind(self, engine: _AsyncEngine) -> None:
+        self._engine = engine
+        self.account: AsyncAccountResource = AsyncAccountResource(engine)
+        self.instruments: AsyncInstrumentsResource = AsyncInstrumentsResource(engine)
+        self.orders: AsyncOrdersResource = AsyncOrdersResource(engine)
+        self.positions: AsyncPositionsResource = AsyncPositionsResource(engine)
+        self.history: AsyncHistoryResource = AsyncHistoryResource(engine)
+        self.pies: AsyncPiesResource = AsyncPiesResource(engine)
+        self.scheduler = PollScheduler(self)
+
+    @classmethod
+    async def via_gateway(cls, socket_path: str) -> AsyncTrading212Client:
+        """Connect to a local :class:`~t212.gateway.Gateway` instead of the API."""
+        from .gateway import AsyncGatewayEngine
+
+        engine = AsyncGatewayEngine(socket_path)
+        await engine.connect()
+        client = cls.__new__(cls)
+        client._bind(engine)
+        return client
+
+    def reserve(self, slots: int = 1) -> AbstractAsyncContextManager[None]:
+        """Hold ``slots`` request slots for critical requests, pausing bulk work meanwhile."""
+        return self._engine.gate.reserve(slots)
+
+    def prioritized(self, priority: Priority) -> AbstractContextManager[None]:
+        """Override the priority class of requests made inside this context."""
+        return prioritized(priority)
+
+    def metrics(self) -> ClientMetrics:
+        """Snapshot of the engine's internal state, e.g. per-endpoint circuit breakers."""
+        return self._engine.metrics()
+
+    async def snapshot(self) -> AccountSnapshot:
+        """Fetch the account summary, positions and open orders concurrently."""
+        return await afetch_snapshot(self)
+
+    async def warm(self) -> None:
+        """Open a connection ahead of time so the next order skips connection setup."""
+        await self._engine.warm()
 
     async def aclose(self) -> None:
+        await self.scheduler.aclose()
         await self._engine.aclose()
 
     async def __aenter__(self) -> AsyncTrading212Client:
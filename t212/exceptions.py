@@ -32,3 +32,16 @@ class TimeoutError(Trading212Error):
 
 class ServerError(Trading212Error):
     """Raised on HTTP 5xx — server-side error."""
+
+
+class CircuitOpenError(Trading212Error):
+    """Raised without sending a request while an endpoint's circuit breaker is open."""
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(f"Circuit open for {endpoint}; retry in {retry_after:.1f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class PreflightError(ValidationError):
+    """Raised without sending a request when an order fails local pre-flight checks."""
@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import socket
+import threading
+from collections.abc import AsyncIterator, Callable
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from pydantic import BaseModel
+
+from ._base import (
+    APIResponse,
+    _AsyncEngine,
+    _Engine,
+    _parse_rate_limit,
+    _raise_for_status,
+    _record_rate_limit,
+)
+from ._circuit import CircuitBreaker
+from ._metrics import _RequestCounters
+from ._priority import _AsyncPriorityGate, _PriorityGate
+from ._ratelimit import MemoryRateLimitStore, endpoint_key
+from .exceptions import ServerError, Trading212Error
+from .models.account import AccountSummary
+from .models.enums import Environment
+from .models.history import ReportResponse
+from .models.orders import Order
+from .models.positions import Position
+from .scheduler import Feed, Subscription
+
+if TYPE_CHECKING:
+    from .client import AsyncTrading212Client
+
+_FEED_PATHS: dict[Feed, str] = {
+    Feed.SUMMARY: "/api/v0/equity/account/summary",
+    Feed.POSITIONS: "/api/v0/equity/positions",
+    Feed.ORDERS: "/api/v0/equity/orders",
+    Feed.REPORTS: "/api/v0/equity/history/exports",
+}
+_FEEDS_BY_PATH = {path: feed for feed, path in _FEED_PATHS.items()}
+
+_FEED_DECODERS: dict[Feed, Callable[[Any], Any]] = {
+    Feed.SUMMARY: AccountSummary.model_validate,
+    Feed.POSITIONS: lambda items: [Position.model_validate(item) for item in items],
+    Feed.ORDERS: lambda items: [Order.model_validate(item) for item in items],
+    Feed.REPORTS: lambda items: [ReportResponse.model_validate(item) for item in items],
+}
+
+_GATEWAY_URL = "http://t212-gateway"
+
+_log = logging.getLogger(__name__)
+
+
+def _dump(data: Any) -> Any:
+    if isinstance(data, BaseModel):
+        return data.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if isinstance(data, list):
+        return [_dump(item) for item in data]
+    return data
+
+
+def _encode_response(response: APIResponse[Any]) -> dict[str, Any]:
+    headers = {
+        f"x-ratelimit-{name}": str(value)
+        for name, value in asdict(response.rate_limit).items()
+        if value is not None
+    }
+    body = json.dumps(_dump(response.data))
+    return {"status": response.status_code, "headers": headers, "body": body}
+
+
+def _encode_error(exc: Exception) -> dict[str, Any]:
+    status = exc.status_code if isinstance(exc, Trading212Error) and exc.status_code else 502
+    return {"status": status, "headers": {}, "body": str(exc)}
+
+
+def _encode_bad_request(reason: str) -> dict[str, Any]:
+    return {"status": 400, "headers": {}, "body": reason}
+
+
+def _invalid(message: Any) -> str | None:
+    """Why ``message`` is not a request or watch the gateway can serve, if it is not."""
+    if not isinstance(message, dict):
+        return "Expected a JSON object"
+    if "watch" in message:
+        if message["watch"] not in {feed.value for feed in Feed}:
+            return f"Unknown feed: {message['watch']!r}"
+        return None
+    if not isinstance(message.get("path"), str) or not message["path"].startswith("/"):
+        return "Missing or invalid request path"
+    if not isinstance(message.get("method", "GET"), str):
+        return "Invalid request method"
+    return None
+
+
+def _decode_reply(reply: dict[str, Any], method: str, path: str) -> httpx.Response:
+    return httpx.Response(
+        reply["status"],
+        headers=reply.get("headers") or {},
+        content=(reply.get("body") or "").encode(),
+        request=httpx.Request(method, _GATEWAY_URL + path),
+    )
+
+
+class _FeedCache:
+    """Latest encoded snapshot of one feed, plus the push subscribers watching it."""
+
+    def __init__(self, subscription: Subscription) -> None:
+        self.subscription = subscription
+        self.reply: dict[str, Any] | None = None
+        self.ready = asyncio.Event()
+        self.watchers: set[asyncio.Queue[dict[str, Any]]] = set()
+        self.task: asyncio.Task[None] | None = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                reply = _encode_response(await anext(self.subscription))
+            except StopAsyncIteration:
+                return
+            except Exception as exc:
+                feed = self.subscription.feed.value
+                if isinstance(exc, (Trading212Error, httpx.HTTPError)):
+                    _log.warning("Polling the %s feed failed: %s", feed, exc)
+                else:
+                    _log.exception("Polling the %s feed failed", feed)
+                # Requests waiting on a first snapshot get the error rather than hang.
+                if self.reply is None:
+                    self.reply = _encode_error(exc)
+                    self.ready.set()
+                continue
+            changed = self.reply is None or reply["body"] != self.reply["body"]
+            self.reply = reply
+            self.ready.set()
+            if changed:
+                for queue in self.watchers:
+                    queue.put_nowait(reply)
+
+
+class Gateway:
+    """Local daemon that polls one account and serves it to many processes.
+
+    Snapshots of the account summary, positions, open orders and reports are polled
+    once through the client's :class:`~t212.PollScheduler` (at most every ``max_age``
+    seconds) and served from memory to every local client over a Unix socket; clients
+    may also subscribe to push updates whenever a snapshot changes. Any other request
+    is forwarded to the API through the client's engine, so it shares the same
+    rate-limit state. Connect with ``Trading212Client.via_gateway(socket_path)``.
+
+    The wire protocol is newline-delimited JSON: requests carry ``id``, ``method``,
+    ``path``, ``params`` and ``json``; replies echo ``id`` with ``status``, ``headers``
+    and the response ``body``. ``{"id": ..., "watch": "<feed>"}`` starts a push stream of
+    ``{"feed": ..., ...}`` messages. Malformed messages get a 400 reply. The socket is
+    created readable and writable by its owner only.
+    """
+
+    def __init__(
+        self, client: AsyncTrading212Client, socket_path: str, max_age: float = 5.0
+    ) -> None:
+        self._client = client
+        self.socket_path = socket_path
+        self.max_age = max_age
+        self._feeds: dict[Feed, _FeedCache] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def aclose(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for cache in self._feeds.values():
+            cache.subscription.close()
+            if cache.task is not None:
+                cache.task.cancel()
+        await asyncio.gather(
+            *(c.task for c in self._feeds.values() if c.task is not None),
+            return_exceptions=True,
+        )
+        self._feeds.clear()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+    async def __aenter__(self) -> Gateway:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        await self.aclose()
+
+    def _feed(self, feed: Feed) -> _FeedCache:
+        cache = self._feeds.get(feed)
+        if cache is None:
+            cache = _FeedCache(self._client.scheduler.subscribe(feed, self.max_age))
+            cache.task = asyncio.get_running_loop().create_task(cache.run())
+            self._feeds[feed] = cache
+        return cache
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def send(message: dict[str, Any]) -> None:
+            async with write_lock:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    message = None
+                reason = _invalid(message)
+                if reason is not None:
+                    message_id = message.get("id") if isinstance(message, dict) else None
+                    await send({"id": message_id, **_encode_bad_request(reason)})
+                    continue
+                handler = self._watch if "watch" in message else self._handle
+                task = asyncio.create_task(handler(message, send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _handle(
+        self, message: dict[str, Any], send: Callable[[dict[str, Any]], Any]
+    ) -> None:
+        method = message.get("method", "GET")
+        path = message["path"]
+        feed = _FEEDS_BY_PATH.get(path) if method == "GET" else None
+        try:
+            if feed is not None:
+                cache = self._feed(feed)
+                await cache.ready.wait()
+                assert cache.reply is not None
+                reply = cache.reply
+            else:
+                reply = await self._forward(method, path, message)
+        except Exception as exc:
+            _log.exception("Serving %s %s failed", method, path)
+            reply = _encode_error(exc)
+        await send({"id": message.get("id"), **reply})
+
+    async def _forward(self, method: str, path: str, message: dict[str, Any]) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {}
+        if message.get("params") is not None:
+            kwargs["params"] = message["params"]
+        if message.get("json") is not None:
+            kwargs["json"] = message["json"]
+        try:
+            response = await self._client._engine._request(method, path, **kwargs)
+        except (Trading212Error, httpx.HTTPError) as exc:
+            return _encode_error(exc)
+        return {
+            "status": response.status_code,
+            "headers": {k: v for k, v in response.headers.items() if k.startswith("x-ratelimit")},
+            "body": response.text,
+        }
+
+    async def _watch(
+        self, message: dict[str, Any], send: Callable[[dict[str, Any]], Any]
+    ) -> None:
+        feed = Feed(message["watch"])
+        cache = self._feed(feed)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        cache.watchers.add(queue)
+        try:
+            if cache.reply is not None:
+                queue.put_nowait(cache.reply)
+            while True:
+                reply = await queue.get()
+                await send({"id": message.get("id"), "feed": feed.value, **reply})
+        finally:
+            cache.watchers.discard(queue)
+
+
+class GatewayEngine(_Engine):
+    """Drop-in replacement for the sync HTTP engine that talks to a local :class:`Gateway`."""
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(socket_path)
+        self._file = self._sock.makefile("rwb")
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.rate_limit_store = MemoryRateLimitStore()
+        self.gate = _PriorityGate()
+        self.circuit_breaker = CircuitBreaker()
+        self.counters = _RequestCounters()
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        message = {"id": next(self._ids), "method": method, "path": path, **kwargs}
+        with self._lock:
+            self._file.write(json.dumps(message).encode() + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        if not line:
+            raise ServerError("Gateway closed the connection", 502)
+        response = _decode_reply(json.loads(line), method, path)
+        _record_rate_limit(self.rate_limit_store, endpoint_key(method, path), response)
+        _raise_for_status(response)
+        return response
+
+    def post_raw(self, path: str, content: bytes) -> httpx.Response:
+        return self.post(path, json=json.loads(content))
+
+    def warm(self) -> None:
+        """No-op: the gateway holds the warm upstream connections."""
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+
+class AsyncGatewayEngine(_AsyncEngine):
+    """Drop-in replacement for the async HTTP engine that talks to a local :class:`Gateway`.
+
+    Call :meth:`connect` before use; ``AsyncTrading212Client.via_gateway`` does this.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        self.socket_path = socket_path
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._watchers: dict[int, asyncio.Queue[dict[str, Any] | None]] = {}
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task[None] | None = None
+        self.rate_limit_store = MemoryRateLimitStore()
+        self.gate = _AsyncPriorityGate()
+        self.circuit_breaker = CircuitBreaker()
+        self.counters = _RequestCounters()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+        self._read_task = asyncio.get_running_loop().create_task(self._read_loop())
+
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        message_id = next(self._ids)
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        await self._send({"id": message_id, "method": method, "path": path, **kwargs})
+        response = _decode_reply(await future, method, path)
+        _record_rate_limit(self.rate_limit_store, endpoint_key(method, path), response)
+        _raise_for_status(response)
+        return response
+
+    async def post_raw(self, path: str, content: bytes) -> httpx.Response:
+        return await self.post(path, json=json.loads(content))
+
+    async def warm(self) -> None:
+        """No-op: the gateway holds the warm upstream connections."""
+
+    async def watch(self, feed: Feed) -> AsyncIterator[APIResponse[Any]]:
+        """Yield a decoded snapshot of ``feed`` each time the gateway sees it change."""
+        message_id = next(self._ids)
+        queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self._watchers[message_id] = queue
+        try:
+            await self._send({"id": message_id, "watch": feed.value})
+            while (reply := await queue.get()) is not None:
+                response = _decode_reply(reply, "GET", _FEED_PATHS[feed])
+                _raise_for_status(response)
+                yield APIResponse(
+                    data=_FEED_DECODERS[feed](response.json()),
+                    rate_limit=_parse_rate_limit(response.headers),
+                    status_code=response.status_code,
+                )
+        finally:
+            self._watchers.pop(message_id, None)
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        if self._writer is None:
+            await self.connect()
+        assert self._writer is not None
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+
+    async def _read_loop(self) -> None:
+        assert self._reader is not None
+        try:
+            while line := await self._reader.readline():
+                reply = json.loads(line)
+                message_id = reply.get("id")
+                if message_id in self._watchers:
+                    self._watchers[message_id].put_nowait(reply)
+                else:
+                    future = self._pending.pop(message_id, None)
+                    if future is not None and not future.done():
+                        future.set_result(reply)
+        finally:
+            closed = ServerError("Gateway closed the connection", 502)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(closed)
+            self._pending.clear()
+            for queue in self._watchers.values():
+                queue.put_nowait(None)
+
+    async def aclose(self) -> None:
+        if self._read_task is not None:
+            self._read_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._read_task
+        if self._writer is not None:
+            self._writer.close()
+            with contextlib.suppress(ConnectionError):
+                await self._writer.wait_closed()
+        self._reader = self._writer = self._read_task = None
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a gateway: ``python -m t212.gateway --socket /run/t212.sock``.
+
+    Credentials are read from ``T212_API_KEY`` and ``T212_API_SECRET``.
+    """
+    from .client import AsyncTrading212Client
+
+    parser = argparse.ArgumentParser(description="Trading 212 local fan-out gateway")
+    parser.add_argument("--socket", required=True, help="Unix socket path to listen on")
+    parser.add_argument("--env", choices=[e.value for e in Environment], default="demo")
+    parser.add_argument("--max-age", type=float, default=5.0, help="snapshot freshness (s)")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        async with AsyncTrading212Client(
+            os.environ["T212_API_KEY"], os.environ["T212_API_SECRET"], env=Environment(args.env)
+        ) as client:
+            async with Gateway(client, args.socket, max_age=args.max_age) as gateway:
+                await gateway.serve_forever()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
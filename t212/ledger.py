@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import queue
+import threading
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import StrEnum
+from typing import Any
+
+from .models.enums import TransactionType
+from .models.history import HistoricalOrder, HistoryDividendItem, HistoryTransactionItem
+
+DEFAULT_BUFFER = 256
+
+_UNKNOWN = datetime.min.replace(tzinfo=UTC)
+_DONE = object()
+_OUTFLOWS = {TransactionType.WITHDRAW, TransactionType.FEE}
+_INFLOWS = {TransactionType.DEPOSIT}
+
+
+class LedgerKind(StrEnum):
+    ORDER = "ORDER"
+    DIVIDEND = "DIVIDEND"
+    TRANSACTION = "TRANSACTION"
+
+
+@dataclass(frozen=True)
+class LedgerEntry:
+    """One cash movement from order, dividend or transaction history.
+
+    ``amount`` is the signed effect on cash in ``currency`` (the account currency):
+    a fill's wallet impact net value, a dividend's amount received, or a transaction's
+    amount (negative for withdrawals and fees). ``item`` is the source record.
+    """
+
+    at: datetime | None
+    kind: LedgerKind
+    amount: float
+    currency: str | None
+    ticker: str | None
+    item: HistoricalOrder | HistoryDividendItem | HistoryTransactionItem
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def _key(entry: LedgerEntry) -> datetime:
+    return entry.at or _UNKNOWN
+
+
+def _order_entry(item: HistoricalOrder) -> LedgerEntry | None:
+    """The fill's cash movement; ``None`` for orders that never filled."""
+    fill = item.fill
+    if fill is None or fill.filled_at is None:
+        return None
+    impact = fill.wallet_impact
+    return LedgerEntry(
+        at=_utc(fill.filled_at),
+        kind=LedgerKind.ORDER,
+        amount=(impact.net_value or 0.0) if impact else 0.0,
+        currency=impact.currency if impact else None,
+        ticker=item.order.ticker if item.order else None,
+        item=item,
+    )
+
+
+def _dividend_entry(item: HistoryDividendItem) -> LedgerEntry:
+    return LedgerEntry(
+        at=_utc(item.paid_on),
+        kind=LedgerKind.DIVIDEND,
+        amount=item.amount or 0.0,
+        currency=item.currency,
+        ticker=item.ticker,
+        item=item,
+    )
+
+
+def _transaction_entry(item: HistoryTransactionItem) -> LedgerEntry:
+    amount = item.amount or 0.0
+    if item.type in _OUTFLOWS:
+        amount = -abs(amount)
+    elif item.type in _INFLOWS:
+        amount = abs(amount)
+    return LedgerEntry(
+        at=_utc(item.date_time),
+        kind=LedgerKind.TRANSACTION,
+        amount=amount,
+        currency=item.currency,
+        ticker=None,
+        item=item,
+    )
+
+
+def _orders(items: Iterable[HistoricalOrder]) -> Iterator[LedgerEntry]:
+    for item in items:
+        entry = _order_entry(item)
+        if entry is not None:
+            yield entry
+
+
+def _put(out: queue.Queue[Any], value: Any, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            out.put(value, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _pump(source: Iterable[LedgerEntry], out: queue.Queue[Any], stop: threading.Event) -> None:
+    try:
+        for entry in source:
+            if not _put(out, entry, stop):
+                return
+    except BaseException as exc:
+        _put(out, exc, stop)
+    _put(out, _DONE, stop)
+
+
+def _drain(out: queue.Queue[Any]) -> Iterator[LedgerEntry]:
+    while (value := out.get()) is not _DONE:
+        if isinstance(value, BaseException):
+            raise value
+        yield value
+
+
+def merge_ledger(
+    orders: Iterable[HistoricalOrder],
+    dividends: Iterable[HistoryDividendItem],
+    transactions: Iterable[HistoryTransactionItem],
+    buffer: int = DEFAULT_BUFFER,
+) -> Iterator[LedgerEntry]:
+    """Merge three history streams into one, newest first.
+
+    Each source is read on its own thread into a queue of at most ``buffer`` entries,
+    so pages for all three are fetched concurrently while memory stays bounded however
+    long the history is. Sources must already be newest first, as the history
+    endpoints return them. Closing the iterator early stops the readers.
+    """
+    sources = [
+        _orders(orders),
+        map(_dividend_entry, dividends),
+        map(_transaction_entry, transactions),
+    ]
+    stop = threading.Event()
+    queues: list[queue.Queue[Any]] = [queue.Queue(buffer) for _ in sources]
+    threads = [
+        threading.Thread(target=_pump, args=(s, q, stop), name="t212-ledger", daemon=True)
+        for s, q in zip(sources, queues, strict=True)
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        yield from heapq.merge(*(_drain(q) for q in queues), key=_key, reverse=True)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+async def _apump(source: AsyncIterator[LedgerEntry | None], out: asyncio.Queue[Any]) -> None:
+    try:
+        async for entry in source:
+            if entry is not None:
+                await out.put(entry)
+    except Exception as exc:
+        await out.put(exc)
+    await out.put(_DONE)
+
+
+async def _entries(items: AsyncIterable[Any], convert: Any) -> AsyncIterator[LedgerEntry | None]:
+    async for item in items:
+        yield convert(item)
+
+
+async def amerge_ledger(
+    orders: AsyncIterable[HistoricalOrder],
+    dividends: AsyncIterable[HistoryDividendItem],
+    transactions: AsyncIterable[HistoryTransactionItem],
+    buffer: int = DEFAULT_BUFFER,
+) -> AsyncIterator[LedgerEntry]:
+    """Async :func:`merge_ledger`: each source is read by its own task."""
+    sources = [
+        _entries(orders, _order_entry),
+        _entries(dividends, _dividend_entry),
+        _entries(transactions, _transaction_entry),
+    ]
+    queues: list[asyncio.Queue[Any]] = [asyncio.Queue(buffer) for _ in sources]
+    loop = asyncio.get_running_loop()
+    tasks = [loop.create_task(_apump(s, q)) for s, q in zip(sources, queues, strict=True)]
+
+    async def head(i: int) -> None:
+        value = await queues[i].get()
+        if isinstance(value, BaseException):
+            raise value
+        if value is not _DONE:
+            # Newest first: order by negated time; the index breaks ties.
+            heapq.heappush(heap, (-_key(value).timestamp(), i, value))
+
+    heap: list[tuple[float, int, LedgerEntry]] = []
+    try:
+        for i in range(len(queues)):
+            await head(i)
+        while heap:
+            _, i, entry = heapq.heappop(heap)
+            yield entry
+            await head(i)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -36,6 +36,7 @@ from .orders import (
     LimitOrderRequest,
     MarketOrderRequest,
     Order,
+    OrderRequest,
     StopLimitOrderRequest,
     StopOrderRequest,
     Tax,
@@ -86,6 +87,7 @@ __all__ = [
     "MarketOrderRequest",
     "Order",
     "OrderInitiatedFrom",
+    "OrderRequest",
     "OrderSide",
     "OrderStatus",
     "OrderStrategy",
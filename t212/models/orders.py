@@ -94,3 +94,6 @@ class StopLimitOrderRequest(_CamelModel):
     limit_price: float
     stop_price: float
     time_validity: TimeValidity = TimeValidity.DAY
+
+
+OrderRequest = MarketOrderRequest | LimitOrderRequest | StopOrderRequest | StopLimitOrderRequest
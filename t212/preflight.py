@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import bisect
+from datetime import UTC, datetime
+from enum import StrEnum
+
+from .exceptions import PreflightError
+from .models.enums import TimeEventType
+from .models.instruments import Exchange, TradableInstrument
+from .models.orders import MarketOrderRequest, OrderRequest
+from .store import OPEN_STATUSES, OrderStore
+
+# Trading 212 accepts at most this many pending orders per instrument.
+MAX_PENDING_PER_TICKER = 50
+
+
+class Session(StrEnum):
+    REGULAR = "REGULAR"
+    EXTENDED = "EXTENDED"
+    CLOSED = "CLOSED"
+
+
+_SESSION_AFTER: dict[TimeEventType, Session] = {
+    TimeEventType.OPEN: Session.REGULAR,
+    TimeEventType.BREAK_END: Session.REGULAR,
+    TimeEventType.PRE_MARKET_OPEN: Session.EXTENDED,
+    TimeEventType.AFTER_HOURS_OPEN: Session.EXTENDED,
+    TimeEventType.OVERNIGHT_OPEN: Session.EXTENDED,
+    TimeEventType.CLOSE: Session.CLOSED,
+    TimeEventType.BREAK_START: Session.CLOSED,
+    TimeEventType.AFTER_HOURS_CLOSE: Session.CLOSED,
+}
+
+
+class _Schedule:
+    def __init__(self, events: list[tuple[datetime, TimeEventType]]) -> None:
+        events.sort(key=lambda e: e[0])
+        self.times = [t for t, _ in events]
+        self.types = [kind for _, kind in events]
+
+    def session(self, at: datetime) -> Session | None:
+        i = bisect.bisect_right(self.times, at)
+        return _SESSION_AFTER.get(self.types[i - 1]) if i else None
+
+
+class InstrumentCatalog:
+    """Instrument metadata and exchange schedules, indexed for per-order checks."""
+
+    def __init__(self, instruments: list[TradableInstrument], exchanges: list[Exchange]) -> None:
+        self.instruments = {i.ticker: i for i in instruments if i.ticker is not None}
+        self._schedules: dict[int, _Schedule] = {}
+        self._exchanges: dict[int, Exchange] = {}
+        for exchange in exchanges:
+            for schedule in exchange.working_schedules or []:
+                if schedule.id is None:
+                    continue
+                self._exchanges[schedule.id] = exchange
+                events = [
+                    (e.date, e.type)
+                    for e in schedule.time_events or []
+                    if e.date is not None and e.type is not None
+                ]
+                self._schedules[schedule.id] = _Schedule(events)
+
+    def exchange(self, ticker: str) -> Exchange | None:
+        """The exchange whose working schedule the instrument follows."""
+        instrument = self.instruments.get(ticker)
+        if instrument is None or instrument.working_schedule_id is None:
+            return None
+        return self._exchanges.get(instrument.working_schedule_id)
+
+    def session(self, ticker: str, at: datetime) -> Session | None:
+        """The instrument's market session at ``at``, or None if its schedule is unknown."""
+        instrument = self.instruments.get(ticker)
+        if instrument is None or instrument.working_schedule_id is None:
+            return None
+        schedule = self._schedules.get(instrument.working_schedule_id)
+        return schedule.session(at) if schedule else None
+
+
+class Preflight:
+    """Local checks run before an order is sent, so doomed orders don't spend budget.
+
+    Raises :class:`~t212.PreflightError` if the ticker is not in ``catalog``, the
+    quantity exceeds the instrument's ``max_open_quantity``, extended hours are requested
+    for an instrument without them, a market order is sent outside its session, or the
+    ticker already has 50 pending orders in ``store``. Checks whose metadata is missing
+    are skipped.
+    """
+
+    def __init__(self, catalog: InstrumentCatalog, store: OrderStore | None = None) -> None:
+        self.catalog = catalog
+        self.store = store
+
+    def check(self, request: OrderRequest, now: datetime | None = None) -> None:
+        instrument = self.catalog.instruments.get(request.ticker)
+        if instrument is None:
+            raise PreflightError(f"Unknown ticker {request.ticker!r}")
+        limit = instrument.max_open_quantity
+        if limit is not None and abs(request.quantity) > limit:
+            raise PreflightError(
+                f"Quantity {abs(request.quantity)} exceeds max open quantity {limit} "
+                f"for {request.ticker}"
+            )
+        if isinstance(request, MarketOrderRequest):
+            if request.extended_hours and instrument.extended_hours is False:
+                raise PreflightError(f"{request.ticker} does not trade in extended hours")
+            self._check_session(request, now or datetime.now(UTC))
+        if self.store is not None:
+            pending = sum(
+                1
+                for o in self.store.open_orders()
+                if o.ticker == request.ticker and o.status in OPEN_STATUSES
+            )
+            if pending >= MAX_PENDING_PER_TICKER:
+                raise PreflightError(
+                    f"{request.ticker} already has {MAX_PENDING_PER_TICKER} pending orders"
+                )
+
+    def _check_session(self, request: MarketOrderRequest, now: datetime) -> None:
+        session = self.catalog.session(request.ticker, now)
+        if session is Session.CLOSED:
+            raise PreflightError(f"Market for {request.ticker} is closed")
+        if session is Session.EXTENDED and not request.extended_hours:
+            raise PreflightError(
+                f"Market for {request.ticker} is in extended hours; set extended_hours=True"
+            )
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from ._base import APIResponse
+from ._ratelimit import endpoint_key, endpoint_limit
+from .exceptions import CircuitOpenError, RateLimitError, Trading212Error
+
+if TYPE_CHECKING:
+    from .client import AsyncTrading212Client
+
+
+class Feed(StrEnum):
+    SUMMARY = "summary"
+    POSITIONS = "positions"
+    ORDERS = "orders"
+    REPORTS = "reports"
+
+
+@dataclass(frozen=True)
+class _FeedSpec:
+    key: str
+    fetch: Callable[[AsyncTrading212Client], Awaitable[APIResponse[Any]]]
+
+
+_FEEDS: dict[Feed, _FeedSpec] = {
+    Feed.SUMMARY: _FeedSpec(
+        endpoint_key("GET", "/api/v0/equity/account/summary"),
+        lambda client: client.account.get_summary(),
+    ),
+    Feed.POSITIONS: _FeedSpec(
+        endpoint_key("GET", "/api/v0/equity/positions"),
+        lambda client: client.positions.get(),
+    ),
+    Feed.ORDERS: _FeedSpec(
+        endpoint_key("GET", "/api/v0/equity/orders"),
+        lambda client: client.orders.list(),
+    ),
+    Feed.REPORTS: _FeedSpec(
+        endpoint_key("GET", "/api/v0/equity/history/exports"),
+        lambda client: client.history.get_reports(),
+    ),
+}
+
+
+class Subscription:
+    """Stream of responses for one feed, delivered at least every ``max_age`` seconds.
+
+    Iterating yields each new shared fetch; a subscriber that falls behind only sees the
+    latest one. Errors from a fetch are raised once from the iterator and polling
+    continues, so a consumer may catch them and keep iterating.
+    """
+
+    def __init__(self, scheduler: PollScheduler, feed: Feed, max_age: float) -> None:
+        self.feed = feed
+        self.max_age = max_age
+        self._scheduler = scheduler
+        self._queue: asyncio.Queue[APIResponse[Any] | Exception] = asyncio.Queue(maxsize=1)
+        self._closed = False
+
+    @property
+    def latest(self) -> APIResponse[Any] | None:
+        return self._scheduler._latest(self.feed)
+
+    def _deliver(self, item: APIResponse[Any] | Exception) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._scheduler._unsubscribe(self)
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> APIResponse[Any]:
+        if self._closed:
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def __aenter__(self) -> Subscription:
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        self.close()
+
+
+@dataclass
+class _FeedState:
+    subscribers: list[Subscription] = field(default_factory=list)
+    latest: APIResponse[Any] | None = None
+    fetched_at: float | None = None
+    blocked_until: float = 0.0
+    task: asyncio.Task[None] | None = None
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class PollScheduler:
+    """Multiplex polling consumers onto the account's per-endpoint rate limits.
+
+    Each feed is fetched by a single task shared by all of its subscribers, as often as
+    the most demanding subscriber's ``max_age`` asks for but never faster than the
+    endpoint's published limit. When ``x-ratelimit-remaining`` falls below
+    ``low_budget_ratio`` of the limit the poll interval is stretched by ``backoff``,
+    and after a 429 or an exhausted budget polling waits for the window to reset.
+
+    Usage::
+
+        async with client.scheduler.subscribe(Feed.POSITIONS, max_age=2.0) as positions:
+            async for response in positions:
+                handle(response.data)
+    """
+
+    def __init__(
+        self,
+        client: AsyncTrading212Client,
+        low_budget_ratio: float = 0.2,
+        backoff: float = 2.0,
+    ) -> None:
+        self._client = client
+        self._low_budget_ratio = low_budget_ratio
+        self._backoff = backoff
+        self._feeds: dict[Feed, _FeedState] = {}
+
+    def subscribe(self, feed: Feed, max_age: float) -> Subscription:
+        subscription = Subscription(self, feed, max_age)
+        state = self._feeds.setdefault(feed, _FeedState())
+        state.subscribers.append(subscription)
+        fresh = state.fetched_at is not None and time.monotonic() - state.fetched_at <= max_age
+        if fresh and state.latest is not None:
+            subscription._deliver(state.latest)
+        if state.task is None or state.task.done():
+            state.task = asyncio.get_running_loop().create_task(self._run(feed, state))
+        else:
+            state.wakeup.set()
+        return subscription
+
+    def next_interval(self, feed: Feed) -> float:
+        """Seconds between polls of ``feed`` given its subscribers and remaining budget."""
+        state = self._feeds.get(feed)
+        spec = _FEEDS[feed]
+        limit = endpoint_limit(spec.key)
+        floor = limit.interval if limit else 0.0
+        if state is None or not state.subscribers:
+            return floor
+        interval = min(sub.max_age for sub in state.subscribers)
+        info = self._client._engine.rate_limit_store.get(spec.key)
+        if info is not None and info.remaining is not None:
+            if info.remaining <= 0 and info.reset is not None:
+                floor = max(floor, info.reset - time.time())
+            elif info.limit and info.remaining / info.limit < self._low_budget_ratio:
+                interval *= self._backoff
+        return max(interval, floor)
+
+    async def aclose(self) -> None:
+        tasks = [state.task for state in self._feeds.values() if state.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._feeds.clear()
+
+    def _latest(self, feed: Feed) -> APIResponse[Any] | None:
+        state = self._feeds.get(feed)
+        return state.latest if state else None
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        state = self._feeds.get(subscription.feed)
+        if state is None or subscription not in state.subscribers:
+            return
+        state.subscribers.remove(subscription)
+        state.wakeup.set()
+
+    async def _run(self, feed: Feed, state: _FeedState) -> None:
+        spec = _FEEDS[feed]
+        while state.subscribers:
+            delay = self._delay(feed, state)
+            if delay > 0:
+                state.wakeup.clear()
+                try:
+                    await asyncio.wait_for(state.wakeup.wait(), delay)
+                except TimeoutError:
+                    pass
+                continue
+            item: APIResponse[Any] | Exception
+            try:
+                item = await spec.fetch(self._client)
+                state.latest = item
+            except RateLimitError as exc:
+                item = exc
+                limit = endpoint_limit(spec.key)
+                state.blocked_until = time.monotonic() + (limit.period if limit else 0.0)
+            except CircuitOpenError as exc:
+                item = exc
+                state.blocked_until = time.monotonic() + exc.retry_after
+            except (Trading212Error, httpx.HTTPError) as exc:
+                item = exc
+            state.fetched_at = time.monotonic()
+            for subscription in list(state.subscribers):
+                subscription._deliver(item)
+
+    def _delay(self, feed: Feed, state: _FeedState) -> float:
+        now = time.monotonic()
+        if state.fetched_at is None:
+            return state.blocked_until - now
+        return max(state.fetched_at + self.next_interval(feed), state.blocked_until) - now
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+
+from ._ratelimit import endpoint_key, endpoint_limit
+from .models.enums import (
+    FillTradingMethod,
+    FillType,
+    OrderInitiatedFrom,
+    OrderSide,
+    OrderStatus,
+    OrderStrategy,
+    OrderType,
+    TimeValidity,
+)
+from .models.history import HistoricalOrder
+from .models.orders import Fill, Order
+from .store import TERMINAL_STATUSES
+
+_ORDERS_PATH = "/api/v0/equity/orders"
+_HISTORY_PATH = "/api/v0/equity/history/orders"
+
+_ORDER_TYPES = {
+    "market": OrderType.MARKET,
+    "limit": OrderType.LIMIT,
+    "stop": OrderType.STOP,
+    "stop_limit": OrderType.STOP_LIMIT,
+}
+
+
+def _dump(model: Order | HistoricalOrder) -> dict[str, Any]:
+    return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+
+def _order_id(item: HistoricalOrder) -> int:
+    return item.order.id if item.order is not None and item.order.id is not None else 0
+
+
+class SimulatedExchange(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """In-memory stand-in for the orders API, for testing trading logic without an account.
+
+    Pass it as the client's ``transport``. Orders rest until :meth:`set_price` moves the
+    ticker's price through them: market orders fill at the current price, limit orders
+    once the price reaches the limit, stop orders once it reaches the stop. :meth:`fill`
+    fills an order (or part of it) directly. As on the real API, ``GET /orders/{id}``
+    only serves pending orders; filled and cancelled ones are served from the order
+    history endpoint, newest first.
+
+    Cancelled orders sit in ``CANCELLING`` for ``cancel_delay`` seconds, during which
+    they can still fill. Every request is delayed by ``latency`` plus up to ``jitter``
+    seconds. With
+    ``rate_limits`` the published per-endpoint limits are enforced in fixed windows and
+    reported in ``x-ratelimit-*`` headers, answering 429 once a window is spent.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limits: bool = False,
+        cancel_delay: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.cancel_delay = cancel_delay
+        self.rate_limits = rate_limits
+        self.prices: dict[str, float] = {}
+        self.orders: dict[int, Order] = {}
+        self.requests: list[str] = []
+        self._history: list[HistoricalOrder] = []
+        self._triggered: set[int] = set()
+        self._cancel_at: dict[int, float] = {}
+        self._windows: dict[str, tuple[float, int]] = {}
+        self._next_id = 1
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def set_price(self, ticker: str, price: float) -> None:
+        """Move ``ticker`` to ``price`` and fill every resting order it crosses."""
+        with self._lock:
+            self.prices[ticker] = price
+            for order in list(self.orders.values()):
+                if order.ticker == ticker and order.status not in TERMINAL_STATUSES:
+                    self._match(order)
+
+    def fill(
+        self, order_id: int, quantity: float | None = None, price: float | None = None
+    ) -> Order:
+        """Fill ``quantity`` (default: the remainder) of an order at ``price``."""
+        with self._lock:
+            order = self.orders[order_id]
+            assert order.ticker is not None and order.quantity is not None
+            remaining = abs(order.quantity) - (order.filled_quantity or 0.0)
+            if order.status in TERMINAL_STATUSES or remaining <= 0:
+                raise ValueError(f"Order {order_id} is {order.status}")
+            price = price if price is not None else self.prices[order.ticker]
+            self._fill(order, remaining if quantity is None else min(quantity, remaining), price)
+            return self.orders[order_id]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        return self._respond(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(request)
+
+    def _delay(self) -> float:
+        return self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        key = endpoint_key(request.method, request.url.path)
+        with self._lock:
+            self.requests.append(key)
+            self._settle_cancels()
+            allowed, headers = self._consume(key)
+            if not allowed:
+                return httpx.Response(429, headers=headers, text="Too many requests")
+            status, body = self._route(request)
+        if body is None:
+            return httpx.Response(status, headers=headers)
+        return httpx.Response(status, headers=headers, json=body)
+
+    def _consume(self, key: str) -> tuple[bool, dict[str, str]]:
+        limit = endpoint_limit(key)
+        if not self.rate_limits or limit is None:
+            return True, {}
+        now = time.time()
+        start, used = self._windows.get(key, (now, 0))
+        if now >= start + limit.period:
+            start, used = now, 0
+        allowed = used < limit.requests
+        used += allowed
+        self._windows[key] = (start, used)
+        return allowed, {
+            "x-ratelimit-limit": str(limit.requests),
+            "x-ratelimit-period": str(int(limit.period)),
+            "x-ratelimit-remaining": str(limit.requests - used),
+            "x-ratelimit-reset": str(int(start + limit.period + 1)),
+            "x-ratelimit-used": str(used),
+        }
+
+    def _route(self, request: httpx.Request) -> tuple[int, Any]:
+        path = request.url.path
+        method = request.method
+        if method == "POST" and path.startswith(f"{_ORDERS_PATH}/"):
+            kind = path.rsplit("/", 1)[1]
+            if kind in _ORDER_TYPES:
+                return 200, _dump(self._place(_ORDER_TYPES[kind], json.loads(request.content)))
+        if path == _ORDERS_PATH and method == "GET":
+            working = [o for o in self.orders.values() if o.status not in TERMINAL_STATUSES]
+            return 200, [_dump(o) for o in working]
+        if path.startswith(f"{_ORDERS_PATH}/") and method in ("GET", "DELETE"):
+            try:
+                order_id = int(path.rsplit("/", 1)[1])
+            except ValueError:
+                return 404, {"code": "NotFound"}
+            order = self.orders.get(order_id)
+            if order is None:
+                return 404, {"code": "NotFound"}
+            if method == "GET":
+                # Like the real endpoint, only pending orders can be fetched by id.
+                if order.status in TERMINAL_STATUSES:
+                    return 404, {"code": "NotFound"}
+                return 200, _dump(order)
+            if order.status in TERMINAL_STATUSES:
+                return 400, {"code": "OrderNotCancellable"}
+            if order.status == OrderStatus.CANCELLING:
+                return 400, {"code": "OrderNotCancellable"}
+            if self.cancel_delay:
+                self._update(order, status=OrderStatus.CANCELLING)
+                self._cancel_at[order_id] = time.monotonic() + self.cancel_delay
+            else:
+                self._cancel(order)
+            return 200, None
+        if path == _HISTORY_PATH and method == "GET":
+            return 200, self._history_page(request.url.params)
+        return 404, {"code": "NotFound"}
+
+    def _cancel(self, order: Order) -> None:
+        cancelled = self._update(order, status=OrderStatus.CANCELLED)
+        self._history.append(HistoricalOrder(order=cancelled))
+
+    def _settle_cancels(self) -> None:
+        now = time.monotonic()
+        for order_id, due in list(self._cancel_at.items()):
+            order = self.orders[order_id]
+            if order.status in TERMINAL_STATUSES:
+                del self._cancel_at[order_id]
+            elif due <= now:
+                del self._cancel_at[order_id]
+                self._cancel(order)
+
+    def _place(self, order_type: OrderType, body: dict[str, Any]) -> Order:
+        quantity = float(body["quantity"])
+        order_id = self._next_id
+        self._next_id += 1
+        order = Order(
+            id=order_id,
+            created_at=datetime.now(UTC),
+            ticker=body["ticker"],
+            quantity=quantity,
+            filled_quantity=0.0,
+            side=OrderSide.BUY if quantity > 0 else OrderSide.SELL,
+            type=order_type,
+            status=OrderStatus.NEW,
+            strategy=OrderStrategy.QUANTITY,
+            initiated_from=OrderInitiatedFrom.API,
+            limit_price=body.get("limitPrice"),
+            stop_price=body.get("stopPrice"),
+            time_in_force=TimeValidity(body.get("timeValidity", TimeValidity.DAY)),
+            extended_hours=body.get("extendedHours", False),
+        )
+        self.orders[order_id] = order
+        self._match(order)
+        return order  # as placed; fills show up on the next read
+
+    def _match(self, order: Order) -> None:
+        assert order.ticker is not None and order.quantity is not None
+        if order.status in TERMINAL_STATUSES:
+            return
+        price = self.prices.get(order.ticker)
+        if price is None:
+            return
+        assert order.id is not None
+        buy = order.quantity > 0
+        if order.stop_price is not None and order.id not in self._triggered:
+            if (price < order.stop_price) if buy else (price > order.stop_price):
+                return
+            self._triggered.add(order.id)
+        if order.limit_price is not None:
+            if (price > order.limit_price) if buy else (price < order.limit_price):
+                return
+        remaining = abs(order.quantity) - (order.filled_quantity or 0.0)
+        self._fill(order, remaining, price)
+
+    def _fill(self, order: Order, quantity: float, price: float) -> None:
+        assert order.id is not None and order.quantity is not None
+        filled = (order.filled_quantity or 0.0) + quantity
+        done = filled >= abs(order.quantity)
+        status = OrderStatus.FILLED if done else OrderStatus.PARTIALLY_FILLED
+        signed = quantity if order.quantity > 0 else -quantity
+        # filledValue only applies to value orders; quantity orders report fill prices
+        # in history alone.
+        updated = self._update(order, status=status, filled_quantity=filled)
+        fill = Fill(
+            id=len(self._history) + 1,
+            filled_at=datetime.now(UTC),
+            price=price,
+            quantity=signed,
+            trading_method=FillTradingMethod.TOTV,
+            type=FillType.TRADE,
+        )
+        self._history.append(HistoricalOrder(order=updated, fill=fill))
+
+    def _update(self, order: Order, **fields: Any) -> Order:
+        assert order.id is not None
+        updated = order.model_copy(update=fields)
+        self.orders[order.id] = updated
+        return updated
+
+    def _history_page(self, params: httpx.QueryParams) -> dict[str, Any]:
+        limit = int(params.get("limit", 20))
+        cursor = params.get("cursor")
+        # Newest order first, and each order's latest event first.
+        items = sorted(self._history[::-1], key=_order_id, reverse=True)
+        if cursor is not None:
+            items = items[int(cursor) :]
+        page = items[:limit]
+        offset = (int(cursor) if cursor is not None else 0) + len(page)
+        more = offset < len(self._history)
+        return {
+            "items": [_dump(item) for item in page],
+            "nextPagePath": f"{_HISTORY_PATH}?limit={limit}&cursor={offset}" if more else None,
+        }
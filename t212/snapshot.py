@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from ._base import APIResponse
+from .models.account import AccountSummary
+from .models.orders import Order
+from .models.positions import Position
+
+if TYPE_CHECKING:
+    from .client import AsyncTrading212Client, Trading212Client
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TickerView:
+    """An instrument's position (if any) together with its open orders."""
+
+    ticker: str
+    position: Position | None
+    orders: list[Order]
+
+
+@dataclass(frozen=True)
+class AccountSnapshot:
+    """Summary, positions and open orders fetched together.
+
+    ``requested_at`` is when the three requests were sent and ``*_at`` when each
+    response arrived; :attr:`skew` is the spread between the responses, an upper bound
+    on how far apart the three views may be.
+    """
+
+    summary: AccountSummary
+    positions: list[Position]
+    orders: list[Order]
+    requested_at: datetime
+    summary_at: datetime
+    positions_at: datetime
+    orders_at: datetime
+
+    @property
+    def skew(self) -> timedelta:
+        received = (self.summary_at, self.positions_at, self.orders_at)
+        return max(received) - min(received)
+
+    @property
+    def by_ticker(self) -> dict[str, TickerView]:
+        """Positions joined to open orders by ticker, including orders with no position."""
+        positions = {
+            p.instrument.ticker: p
+            for p in self.positions
+            if p.instrument is not None and p.instrument.ticker is not None
+        }
+        orders: dict[str, list[Order]] = {}
+        for order in self.orders:
+            if order.ticker is not None:
+                orders.setdefault(order.ticker, []).append(order)
+        return {
+            ticker: TickerView(ticker, positions.get(ticker), orders.get(ticker, []))
+            for ticker in positions.keys() | orders.keys()
+        }
+
+
+def _stamped(fetch: Callable[[], APIResponse[T]]) -> tuple[T, datetime]:
+    data = fetch().data
+    return data, datetime.now(UTC)
+
+
+async def _astamped(fetch: Awaitable[APIResponse[T]]) -> tuple[T, datetime]:
+    data = (await fetch).data
+    return data, datetime.now(UTC)
+
+
+def fetch_snapshot(client: Trading212Client) -> AccountSnapshot:
+    requested_at = datetime.now(UTC)
+    fetches: list[Callable[[], APIResponse[Any]]] = [
+        client.account.get_summary,
+        client.positions.get,
+        client.orders.list,
+    ]
+    with ThreadPoolExecutor(len(fetches), thread_name_prefix="t212-snapshot") as pool:
+        (summary, summary_at), (positions, positions_at), (orders, orders_at) = pool.map(
+            _stamped, fetches
+        )
+    return AccountSnapshot(
+        summary, positions, orders, requested_at, summary_at, positions_at, orders_at
+    )
+
+
+async def afetch_snapshot(client: AsyncTrading212Client) -> AccountSnapshot:
+    requested_at = datetime.now(UTC)
+    (summary, summary_at), (positions, positions_at), (orders, orders_at) = (
+        await asyncio.gather(
+            _astamped(client.account.get_summary()),
+            _astamped(client.positions.get()),
+            _astamped(client.orders.list()),
+        )
+    )
+    return AccountSnapshot(
+        summary, positions, orders, requested_at, summary_at, positions_at, orders_at
+    )
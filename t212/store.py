@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from .models.enums import OrderStatus
+from .models.orders import Order
+
+_S = OrderStatus
+
+# Orders in these statuses can no longer change; every other status is still working.
+TERMINAL_STATUSES = frozenset({_S.FILLED, _S.CANCELLED, _S.REJECTED, _S.REPLACED})
+OPEN_STATUSES = frozenset(OrderStatus) - TERMINAL_STATUSES
+_ANY_PROGRESS = frozenset(
+    {_S.PARTIALLY_FILLED, _S.CANCELLING, _S.REPLACING, _S.FILLED, _S.CANCELLED, _S.REPLACED}
+)
+
+# Statuses an order may move to from each status. Snapshots that would move an order
+# anywhere else (e.g. NEW after CANCELLED) are older than what the store holds.
+_TRANSITIONS: dict[OrderStatus, frozenset[OrderStatus]] = {
+    _S.LOCAL: frozenset({_S.UNCONFIRMED, _S.CONFIRMED, _S.NEW, _S.REJECTED}) | _ANY_PROGRESS,
+    _S.UNCONFIRMED: frozenset({_S.CONFIRMED, _S.NEW, _S.REJECTED}) | _ANY_PROGRESS,
+    _S.CONFIRMED: frozenset({_S.NEW, _S.REJECTED}) | _ANY_PROGRESS,
+    _S.NEW: frozenset({_S.REJECTED}) | _ANY_PROGRESS,
+    _S.PARTIALLY_FILLED: _ANY_PROGRESS,
+    _S.CANCELLING: frozenset({_S.PARTIALLY_FILLED, _S.FILLED, _S.CANCELLED}),
+    _S.REPLACING: frozenset({_S.PARTIALLY_FILLED, _S.FILLED, _S.CANCELLED, _S.REPLACED}),
+}
+
+
+def valid_transition(current: OrderStatus | None, new: OrderStatus | None) -> bool:
+    """Whether an order in ``current`` status may next be seen in ``new`` status."""
+    if current is None or new is None or current == new:
+        return True
+    return new in _TRANSITIONS.get(current, frozenset())
+
+
+@dataclass(frozen=True)
+class _Entry:
+    order: Order
+    updated_at: float
+
+
+class OrderStore:
+    """Local, write-through view of this client's orders.
+
+    The orders resource writes every order it sees into the store: ``place_*`` and
+    ``submit`` results, ``list``/``get``/``get_many`` responses, and ``CANCELLING`` after
+    a successful ``cancel``. ``list`` is authoritative for pending orders, so open
+    orders it no longer returns are forgotten. Updates that would move an order along
+    an invalid status transition are stale and dropped. At most ``max_closed`` orders
+    in a terminal status are kept, oldest evicted first.
+    """
+
+    def __init__(self, max_closed: int = 1000) -> None:
+        self.max_closed = max_closed
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._closed = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, order_id: object) -> bool:
+        return order_id in self._entries
+
+    def apply(self, order: Order) -> bool:
+        """Write ``order`` through to the store; returns False if it was stale."""
+        if order.id is None:
+            return False
+        with self._lock:
+            entry = self._entries.get(order.id)
+            current = entry.order.status if entry else None
+            if not valid_transition(current, order.status):
+                return False
+            if entry is not None and order.status == current and current in TERMINAL_STATUSES:
+                return True  # nothing can change once terminal
+            self._closed += (order.status in TERMINAL_STATUSES) - (current in TERMINAL_STATUSES)
+            self._entries[order.id] = _Entry(order, time.monotonic())
+            self._entries.move_to_end(order.id)
+            self._evict()
+            return True
+
+    def apply_many(self, orders: Iterable[Order]) -> None:
+        for order in orders:
+            self.apply(order)
+
+    def reconcile(self, orders: Iterable[Order], since: float) -> None:
+        """Apply ``orders``, every pending order as of ``since`` (a ``time.monotonic()``).
+
+        Open orders missing from the list have since been filled, cancelled or rejected,
+        so they are forgotten, unless the store was updated after ``since``: ``place_*``
+        results can arrive while the list request is in flight.
+        """
+        orders = list(orders)
+        self.apply_many(orders)
+        listed = {order.id for order in orders}
+        with self._lock:
+            for order_id, entry in list(self._entries.items()):
+                if (
+                    order_id not in listed
+                    and entry.order.status not in TERMINAL_STATUSES
+                    and entry.updated_at < since
+                ):
+                    del self._entries[order_id]
+
+    def mark(self, order_id: int, status: OrderStatus) -> bool:
+        """Move a known order to ``status`` without a fresh snapshot, e.g. after cancel."""
+        entry = self._entries.get(order_id)
+        if entry is None:
+            return False
+        return self.apply(entry.order.model_copy(update={"status": status}))
+
+    def get(self, order_id: int, max_age: float | None = None) -> Order | None:
+        """The stored order, if present and (unless terminal) updated within ``max_age``."""
+        entry = self._entries.get(order_id)
+        if entry is None:
+            return None
+        if max_age is None or entry.order.status in TERMINAL_STATUSES:
+            return entry.order
+        return entry.order if time.monotonic() - entry.updated_at <= max_age else None
+
+    def open_orders(self) -> list[Order]:
+        with self._lock:
+            return [
+                e.order for e in self._entries.values() if e.order.status not in TERMINAL_STATUSES
+            ]
+
+    def _evict(self) -> None:
+        if self._closed <= self.max_closed:
+            return
+        for order_id, entry in list(self._entries.items()):
+            if entry.order.status in TERMINAL_STATUSES:
+                del self._entries[order_id]
+                self._closed -= 1
+                if self._closed <= self.max_closed:
+                    return
@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from enum import StrEnum
+
+from .api.orders import AsyncOrdersResource, OrdersResource
+from .api.positions import AsyncPositionsResource, PositionsResource
+from .models.enums import OrderStatus
+from .models.orders import Order
+from .models.positions import Position, PositionWalletImpact
+from .store import TERMINAL_STATUSES
+
+# Published endpoint limits: GET /orders is 1 req / 5s, GET /history/orders is
+# 6 req / 60s, GET /positions is 1 req / 1s.
+_LIST_INTERVAL = 5.0
+_HISTORY_INTERVAL = 10.0
+_POSITIONS_INTERVAL = 1.0
+
+
+class OrderEventType(StrEnum):
+    NEW = "NEW"
+    UPDATED = "UPDATED"
+    PARTIALLY_FILLED = "PARTIALLY_FILLED"
+    FILLED = "FILLED"
+    CANCELLED = "CANCELLED"
+    REJECTED = "REJECTED"
+    REPLACED = "REPLACED"
+    CLOSED = "CLOSED"
+
+
+@dataclass(frozen=True)
+class OrderEvent:
+    """A change observed on a tracked order.
+
+    ``CLOSED`` is emitted when an order disappears from the open-order list and is not
+    found in order history, so its final state is unknown; ``order`` is then the last
+    snapshot seen.
+    """
+
+    type: OrderEventType
+    order: Order
+    previous: Order | None = None
+
+
+_TERMINAL_EVENTS = {
+    OrderStatus.FILLED: OrderEventType.FILLED,
+    OrderStatus.CANCELLED: OrderEventType.CANCELLED,
+    OrderStatus.REJECTED: OrderEventType.REJECTED,
+    OrderStatus.REPLACED: OrderEventType.REPLACED,
+}
+
+
+def _classify(previous: Order | None, current: Order) -> OrderEventType | None:
+    if current.status in _TERMINAL_EVENTS:
+        return _TERMINAL_EVENTS[current.status]
+    if previous is None:
+        return OrderEventType.NEW
+    if (current.filled_quantity or 0.0) > (previous.filled_quantity or 0.0):
+        return OrderEventType.PARTIALLY_FILLED
+    if current.status != previous.status:
+        return OrderEventType.UPDATED
+    return None
+
+
+class _OrderBook:
+    """Local view of open orders, diffed against successive list() snapshots."""
+
+    def __init__(self) -> None:
+        self.orders: dict[int, Order] = {}
+        self.vanished: deque[int] = deque()
+
+    def track(self, order: Order) -> None:
+        if order.id is not None and order.status not in TERMINAL_STATUSES:
+            self.orders[order.id] = order
+
+    def apply_snapshot(self, snapshot: Iterable[Order]) -> list[OrderEvent]:
+        events: list[OrderEvent] = []
+        seen: set[int] = set()
+        for order in snapshot:
+            if order.id is None:
+                continue
+            seen.add(order.id)
+            events.extend(self.apply(order))
+        pending = set(self.vanished)
+        for order_id in self.orders.keys() - seen - pending:
+            self.vanished.append(order_id)
+        return events
+
+    def apply(self, order: Order) -> list[OrderEvent]:
+        assert order.id is not None
+        previous = self.orders.get(order.id)
+        event_type = _classify(previous, order)
+        if order.status in TERMINAL_STATUSES:
+            self.orders.pop(order.id, None)
+        else:
+            self.orders[order.id] = order
+        if event_type is None:
+            return []
+        return [OrderEvent(type=event_type, order=order, previous=previous)]
+
+    def take_vanished(self) -> list[int]:
+        vanished = [order_id for order_id in self.vanished if order_id in self.orders]
+        self.vanished.clear()
+        return vanished
+
+    def resolve(self, order_id: int, order: Order | None) -> list[OrderEvent]:
+        if order is not None:
+            return self.apply(order)
+        previous = self.orders.pop(order_id, None)
+        if previous is None:
+            return []
+        return [OrderEvent(type=OrderEventType.CLOSED, order=previous, previous=previous)]
+
+
+class OrderTracker:
+    """Track every open order with one ``orders.list()`` call per poll.
+
+    Orders that drop out of the list are no longer pending, so they are resolved from
+    order history to tell fills from cancellations: one ``find_in_history`` search for
+    all of them, paced to that endpoint's limit.
+
+    Usage::
+
+        tracker = OrderTracker(client.orders)
+        for event in tracker.iter_events():
+            print(event.type, event.order.id)
+    """
+
+    def __init__(self, orders: OrdersResource) -> None:
+        self._resource = orders
+        self._book = _OrderBook()
+
+    @property
+    def orders(self) -> dict[int, Order]:
+        return dict(self._book.orders)
+
+    def track(self, order: Order) -> None:
+        """Seed the tracker with an order, e.g. the result of ``place_limit``."""
+        self._book.track(order)
+
+    def poll(self, lookup: bool = True) -> list[OrderEvent]:
+        """Diff one ``list()`` snapshot; with ``lookup``, resolve vanished orders from history."""
+        events = self._book.apply_snapshot(self._resource.list().data)
+        if lookup:
+            events.extend(self._lookup_vanished())
+        return events
+
+    def iter_events(self, interval: float = _LIST_INTERVAL) -> Iterator[OrderEvent]:
+        next_lookup = 0.0
+        while True:
+            deadline = time.monotonic() + interval
+            yield from self.poll(lookup=False)
+            if self._book.vanished and time.monotonic() >= next_lookup:
+                next_lookup = time.monotonic() + _HISTORY_INTERVAL
+                yield from self._lookup_vanished()
+            time.sleep(max(0.0, deadline - time.monotonic()))
+
+    def _lookup_vanished(self) -> list[OrderEvent]:
+        vanished = self._book.take_vanished()
+        if not vanished:
+            return []
+        found = self._resource.find_in_history(set(vanished))
+        events: list[OrderEvent] = []
+        for order_id in vanished:
+            events.extend(self._book.resolve(order_id, found.get(order_id)))
+        return events
+
+
+class AsyncOrderTracker:
+    """Async counterpart of :class:`OrderTracker`."""
+
+    def __init__(self, orders: AsyncOrdersResource) -> None:
+        self._resource = orders
+        self._book = _OrderBook()
+
+    @property
+    def orders(self) -> dict[int, Order]:
+        return dict(self._book.orders)
+
+    def track(self, order: Order) -> None:
+        """Seed the tracker with an order, e.g. the result of ``place_limit``."""
+        self._book.track(order)
+
+    async def poll(self, lookup: bool = True) -> list[OrderEvent]:
+        """Diff one ``list()`` snapshot; with ``lookup``, resolve vanished orders from history."""
+        events = self._book.apply_snapshot((await self._resource.list()).data)
+        if lookup:
+            events.extend(await self._lookup_vanished())
+        return events
+
+    async def iter_events(self, interval: float = _LIST_INTERVAL) -> AsyncIterator[OrderEvent]:
+        loop = asyncio.get_running_loop()
+        next_lookup = 0.0
+        while True:
+            deadline = loop.time() + interval
+            for event in await self.poll(lookup=False):
+                yield event
+            if self._book.vanished and loop.time() >= next_lookup:
+                next_lookup = loop.time() + _HISTORY_INTERVAL
+                for event in await self._lookup_vanished():
+                    yield event
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+
+    async def _lookup_vanished(self) -> list[OrderEvent]:
+        vanished = self._book.take_vanished()
+        if not vanished:
+            return []
+        found = await self._resource.find_in_history(set(vanished))
+        events: list[OrderEvent] = []
+        for order_id in vanished:
+            events.extend(self._book.resolve(order_id, found.get(order_id)))
+        return events
+
+
+class PositionEventType(StrEnum):
+    OPENED = "OPENED"
+    CLOSED = "CLOSED"
+    QUANTITY_CHANGED = "QUANTITY_CHANGED"
+    PRICE_MOVED = "PRICE_MOVED"
+
+
+@dataclass(frozen=True)
+class PositionEvent:
+    """A change observed on a position, keyed by instrument ticker.
+
+    For ``CLOSED`` events ``position`` is the last snapshot seen.
+    """
+
+    type: PositionEventType
+    ticker: str
+    position: Position
+    previous: Position | None = None
+
+
+@dataclass(frozen=True)
+class PortfolioTotals:
+    """Portfolio aggregates summed over each position's wallet impact."""
+
+    positions: int = 0
+    current_value: float = 0.0
+    total_cost: float = 0.0
+    unrealized_profit_loss: float = 0.0
+    fx_impact: float = 0.0
+
+    def _shift(self, impact: PositionWalletImpact | None, sign: int) -> PortfolioTotals:
+        impact = impact or PositionWalletImpact()
+        return PortfolioTotals(
+            positions=self.positions + sign,
+            current_value=self.current_value + sign * (impact.current_value or 0.0),
+            total_cost=self.total_cost + sign * (impact.total_cost or 0.0),
+            unrealized_profit_loss=(
+                self.unrealized_profit_loss + sign * (impact.unrealized_profit_loss or 0.0)
+            ),
+            fx_impact=self.fx_impact + sign * (impact.fx_impact or 0.0),
+        )
+
+
+class _PositionBook:
+    """Last positions snapshot keyed by ticker, with running portfolio totals."""
+
+    def __init__(self, price_threshold: float) -> None:
+        self.price_threshold = price_threshold
+        self.positions: dict[str, Position] = {}
+        self.totals = PortfolioTotals()
+        # Price at the last OPENED/PRICE_MOVED event, so slow drift still crosses the threshold.
+        self._reference_prices: dict[str, float] = {}
+
+    def apply_snapshot(self, snapshot: Iterable[Position]) -> list[PositionEvent]:
+        events: list[PositionEvent] = []
+        seen: set[str] = set()
+        for position in snapshot:
+            ticker = position.instrument.ticker if position.instrument else None
+            if ticker is None:
+                continue
+            seen.add(ticker)
+            previous = self.positions.get(ticker)
+            if previous is None:
+                self._replace(ticker, None, position)
+                events.append(PositionEvent(PositionEventType.OPENED, ticker, position))
+            elif previous != position:
+                self._replace(ticker, previous, position)
+                events.extend(self._diff(ticker, previous, position))
+        for ticker in self.positions.keys() - seen:
+            previous = self.positions[ticker]
+            self._replace(ticker, previous, None)
+            events.append(PositionEvent(PositionEventType.CLOSED, ticker, previous, previous))
+        return events
+
+    def _replace(self, ticker: str, previous: Position | None, current: Position | None) -> None:
+        if previous is not None:
+            self.totals = self.totals._shift(previous.wallet_impact, -1)
+        if current is None:
+            del self.positions[ticker]
+            self._reference_prices.pop(ticker, None)
+            return
+        self.totals = self.totals._shift(current.wallet_impact, 1)
+        self.positions[ticker] = current
+        if previous is None and current.current_price is not None:
+            self._reference_prices[ticker] = current.current_price
+
+    def _diff(self, ticker: str, previous: Position, current: Position) -> list[PositionEvent]:
+        events: list[PositionEvent] = []
+        if current.quantity != previous.quantity:
+            events.append(
+                PositionEvent(PositionEventType.QUANTITY_CHANGED, ticker, current, previous)
+            )
+        price = current.current_price
+        reference = self._reference_prices.get(ticker)
+        if price is not None and (
+            reference is None
+            or reference == 0.0
+            or abs(price - reference) / abs(reference) >= self.price_threshold
+        ):
+            if reference is not None:
+                events.append(
+                    PositionEvent(PositionEventType.PRICE_MOVED, ticker, current, previous)
+                )
+            self._reference_prices[ticker] = price
+        return events
+
+
+class PositionsTracker:
+    """Emit only what changed between successive ``positions.get()`` snapshots.
+
+    ``price_threshold`` is the relative move (0.01 = 1%) from the price at the last
+    reported event that triggers a ``PRICE_MOVED`` event. :attr:`totals` is updated
+    incrementally from the wallet impact of changed positions only.
+    """
+
+    def __init__(self, positions: PositionsResource, price_threshold: float = 0.01) -> None:
+        self._resource = positions
+        self._book = _PositionBook(price_threshold)
+
+    @property
+    def positions(self) -> dict[str, Position]:
+        return dict(self._book.positions)
+
+    @property
+    def totals(self) -> PortfolioTotals:
+        return self._book.totals
+
+    def poll(self) -> list[PositionEvent]:
+        return self._book.apply_snapshot(self._resource.get().data)
+
+    def iter_events(self, interval: float = _POSITIONS_INTERVAL) -> Iterator[PositionEvent]:
+        while True:
+            deadline = time.monotonic() + interval
+            yield from self.poll()
+            time.sleep(max(0.0, deadline - time.monotonic()))
+
+
+class AsyncPositionsTracker:
+    """Async counterpart of :class:`PositionsTracker`."""
+
+    def __init__(self, positions: AsyncPositionsResource, price_threshold: float = 0.01) -> None:
+        self._resource = positions
+        self._book = _PositionBook(price_threshold)
+
+    @property
+    def positions(self) -> dict[str, Position]:
+        return dict(self._book.positions)
+
+    @property
+    def totals(self) -> PortfolioTotals:
+        return self._book.totals
+
+    async def poll(self) -> list[PositionEvent]:
+        return self._book.apply_snapshot((await self._resource.get()).data)
+
+    async def iter_events(
+        self, interval: float = _POSITIONS_INTERVAL
+    ) -> AsyncIterator[PositionEvent]:
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = loop.time() + interval
+            for event in await self.poll():
+                yield event
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
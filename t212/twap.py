@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+
+from ._ratelimit import endpoint_key, endpoint_limit
+from .api.orders import AsyncOrdersResource
+from .exceptions import Trading212Error
+from .models.orders import Fill, MarketOrderRequest, Order
+from .preflight import MAX_PENDING_PER_TICKER
+from .store import TERMINAL_STATUSES
+
+_MARKET_KEY = endpoint_key("POST", "/api/v0/equity/orders/market")
+# History lookups for a child that left the open orders, each after twice the wait of
+# the last; history can lag the orders endpoint, and it has a budget of 6 req / 60s.
+_HISTORY_ATTEMPTS = 5
+
+
+@dataclass(frozen=True)
+class TwapProgress:
+    """Where a sliced parent order stands; quantities are unsigned.
+
+    ``average_price`` is the quantity-weighted price of the fills read from order
+    history, which holds a child once it is done; None until a fill price is known.
+    ``unknown_quantity`` is the unfilled part of children that left the open orders
+    but never showed up in history, so whether it filled is unknown.
+    """
+
+    ticker: str
+    quantity: float
+    filled_quantity: float
+    pending_quantity: float
+    slices_sent: int
+    slices: int
+    average_price: float | None
+    done: bool
+    unknown_quantity: float = 0.0
+
+    @property
+    def remaining_quantity(self) -> float:
+        # Unknown quantity may have filled, so it is not sent again.
+        unsent = self.quantity - self.filled_quantity - self.pending_quantity
+        return max(0.0, unsent - self.unknown_quantity)
+
+
+class TwapOrder:
+    """A parent order being worked in slices by a :class:`TwapExecutor`.
+
+    ``children`` holds the latest snapshot of each child order by id and ``fills`` the
+    fills of each finished child, from order history. ``unknown`` holds the ids of
+    children whose final state could not be read from history; they count as settled.
+    ``error`` is the last error placing a slice; the quantity is carried over into
+    later slices.
+    """
+
+    def __init__(
+        self,
+        parent: MarketOrderRequest,
+        horizon: float,
+        slices: int,
+        step: float | None,
+        on_progress: Callable[[TwapProgress], None] | None,
+    ) -> None:
+        self.parent = parent
+        self.horizon = horizon
+        self.slices = slices
+        self.step = step
+        self.children: dict[int, Order] = {}
+        self.fills: dict[int, list[Fill]] = {}
+        self.unknown: set[int] = set()
+        self.slices_sent = 0
+        self.error: BaseException | None = None
+        self._on_progress = on_progress
+        self._task: asyncio.Task[None] | None = None
+        self._finished = asyncio.Event()
+
+    @property
+    def progress(self) -> TwapProgress:
+        filled = pending = unknown = 0.0
+        for child_id, child in self.children.items():
+            done = child.filled_quantity or 0.0
+            filled += done
+            if child_id in self.unknown:
+                unknown += abs(child.quantity or 0.0) - done
+            elif child.status not in TERMINAL_STATUSES:
+                pending += abs(child.quantity or 0.0) - done
+        priced = [
+            (fill.price, abs(fill.quantity))
+            for fills in self.fills.values()
+            for fill in fills
+            if fill.price is not None and fill.quantity
+        ]
+        shares = sum(quantity for _, quantity in priced)
+        return TwapProgress(
+            ticker=self.parent.ticker,
+            quantity=abs(self.parent.quantity),
+            filled_quantity=filled,
+            pending_quantity=pending,
+            slices_sent=self.slices_sent,
+            slices=self.slices,
+            average_price=sum(p * q for p, q in priced) / shares if shares else None,
+            done=self._finished.is_set(),
+            unknown_quantity=unknown,
+        )
+
+    @property
+    def settled(self) -> bool:
+        return all(
+            child.status in TERMINAL_STATUSES or child_id in self.unknown
+            for child_id, child in self.children.items()
+        )
+
+    def cancel(self) -> None:
+        """Stop sending slices; children already sent are left to fill."""
+        if self._task is not None:
+            self._task.cancel()
+
+    async def wait(self) -> TwapProgress:
+        await self._finished.wait()
+        return self.progress
+
+    def _notify(self) -> None:
+        if self._on_progress is not None:
+            self._on_progress(self.progress)
+
+
+class TwapExecutor:
+    """Work large market orders as evenly spaced child orders over a time horizon.
+
+    Each slice is sized from what is still unfilled, so fills that come in short, or
+    slices that fail to place, are spread over the slices that remain. Child orders of
+    every parent share one pacer, which spaces market-order submissions to
+    ``budget_share`` of the endpoint's published limit (50 req / 60s) and leaves the
+    rest for other work. A ticker never has more than ``max_pending_per_ticker``
+    unfilled children. Children are polled together with ``orders.get_many()`` every
+    ``poll_interval`` seconds. Those no longer open are read from order history, fills
+    and all, for the average price; history can lag, so a child missing from it is
+    looked up again with exponential back-off and given up on as unknown after a few
+    attempts.
+
+    Usage::
+
+        executor = TwapExecutor(client.orders)
+        twap = executor.execute(MarketOrderRequest(ticker="AAPL_US_EQ", quantity=500),
+                                horizon=600, slices=20)
+        progress = await twap.wait()
+    """
+
+    def __init__(
+        self,
+        orders: AsyncOrdersResource,
+        budget_share: float = 0.5,
+        poll_interval: float = 1.0,
+        max_pending_per_ticker: int = MAX_PENDING_PER_TICKER,
+    ) -> None:
+        limit = endpoint_limit(_MARKET_KEY)
+        self._orders = orders
+        self.spacing = (limit.interval if limit else 0.0) / budget_share
+        self.poll_interval = poll_interval
+        self.max_pending_per_ticker = max_pending_per_ticker
+        self._watch: dict[int, TwapOrder] = {}
+        # Watched children no longer open: (history lookups so far, time of the next).
+        self._closed: dict[int, tuple[int, float]] = {}
+        self._pending: Counter[str] = Counter()
+        self._changed = asyncio.Condition()
+        self._next_slot = 0.0
+        self._slot_lock = asyncio.Lock()
+        self._poller: asyncio.Task[None] | None = None
+        self._parents: list[TwapOrder] = []
+
+    def execute(
+        self,
+        parent: MarketOrderRequest,
+        horizon: float,
+        slices: int = 10,
+        step: float | None = None,
+        on_progress: Callable[[TwapProgress], None] | None = None,
+    ) -> TwapOrder:
+        """Start working ``parent`` in ``slices`` children over ``horizon`` seconds.
+
+        With ``step`` set, child quantities are rounded down to a multiple of it (e.g.
+        ``1.0`` for whole shares). ``on_progress`` is called after every slice and fill.
+        """
+        twap = TwapOrder(parent, horizon, slices, step, on_progress)
+        twap._task = asyncio.get_running_loop().create_task(self._work(twap))
+        self._parents.append(twap)
+        return twap
+
+    async def aclose(self) -> None:
+        tasks = [t._task for t in self._parents if t._task is not None]
+        if self._poller is not None:
+            tasks.append(self._poller)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._parents.clear()
+
+    async def _work(self, twap: TwapOrder) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sign = 1.0 if twap.parent.quantity > 0 else -1.0
+        try:
+            for k in range(twap.slices):
+                await asyncio.sleep(max(0.0, start + k * twap.horizon / twap.slices - loop.time()))
+                quantity = _round(twap.progress.remaining_quantity / (twap.slices - k), twap.step)
+                if quantity <= 0:
+                    continue
+                await self._room(twap.parent.ticker)
+                await self._slot()
+                request = MarketOrderRequest(
+                    ticker=twap.parent.ticker,
+                    quantity=sign * quantity,
+                    extended_hours=twap.parent.extended_hours,
+                )
+                try:
+                    child = (await self._orders.submit(request)).data
+                except (Trading212Error, httpx.HTTPError) as exc:
+                    twap.error = exc  # carried over into the next slice
+                    continue
+                twap.slices_sent += 1
+                self._adopt(twap, child)
+                twap._notify()
+            async with self._changed:
+                await self._changed.wait_for(lambda: twap.settled)
+        finally:
+            twap._finished.set()
+            twap._notify()
+
+    def _adopt(self, twap: TwapOrder, child: Order) -> None:
+        assert child.id is not None
+        twap.children[child.id] = child
+        if child.status not in TERMINAL_STATUSES:
+            self._watch[child.id] = twap
+            self._pending[twap.parent.ticker] += 1
+            if self._poller is None or self._poller.done():
+                self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _room(self, ticker: str) -> None:
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self._pending[ticker] < self.max_pending_per_ticker
+            )
+
+    async def _slot(self) -> None:
+        async with self._slot_lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_slot - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot = loop.time() + self.spacing
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._watch:
+            await asyncio.sleep(self.poll_interval)
+            now = loop.time()
+            open_ids = [order_id for order_id in self._watch if order_id not in self._closed]
+            try:
+                found = await self._orders.get_many(open_ids, history=False) if open_ids else {}
+                for order_id in open_ids:
+                    if order_id not in found:
+                        self._closed[order_id] = (0, now)
+                due = {i for i, (_, at) in self._closed.items() if at <= now}
+                history = await self._orders.history_of(due) if due else {}
+            except (Trading212Error, httpx.HTTPError):
+                continue
+            for order_id, items in history.items():
+                twap = self._watch.get(order_id)
+                if twap is not None and items[0].order is not None:
+                    found[order_id] = items[0].order
+                    twap.fills[order_id] = [item.fill for item in items if item.fill is not None]
+            changed: set[TwapOrder] = set()
+            for order_id in due - found.keys():
+                attempts = self._closed[order_id][0] + 1
+                if attempts < _HISTORY_ATTEMPTS:
+                    self._closed[order_id] = (attempts, now + self.poll_interval * 2**attempts)
+                    continue
+                twap = self._watch.pop(order_id)
+                del self._closed[order_id]
+                self._pending[twap.parent.ticker] -= 1
+                twap.unknown.add(order_id)
+                changed.add(twap)
+            for order_id, order in found.items():
+                twap = self._watch.get(order_id)
+                if twap is None:
+                    continue
+                twap.children[order_id] = order
+                changed.add(twap)
+                self._closed.pop(order_id, None)
+                if order.status in TERMINAL_STATUSES:
+                    del self._watch[order_id]
+                    self._pending[twap.parent.ticker] -= 1
+            if changed:
+                async with self._changed:
+                    self._changed.notify_all()
+                for twap in changed:
+                    twap._notify()
+
+
+def _round(quantity: float, step: float | None) -> float:
+    if step is None:
+        return quantity
+    # Nudge up before flooring so 2.9999999 shares round to 3, not 2.
+    return math.floor(quantity / step + 1e-9) * step
@@ -0,0 +1,88 @@
+"""Tests for AIMD adaptive concurrency in the async engine."""
+import asyncio
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import AdaptiveConcurrency, AsyncTrading212Client, RateLimitError, RateLimitInfo
+
+from .conftest import DEMO_URL, POSITION_JSON, RATE_LIMIT_HEADERS
+
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+
+
+def _budget(remaining: int) -> RateLimitInfo:
+    return RateLimitInfo(limit=10, period=60, remaining=remaining, reset=None, used=None)
+
+
+class TestAdaptiveConcurrency:
+    def test_grows_additively_at_full_concurrency(self) -> None:
+        limiter = AdaptiveConcurrency(initial=4)
+        for i in range(4):
+            limiter.on_response(0.1, 200, _budget(9), in_flight=4, now=float(i))
+        assert limiter.limit == 4
+        for i in range(4):
+            limiter.on_response(0.1, 200, _budget(9), in_flight=4, now=float(i))
+        assert limiter.limit == 5
+
+    def test_idle_capacity_does_not_grow(self) -> None:
+        limiter = AdaptiveConcurrency(initial=4)
+        for i in range(50):
+            limiter.on_response(0.1, 200, None, in_flight=1, now=float(i))
+        assert limiter.limit == 4
+
+    def test_low_budget_holds_limit(self) -> None:
+        limiter = AdaptiveConcurrency(initial=4)
+        for i in range(50):
+            limiter.on_response(0.1, 200, _budget(1), in_flight=4, now=float(i))
+        assert limiter.limit == 4
+
+    def test_rate_limit_halves_once_per_round_trip(self) -> None:
+        limiter = AdaptiveConcurrency(initial=16)
+        limiter.on_response(0.1, 200, None, in_flight=1, now=0.0)
+        assert limiter.on_response(0.1, 429, None, in_flight=16, now=1.0) == 8
+        assert limiter.on_response(0.1, 429, None, in_flight=16, now=1.01) == 8
+        assert limiter.on_response(0.1, 429, None, in_flight=8, now=2.0) == 4
+
+    def test_rising_latency_backs_off(self) -> None:
+        limiter = AdaptiveConcurrency(initial=8, latency_tolerance=2.0)
+        limiter.on_response(0.1, 200, None, in_flight=1, now=0.0)
+        limit = 8
+        for i in range(1, 20):
+            limit = limiter.on_response(0.5, 200, None, in_flight=8, now=float(i))
+        assert limit < 8
+
+    def test_limit_is_bounded(self) -> None:
+        limiter = AdaptiveConcurrency(initial=2, min_limit=2, max_limit=3)
+        for i in range(20):
+            limiter.on_timeout(now=float(i))
+        assert limiter.limit == 2
+        for i in range(100):
+            limiter.on_response(0.1, 200, None, in_flight=3, now=float(i))
+        assert limiter.limit == 3
+
+
+class TestAdaptiveEngine:
+    async def test_429_shrinks_gate(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=POSITIONS_URL, status_code=429, text="Limited")
+        async with AsyncTrading212Client(
+            "key", "secret", adaptive_concurrency=AdaptiveConcurrency(initial=8)
+        ) as client:
+            assert client.metrics().max_in_flight == 8
+            with pytest.raises(RateLimitError):
+                await client.positions.get()
+            assert client.metrics().max_in_flight == 4
+
+    async def test_max_in_flight_caps_growth(self, httpx_mock: HTTPXMock) -> None:
+        async def respond(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[POSITION_JSON], headers=RATE_LIMIT_HEADERS)
+
+        httpx_mock.add_callback(respond, url=POSITIONS_URL, is_reusable=True)
+        limiter = AdaptiveConcurrency(initial=2)
+        async with AsyncTrading212Client(
+            "key", "secret", max_in_flight=3, adaptive_concurrency=limiter
+        ) as client:
+            await asyncio.gather(*(client.positions.get() for _ in range(40)))
+            assert client.metrics().max_in_flight == 3
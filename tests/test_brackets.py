@@ -0,0 +1,179 @@
+"""Tests for the bracket/OCO emulator, run against the simulated exchange."""
+import asyncio
+from collections.abc import Callable
+
+import httpx
+import pytest
+
+from t212 import (
+    AsyncTrading212Client,
+    EmulationStatus,
+    NotFoundError,
+    OrderEmulator,
+    SimulatedExchange,
+    Trading212Client,
+)
+from t212.models.enums import OrderStatus, OrderType
+from t212.models.orders import LimitOrderRequest, MarketOrderRequest, StopOrderRequest
+
+from .conftest import DEMO_URL
+
+TICKER = "AAPL_US_EQ"
+
+
+async def _until(condition: Callable[[], bool], timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.005)
+
+
+class TestSimulatedExchange:
+    def test_limit_order_fills_when_price_crosses(self) -> None:
+        exchange = SimulatedExchange()
+        client = Trading212Client("key", "secret", transport=exchange)
+        order = client.orders.place_limit(
+            LimitOrderRequest(ticker=TICKER, quantity=2, limit_price=100.0)
+        ).data
+        exchange.set_price(TICKER, 101.0)
+        assert client.orders.get(order.id).data.status == OrderStatus.NEW
+        exchange.set_price(TICKER, 99.5)
+        with pytest.raises(NotFoundError):
+            client.orders.get(order.id)  # only pending orders can be fetched by id
+        assert client.orders.list().data == []
+        history = list(client.history.iter_orders())
+        assert history[0].order is not None and history[0].order.status == OrderStatus.FILLED
+        assert history[0].fill is not None and history[0].fill.price == 99.5
+
+    def test_sell_stop_and_cancel(self) -> None:
+        exchange = SimulatedExchange()
+        client = Trading212Client("key", "secret", transport=exchange)
+        stop = client.orders.place_stop(
+            StopOrderRequest(ticker=TICKER, quantity=-1, stop_price=90.0)
+        ).data
+        other = client.orders.place_stop(
+            StopOrderRequest(ticker=TICKER, quantity=-1, stop_price=80.0)
+        ).data
+        exchange.set_price(TICKER, 89.0)
+        assert exchange.orders[stop.id].status == OrderStatus.FILLED
+        client.orders.cancel(other.id)
+        assert exchange.orders[other.id].status == OrderStatus.CANCELLED
+
+    def test_rate_limits(self) -> None:
+        exchange = SimulatedExchange(rate_limits=True)
+        http = httpx.Client(transport=exchange, base_url=DEMO_URL)
+        body = {"ticker": TICKER, "quantity": 1, "limitPrice": 1.0}
+        first = http.post("/api/v0/equity/orders/limit", json=body)
+        second = http.post("/api/v0/equity/orders/limit", json=body)
+        assert first.status_code == 200
+        assert first.headers["x-ratelimit-remaining"] == "0"
+        assert second.status_code == 429
+
+    async def test_latency_injection(self) -> None:
+        exchange = SimulatedExchange(latency=0.05)
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await client.orders.list()
+            assert loop.time() - started >= 0.05
+
+
+class TestOrderEmulator:
+    async def test_bracket_take_profit(self) -> None:
+        exchange = SimulatedExchange(latency=0.001)
+        exchange.set_price(TICKER, 100.0)
+        async with (
+            AsyncTrading212Client("key", "secret", transport=exchange) as client,
+            OrderEmulator(client.orders, interval=0.01) as emulator,
+        ):
+            entry = MarketOrderRequest(ticker=TICKER, quantity=3)
+            group = await emulator.bracket(entry, take_profit=110.0, stop_loss=95.0)
+            await _until(lambda: group.status is EmulationStatus.ACTIVE)
+            legs = list(group.legs.values())
+            assert {leg.type for leg in legs} == {OrderType.LIMIT, OrderType.STOP}
+            assert all(leg.quantity == -3 for leg in legs)
+
+            exchange.set_price(TICKER, 111.0)
+            async with asyncio.timeout(2.0):
+                await group.wait()
+        assert group.status is EmulationStatus.FILLED
+        assert group.filled is not None and group.filled.type == OrderType.LIMIT
+        stop = next(leg for leg in group.legs.values() if leg.type == OrderType.STOP)
+        assert stop.status == OrderStatus.CANCELLED
+        assert len(group.reaction_times) == 2
+
+    async def test_partial_fill_resizes_sibling(self) -> None:
+        exchange = SimulatedExchange()
+        exchange.set_price(TICKER, 100.0)
+        async with (
+            AsyncTrading212Client("key", "secret", transport=exchange) as client,
+            OrderEmulator(client.orders, interval=0.01) as emulator,
+        ):
+            entry = MarketOrderRequest(ticker=TICKER, quantity=10)
+            group = await emulator.bracket(entry, take_profit=110.0, stop_loss=95.0)
+            await _until(lambda: group.status is EmulationStatus.ACTIVE)
+            take_profit, stop = (
+                leg.id for leg in sorted(group.legs.values(), key=lambda leg: leg.type != "LIMIT")
+            )
+            assert take_profit is not None and stop is not None
+
+            exchange.fill(take_profit, quantity=4, price=110.0)
+            await _until(lambda: len(group.legs) == 3)
+            assert group.legs[stop].status == OrderStatus.CANCELLED
+            smaller = max(group.legs)
+            assert group.legs[smaller].type == OrderType.STOP
+            assert group.legs[smaller].quantity == -6  # the 4 sold no longer need protecting
+            assert not group.done
+
+            exchange.fill(take_profit, price=110.0)
+            async with asyncio.timeout(2.0):
+                await group.wait()
+        assert group.status is EmulationStatus.FILLED
+        assert group.filled is not None and group.filled.id == take_profit
+        assert exchange.orders[smaller].status == OrderStatus.CANCELLED
+
+    async def test_oco_cancels_sibling(self) -> None:
+        exchange = SimulatedExchange()
+        async with (
+            AsyncTrading212Client("key", "secret", transport=exchange) as client,
+            OrderEmulator(client.orders, interval=0.01) as emulator,
+        ):
+            group = await emulator.oco(
+                LimitOrderRequest(ticker=TICKER, quantity=1, limit_price=90.0),
+                LimitOrderRequest(ticker="MSFT_US_EQ", quantity=1, limit_price=300.0),
+            )
+            first = next(iter(group.legs))
+            exchange.fill(first, price=90.0)
+            async with asyncio.timeout(2.0):
+                await group.wait()
+        assert group.status is EmulationStatus.FILLED
+        assert group.filled is not None and group.filled.id == first
+        assert sum(o.status == OrderStatus.CANCELLED for o in exchange.orders.values()) == 1
+
+    async def test_oco_race_is_reported(self) -> None:
+        exchange = SimulatedExchange()
+        async with (
+            AsyncTrading212Client("key", "secret", transport=exchange) as client,
+            OrderEmulator(client.orders, interval=0.01) as emulator,
+        ):
+            group = await emulator.oco(
+                LimitOrderRequest(ticker=TICKER, quantity=1, limit_price=90.0),
+                LimitOrderRequest(ticker=TICKER, quantity=1, limit_price=95.0),
+            )
+            exchange.set_price(TICKER, 89.0)  # both fill before the emulator sees either
+            async with asyncio.timeout(2.0):
+                await group.wait()
+        assert group.status is EmulationStatus.OVERFILLED
+
+    async def test_cancel_pending_bracket(self) -> None:
+        exchange = SimulatedExchange()
+        async with (
+            AsyncTrading212Client("key", "secret", transport=exchange) as client,
+            OrderEmulator(client.orders, interval=0.01) as emulator,
+        ):
+            entry = LimitOrderRequest(ticker=TICKER, quantity=1, limit_price=90.0)
+            group = await emulator.bracket(entry, take_profit=100.0, stop_loss=85.0)
+            await emulator.cancel(group)
+            async with asyncio.timeout(2.0):
+                await group.wait()
+        assert group.status is EmulationStatus.CANCELLED
+        assert group.legs == {}
@@ -0,0 +1,123 @@
+"""Tests for the per-endpoint circuit breaker."""
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import (
+    AsyncTrading212Client,
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    NotFoundError,
+    ServerError,
+    Trading212Client,
+)
+
+from .conftest import ACCOUNT_SUMMARY_JSON, DEMO_URL, POSITION_JSON
+
+SUMMARY_KEY = "GET /api/v0/equity/account/summary"
+SUMMARY_URL = f"{DEMO_URL}/api/v0/equity/account/summary"
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+
+
+def _breaker(reset_timeout: float = 30.0, half_open_probes: int = 1) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_rate=0.5,
+        window=4,
+        min_requests=2,
+        reset_timeout=reset_timeout,
+        half_open_probes=half_open_probes,
+    )
+
+
+class TestCircuitBreaker:
+    def test_opens_after_error_rate(self) -> None:
+        breaker = _breaker()
+        breaker.record(SUMMARY_KEY, failed=False)
+        assert breaker.state(SUMMARY_KEY) is CircuitState.CLOSED
+        breaker.record(SUMMARY_KEY, failed=True)
+        assert breaker.state(SUMMARY_KEY) is CircuitState.OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before(SUMMARY_KEY)
+        assert 0 < exc_info.value.retry_after <= 30.0
+
+    def test_half_open_admits_limited_probes(self) -> None:
+        breaker = _breaker(reset_timeout=0.0, half_open_probes=1)
+        breaker.record(SUMMARY_KEY, failed=True)
+        breaker.record(SUMMARY_KEY, failed=True)
+        assert breaker.before(SUMMARY_KEY) is True
+        assert breaker.state(SUMMARY_KEY) is CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before(SUMMARY_KEY)
+        breaker.record(SUMMARY_KEY, failed=False, probe=True)
+        assert breaker.state(SUMMARY_KEY) is CircuitState.CLOSED
+        assert breaker.before(SUMMARY_KEY) is False
+
+    def test_failed_probe_reopens(self) -> None:
+        breaker = _breaker(reset_timeout=0.0)
+        breaker.record(SUMMARY_KEY, failed=True)
+        breaker.record(SUMMARY_KEY, failed=True)
+        breaker.before(SUMMARY_KEY)
+        breaker.record(SUMMARY_KEY, failed=True, probe=True)
+        assert breaker.state(SUMMARY_KEY) is CircuitState.OPEN
+        assert breaker.status()[SUMMARY_KEY].trips == 2
+
+    def test_abandoned_probe_frees_its_slot(self) -> None:
+        breaker = _breaker(reset_timeout=0.0)
+        breaker.record(SUMMARY_KEY, failed=True)
+        breaker.record(SUMMARY_KEY, failed=True)
+        breaker.before(SUMMARY_KEY)
+        breaker.record(SUMMARY_KEY, failed=None, probe=True)
+        assert breaker.before(SUMMARY_KEY) is True
+
+
+class TestEngineCircuit:
+    def test_server_errors_trip_and_fail_fast(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=SUMMARY_URL, status_code=503, text="down")
+        httpx_mock.add_response(url=SUMMARY_URL, status_code=503, text="down")
+        client = Trading212Client("key", "secret", circuit_breaker=_breaker())
+        for _ in range(2):
+            with pytest.raises(ServerError):
+                client.account.get_summary()
+        with pytest.raises(CircuitOpenError):
+            client.account.get_summary()
+        assert len(httpx_mock.get_requests()) == 2
+        status = client.metrics().circuits[SUMMARY_KEY]
+        assert status.state is CircuitState.OPEN
+        assert status.retry_after is not None
+
+    def test_circuits_are_per_endpoint(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_exception(httpx.ConnectTimeout("timed out"), url=SUMMARY_URL)
+        httpx_mock.add_exception(httpx.ConnectTimeout("timed out"), url=SUMMARY_URL)
+        httpx_mock.add_response(url=POSITIONS_URL, json=[POSITION_JSON])
+        client = Trading212Client("key", "secret", circuit_breaker=_breaker())
+        for _ in range(2):
+            with pytest.raises(httpx.ConnectTimeout):
+                client.account.get_summary()
+        assert client.positions.get().data[0].quantity == 5.0
+        with pytest.raises(CircuitOpenError):
+            client.account.get_summary()
+
+    async def test_client_errors_do_not_count(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=SUMMARY_URL, status_code=404, text="?", is_reusable=True)
+        async with AsyncTrading212Client(
+            "key", "secret", circuit_breaker=_breaker()
+        ) as client:
+            for _ in range(3):
+                with pytest.raises(NotFoundError):
+                    await client.account.get_summary()
+            assert client.metrics().circuits[SUMMARY_KEY].state is CircuitState.CLOSED
+
+    async def test_async_probe_closes_circuit(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=SUMMARY_URL, status_code=500, text="boom")
+        httpx_mock.add_response(url=SUMMARY_URL, status_code=500, text="boom")
+        httpx_mock.add_response(url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON)
+        async with AsyncTrading212Client(
+            "key", "secret", circuit_breaker=_breaker(reset_timeout=0.0)
+        ) as client:
+            for _ in range(2):
+                with pytest.raises(ServerError):
+                    await client.account.get_summary()
+            response = await client.account.get_summary()
+            assert response.data.currency == "GBP"
+            assert client.metrics().circuits[SUMMARY_KEY].state is CircuitState.CLOSED
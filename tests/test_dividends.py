@@ -0,0 +1,91 @@
+"""Tests for dividend analytics."""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212.analytics import DividendAggregator, DividendTable  # noqa: E402
+from t212.models.history import HistoryDividendItem  # noqa: E402
+
+from .conftest import DIVIDEND_JSON  # noqa: E402
+
+
+def _dividend(
+    reference: str,
+    ticker: str,
+    paid_on: str,
+    amount: float,
+    per_share: float,
+    quantity: float,
+    currency: str = "USD",
+    type: str = "ORDINARY",
+) -> HistoryDividendItem:
+    return HistoryDividendItem.model_validate(
+        {
+            **DIVIDEND_JSON,
+            "reference": reference,
+            "ticker": ticker,
+            "paidOn": paid_on,
+            "amount": amount,
+            "grossAmountPerShare": per_share,
+            "quantity": quantity,
+            "currency": currency,
+            "tickerCurrency": "USD",
+            "type": type,
+        }
+    )
+
+
+ITEMS = [
+    _dividend("D1", "AAPL_US_EQ", "2024-02-15T00:00:00Z", 10.0, 0.25, 50.0),
+    _dividend("D2", "AAPL_US_EQ", "2024-05-16T00:00:00Z", 10.0, 0.25, 50.0),
+    _dividend("D3", "MSFT_US_EQ", "2024-05-20T00:00:00Z", 7.5, 0.75, 10.0, type="BONUS"),
+    _dividend("D4", "VOD_L_EQ", "2024-05-21T00:00:00Z", 4.0, 0.05, 100.0, currency="GBP"),
+]
+
+
+class TestDividendTable:
+    def test_columns(self) -> None:
+        table = DividendTable.from_history(ITEMS)
+        assert len(table) == 4
+        assert table.ticker.tolist()[:2] == ["AAPL_US_EQ", "AAPL_US_EQ"]
+        assert table.paid_on[0] == np.datetime64("2024-02-15T00:00:00", "us")
+        np.testing.assert_allclose(table.gross, [12.5, 12.5, 7.5, 5.0])
+
+    def test_totals(self) -> None:
+        table = DividendTable.from_history(ITEMS)
+        assert table.total_by("ticker") == {
+            ("AAPL_US_EQ",): 20.0,
+            ("MSFT_US_EQ",): 7.5,
+            ("VOD_L_EQ",): 4.0,
+        }
+        assert table.total_by("period")[(date(2024, 5, 1),)] == pytest.approx(21.5)
+        assert table.total_by("type")[("BONUS",)] == 7.5
+
+    def test_withholding(self) -> None:
+        table = DividendTable.from_history(ITEMS)
+        withheld = table.withheld()
+        np.testing.assert_allclose(withheld[:3], [2.5, 2.5, 0.0])
+        assert np.isnan(withheld[3])
+        rates = table.withholding_rate({"USD": 0.8})
+        assert rates["AAPL_US_EQ"] == pytest.approx(0.2)
+        assert rates["VOD_L_EQ"] == 0.0
+
+    def test_yield_on_cost(self) -> None:
+        table = DividendTable.from_history(ITEMS)
+        as_of = datetime(2024, 6, 1)
+        result = table.yield_on_cost({"AAPL_US_EQ": 10.0}, as_of)
+        assert result == {"AAPL_US_EQ": pytest.approx(0.05)}
+        recent = table.yield_on_cost({"AAPL_US_EQ": 10.0}, as_of, timedelta(days=30))
+        assert recent == {"AAPL_US_EQ": pytest.approx(0.025)}
+
+
+class TestDividendAggregator:
+    def test_incremental_matches_full(self) -> None:
+        aggregator = DividendAggregator("ticker", "period")
+        first = aggregator.add(ITEMS[:2])
+        second = aggregator.add(ITEMS[1:])
+        assert (len(first), len(second)) == (2, 2)
+        full = DividendTable.from_history(ITEMS).total_by("ticker", "period")
+        assert aggregator.totals == full
@@ -0,0 +1,99 @@
+"""Tests for execution quality analytics."""
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212.analytics import ExecutionTable  # noqa: E402
+from t212.models.history import HistoricalOrder  # noqa: E402
+
+from .conftest import HISTORICAL_ORDER_JSON  # noqa: E402
+
+
+def _item(
+    order_id: int,
+    type: str = "MARKET",
+    side: str = "BUY",
+    quantity: float = 10.0,
+    filled: float = 10.0,
+    price: float | None = 100.0,
+    latency: int = 5,
+    **order: Any,
+) -> HistoricalOrder:
+    raw = HISTORICAL_ORDER_JSON
+    filled_at = f"2024-01-15T10:30:{latency:02d}Z"
+    fill = (
+        {**raw["fill"], "price": price, "quantity": filled, "filledAt": filled_at}
+        if price is not None
+        else None
+    )
+    return HistoricalOrder.model_validate(
+        {
+            "order": {
+                **raw["order"],
+                "id": order_id,
+                "type": type,
+                "side": side,
+                "quantity": quantity,
+                "filledQuantity": filled,
+                "createdAt": "2024-01-15T10:30:00Z",
+                **order,
+            },
+            "fill": fill,
+        }
+    )
+
+
+ITEMS = [
+    _item(1, latency=1),
+    _item(2, latency=3),
+    _item(3, type="LIMIT", limitPrice=99.0, price=99.0, latency=20),
+    _item(4, type="LIMIT", side="SELL", limitPrice=101.0, price=101.5, filled=4.0, latency=40),
+    _item(5, type="LIMIT", limitPrice=90.0, filled=0.0, price=None, status="CANCELLED"),
+]
+
+
+class TestExecutionTable:
+    def test_latency_and_fill_ratio(self) -> None:
+        table = ExecutionTable.from_history(ITEMS)
+        np.testing.assert_allclose(table.latency()[:4], [1, 3, 20, 40])
+        assert np.isnan(table.latency()[4])
+        np.testing.assert_allclose(table.fill_ratio(), [1, 1, 1, 0.4, 0])
+
+    def test_slippage(self) -> None:
+        table = ExecutionTable.from_history(ITEMS)
+        slippage = table.slippage()
+        assert np.isnan(slippage[:2]).all()  # market orders have no reference by default
+        np.testing.assert_allclose(slippage[2:4], [0.0, -49.50495], rtol=1e-5)
+        with_mid = table.slippage({1: 99.0, 2: 101.0})
+        np.testing.assert_allclose(with_mid[:2], [101.0101, -99.0099], rtol=1e-5)
+
+    def test_summary_by_type(self) -> None:
+        summary = ExecutionTable.from_history(ITEMS).summary("type", quantiles=(0.5, 1.0))
+        market, limit = summary[("MARKET",)], summary[("LIMIT",)]
+        assert (market.orders, market.filled, market.partial) == (2, 2, 0)
+        assert market.latency == {0.5: 2.0, 1.0: 3.0}
+        assert (limit.orders, limit.filled, limit.partial) == (3, 1, 1)
+        assert limit.fill_rate == pytest.approx(1 / 3)
+        assert limit.mean_latency == 30.0
+        assert np.isnan(market.slippage)
+
+    def test_summary_overall_and_multi_key(self) -> None:
+        table = ExecutionTable.from_history(ITEMS)
+        (overall,) = table.summary().values()
+        assert overall.orders == 5
+        by_side = table.summary("side", "initiated_from", "trading_method")
+        assert by_side[("SELL", "API", "OTC")].partial_rate == 1.0
+
+    def test_multi_fill_order_counts_once(self) -> None:
+        fills = [
+            _item(7, filled=4.0, price=100.0, latency=2, status="PARTIALLY_FILLED"),
+            _item(7, filled=10.0, price=102.0, latency=6, status="FILLED"),
+        ]
+        table = ExecutionTable.from_history([*fills, _item(8, filled=4.0)])
+        assert len(table) == 3
+        (overall,) = table.summary(quantiles=(0.5,)).values()
+        assert (overall.orders, overall.filled, overall.partial) == (2, 1, 1)
+        assert overall.fill_rate == 0.5
+        assert overall.mean_latency == pytest.approx(13 / 3)  # every fill counts
@@ -0,0 +1,116 @@
+"""Tests for exposure and risk aggregation."""
+from unittest import mock
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212 import InstrumentCatalog, PositionEvent, PositionEventType  # noqa: E402
+from t212.analytics import ExposureEngine  # noqa: E402
+from t212.models.instruments import Exchange, TradableInstrument  # noqa: E402
+from t212.models.positions import Position  # noqa: E402
+
+from .conftest import EXCHANGE_JSON, INSTRUMENT_JSON, POSITION_JSON  # noqa: E402
+
+
+def _position(ticker: str, value: float, fx_impact: float = 0.0) -> Position:
+    return Position.model_validate(
+        {
+            **POSITION_JSON,
+            "instrument": {**POSITION_JSON["instrument"], "ticker": ticker},
+            "walletImpact": {
+                **POSITION_JSON["walletImpact"],
+                "currentValue": value,
+                "fxImpact": fx_impact,
+            },
+        }
+    )
+
+
+CATALOG = InstrumentCatalog(
+    [
+        TradableInstrument.model_validate(INSTRUMENT_JSON),
+        TradableInstrument.model_validate(
+            {**INSTRUMENT_JSON, "ticker": "MSFT_US_EQ", "type": "STOCK"}
+        ),
+        TradableInstrument.model_validate(
+            {
+                **INSTRUMENT_JSON,
+                "ticker": "VUSA_L_EQ",
+                "type": "ETF",
+                "currencyCode": "GBP",
+                "workingScheduleId": 2,
+            }
+        ),
+    ],
+    [Exchange.model_validate(EXCHANGE_JSON)],
+)
+
+
+def _engine() -> ExposureEngine:
+    engine = ExposureEngine(CATALOG, capacity=1)
+    engine.update(
+        [
+            _position("AAPL_US_EQ", 600.0, fx_impact=5.0),
+            _position("MSFT_US_EQ", 200.0, fx_impact=-1.0),
+            _position("VUSA_L_EQ", 200.0),
+        ]
+    )
+    return engine
+
+
+class TestExposureEngine:
+    def test_groups(self) -> None:
+        engine = _engine()
+        assert engine.total().gross == 1000.0
+        assert engine.exposure("currency")[("USD",)].net == 800.0
+        assert engine.exposure("instrument_type")[("ETF",)].gross == 200.0
+        by_exchange = engine.exposure("exchange")
+        assert by_exchange[("NASDAQ",)].gross == 800.0
+        assert by_exchange[("",)].gross == 200.0  # schedule 2 is not in the catalog
+
+    def test_fx(self) -> None:
+        engine = _engine()
+        assert engine.account_currency == "GBP"
+        assert engine.fx_sensitivity(0.01) == {"USD": pytest.approx(8.0)}
+        assert engine.fx_impact() == {"GBP": 0.0, "USD": 4.0}
+
+    def test_concentration(self) -> None:
+        concentration = _engine().concentration(top=2)
+        assert concentration.hhi == pytest.approx(0.36 + 0.04 + 0.04)
+        assert concentration.effective_count == pytest.approx(1 / 0.44)
+        assert concentration.largest == pytest.approx(0.6)
+        assert concentration.top_share == pytest.approx(0.8)
+
+    def test_snapshot_drops_closed_positions(self) -> None:
+        engine = _engine()
+        engine.update([_position("VUSA_L_EQ", 300.0), _position("MSFT_US_EQ", 100.0)])
+        assert engine.values() == {"VUSA_L_EQ": 300.0, "MSFT_US_EQ": 100.0}
+        assert engine.exposure("currency")[("USD",)].gross == 100.0
+
+    def test_snapshot_rewrites_only_changed_rows(self) -> None:
+        engine = _engine()
+        with mock.patch.object(engine, "_set", wraps=engine._set) as rewrite:
+            engine.update(
+                [
+                    _position("AAPL_US_EQ", 600.0, fx_impact=5.0),
+                    _position("MSFT_US_EQ", 210.0, fx_impact=-1.0),
+                    _position("VUSA_L_EQ", 200.0),
+                ]
+            )
+        assert [call.args[0] for call in rewrite.call_args_list] == ["MSFT_US_EQ"]
+        assert engine.values()["MSFT_US_EQ"] == 210.0
+
+    def test_apply_events(self) -> None:
+        engine = _engine()
+        aapl = _position("AAPL_US_EQ", 600.0)
+        engine.apply(
+            [
+                PositionEvent(PositionEventType.CLOSED, "AAPL_US_EQ", aapl),
+                PositionEvent(
+                    PositionEventType.PRICE_MOVED, "MSFT_US_EQ", _position("MSFT_US_EQ", 250.0)
+                ),
+            ]
+        )
+        assert len(engine) == 2
+        assert engine.total().net == 450.0
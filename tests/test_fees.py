@@ -0,0 +1,77 @@
+"""Tests for the fee and tax ledger."""
+from datetime import date
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212.analytics import FeeLedger  # noqa: E402
+from t212.models.history import HistoricalOrder  # noqa: E402
+
+from .conftest import HISTORICAL_ORDER_JSON  # noqa: E402
+
+
+def _item(ticker: str, filled_at: str, *taxes: dict[str, Any], **impact: Any) -> HistoricalOrder:
+    raw = HISTORICAL_ORDER_JSON
+    return HistoricalOrder.model_validate(
+        {
+            "order": {**raw["order"], "ticker": ticker},
+            "fill": {
+                **raw["fill"],
+                "filledAt": filled_at,
+                "walletImpact": {**raw["fill"]["walletImpact"], "taxes": list(taxes), **impact},
+            },
+        }
+    )
+
+
+def _tax(name: str, quantity: float, currency: str) -> dict[str, Any]:
+    return {"name": name, "quantity": quantity, "currency": currency}
+
+
+ITEMS = [
+    _item(
+        "AAPL_US_EQ",
+        "2024-01-15T10:00:00Z",
+        _tax("FINRA_FEE", 0.10, "USD"),
+        _tax("CURRENCY_CONVERSION_FEE", 0.25, "GBP"),
+    ),
+    _item("VOD_L_EQ", "2024-02-01T09:00:00Z", _tax("STAMP_DUTY", 5.0, "GBP")),
+    _item("AAPL_US_EQ", "2024-02-02T09:00:00Z"),
+]
+
+
+class TestFeeLedger:
+    def test_flattens_and_converts(self) -> None:
+        ledger = FeeLedger.from_history(ITEMS)
+        assert len(ledger) == 3
+        assert ledger.name.tolist() == ["FINRA_FEE", "CURRENCY_CONVERSION_FEE", "STAMP_DUTY"]
+        # The USD fee converts at the fill's fxRate (0.79); GBP charges are already in GBP.
+        assert ledger.amount.tolist() == pytest.approx([0.079, 0.25, 5.0])
+        assert ledger.charged_at[0] == np.datetime64("2024-01-15T10:00:00", "us")
+
+    def test_totals(self) -> None:
+        ledger = FeeLedger.from_history(ITEMS)
+        by_month = ledger.total_by("period", period="M")
+        assert by_month == pytest.approx({(date(2024, 1, 1),): 0.329, (date(2024, 2, 1),): 5.0})
+        by_ticker = ledger.total_by("ticker", "name")
+        assert by_ticker[("VOD_L_EQ", "STAMP_DUTY")] == 5.0
+        raw = ledger.total_by("currency", converted=False)
+        assert raw == pytest.approx({("GBP",): 5.25, ("USD",): 0.10})
+        assert ledger.total_by() == pytest.approx({(): 5.329})
+
+    def test_unconverted_charges_are_left_out(self) -> None:
+        tax = _tax("TRANSACTION_FEE", 0.5, "USD")
+        unrated = _item("MSFT_US_EQ", "2024-01-20T10:00:00Z", tax, fxRate=None)
+        ledger = FeeLedger.from_history([*ITEMS, unrated])
+        assert np.isnan(ledger.amount[-1])
+        by_ticker = ledger.total_by("ticker")
+        assert by_ticker == pytest.approx({("AAPL_US_EQ",): 0.329, ("VOD_L_EQ",): 5.0})
+        assert ledger.total_by("ticker", converted=False)[("MSFT_US_EQ",)] == 0.5
+
+    def test_concat(self) -> None:
+        parts = [FeeLedger.from_history(ITEMS[:1]), FeeLedger.from_history(ITEMS[1:])]
+        ledger = FeeLedger.concat(parts)
+        assert len(ledger) == 3
+        assert FeeLedger.from_history([]).total_by("name") == {}
@@ -0,0 +1,124 @@
+"""Tests for the local fan-out gateway and its client engines."""
+import asyncio
+import json
+import os
+import stat
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, Feed, NotFoundError, Trading212Client
+from t212.gateway import AsyncGatewayEngine, Gateway, _FeedCache
+
+from .conftest import ACCOUNT_SUMMARY_JSON, DEMO_URL, POSITION_JSON, RATE_LIMIT_HEADERS
+
+SUMMARY_URL = f"{DEMO_URL}/api/v0/equity/account/summary"
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> str:
+    return str(tmp_path / "gw.sock")
+
+
+class TestGateway:
+    async def test_consumers_share_one_upstream_fetch(
+        self, httpx_mock: HTTPXMock, socket_path: str
+    ) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL, json=[POSITION_JSON], headers=RATE_LIMIT_HEADERS
+        )
+        async with AsyncTrading212Client("key", "secret") as upstream:
+            async with Gateway(upstream, socket_path, max_age=60.0):
+                consumers = [
+                    await AsyncTrading212Client.via_gateway(socket_path) for _ in range(3)
+                ]
+                responses = await asyncio.wait_for(
+                    asyncio.gather(*(c.positions.get() for c in consumers)), 1.0
+                )
+                for consumer in consumers:
+                    await consumer.aclose()
+        assert len(httpx_mock.get_requests()) == 1
+        for response in responses:
+            assert response.data[0].quantity == 5.0
+            assert response.rate_limit.remaining == 9
+
+    async def test_sync_client_drop_in(self, httpx_mock: HTTPXMock, socket_path: str) -> None:
+        httpx_mock.add_response(
+            url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON, headers=RATE_LIMIT_HEADERS
+        )
+
+        def fetch() -> str:
+            with Trading212Client.via_gateway(socket_path) as client:
+                currency = client.account.get_summary().data.currency
+                assert client.metrics().max_in_flight is None
+                return currency
+
+        async with AsyncTrading212Client("key", "secret") as upstream:
+            async with Gateway(upstream, socket_path, max_age=60.0):
+                currency = await asyncio.wait_for(asyncio.to_thread(fetch), 2.0)
+        assert currency == "GBP"
+
+    async def test_other_requests_are_forwarded(
+        self, httpx_mock: HTTPXMock, socket_path: str
+    ) -> None:
+        httpx_mock.add_response(
+            url=f"{DEMO_URL}/api/v0/equity/orders/1", status_code=404, text="Not found"
+        )
+        async with AsyncTrading212Client("key", "secret") as upstream:
+            async with Gateway(upstream, socket_path):
+                client = await AsyncTrading212Client.via_gateway(socket_path)
+                with pytest.raises(NotFoundError):
+                    await asyncio.wait_for(client.orders.get(1), 1.0)
+                await client.aclose()
+
+    async def test_watch_pushes_snapshots(
+        self, httpx_mock: HTTPXMock, socket_path: str
+    ) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL, json=[POSITION_JSON], headers=RATE_LIMIT_HEADERS
+        )
+        async with AsyncTrading212Client("key", "secret") as upstream:
+            async with Gateway(upstream, socket_path, max_age=60.0):
+                engine = AsyncGatewayEngine(socket_path)
+                await engine.connect()
+                updates = engine.watch(Feed.POSITIONS)
+                response = await asyncio.wait_for(anext(updates), 1.0)
+                await updates.aclose()
+                await engine.aclose()
+        assert response.data[0].quantity == 5.0
+
+    async def test_malformed_messages_get_an_error_reply(self, socket_path: str) -> None:
+        async with AsyncTrading212Client("key", "secret") as upstream:
+            async with Gateway(upstream, socket_path):
+                assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                for line in (b"not json", b"[1, 2]", b'{"id": 7}', b'{"id": 8, "watch": "x"}'):
+                    writer.write(line + b"\n")
+                replies = [json.loads(await reader.readline()) for _ in range(4)]
+                writer.close()
+        assert [r["status"] for r in replies] == [400] * 4
+        assert [r["id"] for r in replies] == [None, None, 7, 8]
+
+
+class _FailingFeed:
+    feed = Feed.POSITIONS
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __anext__(self) -> Any:
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("boom")
+        raise StopAsyncIteration
+
+
+class TestFeedCache:
+    async def test_unexpected_error_releases_waiters(self) -> None:
+        cache = _FeedCache(_FailingFeed())  # type: ignore[arg-type]
+        await asyncio.wait_for(cache.run(), 1.0)
+        assert cache.ready.is_set()
+        assert cache.reply is not None and cache.reply["status"] == 502
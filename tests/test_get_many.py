@@ -0,0 +1,69 @@
+"""Tests for the bulk order lookup planner."""
+import time
+
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, RateLimitInfo, Trading212Client
+
+from .conftest import DEMO_URL, HISTORICAL_ORDER_JSON, ORDER_JSON
+
+ORDERS_URL = f"{DEMO_URL}/api/v0/equity/orders"
+HISTORY_URL = f"{DEMO_URL}/api/v0/equity/history/orders?limit=50"
+
+
+def _order(order_id: int) -> dict[str, object]:
+    return {**ORDER_JSON, "id": order_id}
+
+
+def _historical(order_id: int) -> dict[str, object]:
+    return {**HISTORICAL_ORDER_JSON, "order": _order(order_id)}
+
+
+def _exhaust(client: Trading212Client, key: str) -> None:
+    client._engine.rate_limit_store.set(
+        key, RateLimitInfo(limit=1, period=5, remaining=0, reset=int(time.time()) + 30, used=1)
+    )
+
+
+class TestGetMany:
+    def test_open_orders_come_from_one_list(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=ORDERS_URL, json=[_order(1), _order(2), _order(3)])
+        client = Trading212Client("key", "secret")
+        found = client.orders.get_many([3, 1])
+        assert list(found) == [3, 1]
+        assert len(httpx_mock.get_requests()) == 1
+
+    def test_closed_orders_found_in_history(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=ORDERS_URL, json=[_order(10)])
+        httpx_mock.add_response(
+            url=HISTORY_URL,
+            json={
+                "items": [_historical(9), _historical(7), _historical(5)],
+                "nextPagePath": "/api/v0/equity/history/orders?limit=50&cursor=5",
+            },
+        )
+        client = Trading212Client("key", "secret")
+        found = client.orders.get_many([10, 7, 6])
+        # 6 is older than every order on the first page's tail, so paging stops there.
+        assert sorted(found) == [7, 10]
+        assert len(httpx_mock.get_requests()) == 2
+
+    def test_single_id_uses_get(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=f"{ORDERS_URL}/4", json=_order(4))
+        found = Trading212Client("key", "secret").orders.get_many([4], history=False)
+        assert found[4].id == 4
+
+    def test_exhausted_list_budget_switches_to_gets(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=f"{ORDERS_URL}/1", json=_order(1))
+        httpx_mock.add_response(url=f"{ORDERS_URL}/2", status_code=404, text="Not found")
+        client = Trading212Client("key", "secret")
+        _exhaust(client, "GET /api/v0/equity/orders")
+        found = client.orders.get_many([1, 2], history=False)
+        assert list(found) == [1]
+
+    async def test_async_get_many(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=ORDERS_URL, json=[_order(1)])
+        httpx_mock.add_response(url=HISTORY_URL, json={"items": [_historical(2)]})
+        async with AsyncTrading212Client("key", "secret") as client:
+            found = await client.orders.get_many([1, 2])
+        assert sorted(found) == [1, 2]
@@ -0,0 +1,108 @@
+"""Tests for the merged history ledger."""
+import threading
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, LedgerKind, Trading212Client
+from t212.ledger import amerge_ledger, merge_ledger
+from t212.models.history import HistoricalOrder, HistoryDividendItem, HistoryTransactionItem
+
+from .conftest import DEMO_URL, DIVIDEND_JSON, HISTORICAL_ORDER_JSON, TRANSACTION_JSON
+
+HISTORY = f"{DEMO_URL}/api/v0/equity/history"
+
+
+def _order(filled_at: str | None) -> HistoricalOrder:
+    fill = {**HISTORICAL_ORDER_JSON["fill"], "filledAt": filled_at} if filled_at else None
+    return HistoricalOrder.model_validate({**HISTORICAL_ORDER_JSON, "fill": fill})
+
+
+def _dividend(paid_on: str) -> HistoryDividendItem:
+    return HistoryDividendItem.model_validate({**DIVIDEND_JSON, "paidOn": paid_on})
+
+
+def _transaction(at: str, type: str = "DEPOSIT", amount: float = 500.0) -> HistoryTransactionItem:
+    return HistoryTransactionItem.model_validate(
+        {**TRANSACTION_JSON, "dateTime": at, "type": type, "amount": amount}
+    )
+
+
+ORDERS = [_order("2024-03-01T10:00:00Z"), _order(None), _order("2024-01-10T10:00:00Z")]
+DIVIDENDS = [_dividend("2024-02-15T00:00:00Z")]
+TRANSACTIONS = [
+    _transaction("2024-02-20T00:00:00Z", "WITHDRAW", 100.0),
+    _transaction("2024-01-05T00:00:00Z"),
+]
+
+
+class TestMergeLedger:
+    def test_newest_first_across_sources(self) -> None:
+        entries = list(merge_ledger(ORDERS, DIVIDENDS, TRANSACTIONS, buffer=1))
+        assert [e.kind for e in entries] == [
+            LedgerKind.ORDER,
+            LedgerKind.TRANSACTION,
+            LedgerKind.DIVIDEND,
+            LedgerKind.ORDER,
+            LedgerKind.TRANSACTION,
+        ]
+        assert [e.amount for e in entries] == [-138.65, -100.0, 12.5, -138.65, 500.0]
+        assert entries[2].ticker == "AAPL_US_EQ"
+
+    def test_early_close_stops_readers(self) -> None:
+        many = [_dividend("2024-02-15T00:00:00Z")] * 100
+        ledger = merge_ledger(ORDERS, many, TRANSACTIONS, buffer=2)
+        next(ledger)
+        ledger.close()
+        assert not any(t.name == "t212-ledger" for t in threading.enumerate())
+
+    def test_source_error_propagates(self) -> None:
+        def failing() -> Iterator[HistoryDividendItem]:
+            yield _dividend("2024-02-15T00:00:00Z")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            list(merge_ledger(ORDERS, failing(), TRANSACTIONS))
+
+    async def test_async_matches_sync(self) -> None:
+        async def aiter(items: list[Any]) -> AsyncIterator[Any]:
+            for item in items:
+                yield item
+
+        entries = [
+            e
+            async for e in amerge_ledger(
+                aiter(ORDERS), aiter(DIVIDENDS), aiter(TRANSACTIONS), buffer=1
+            )
+        ]
+        assert entries == list(merge_ledger(ORDERS, DIVIDENDS, TRANSACTIONS))
+
+
+class TestHistoryLedger:
+    def _mock(self, httpx_mock: HTTPXMock) -> None:
+        for path, item in (
+            ("orders", HISTORICAL_ORDER_JSON),
+            ("dividends", DIVIDEND_JSON),
+            ("transactions", TRANSACTION_JSON),
+        ):
+            httpx_mock.add_response(
+                url=f"{HISTORY}/{path}", json={"items": [item], "nextPagePath": None}
+            )
+
+    def test_sync(self, httpx_mock: HTTPXMock) -> None:
+        self._mock(httpx_mock)
+        with Trading212Client("key", "secret") as client:
+            entries = list(client.history.iter_ledger())
+        assert [e.kind for e in entries] == [
+            LedgerKind.ORDER,
+            LedgerKind.DIVIDEND,
+            LedgerKind.TRANSACTION,
+        ]
+
+    async def test_async(self, httpx_mock: HTTPXMock) -> None:
+        self._mock(httpx_mock)
+        async with AsyncTrading212Client("key", "secret") as client:
+            entries = [e async for e in client.history.iter_ledger()]
+        assert sum(e.amount for e in entries) == pytest.approx(-138.65 + 12.5 + 500.0)
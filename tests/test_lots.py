@@ -0,0 +1,92 @@
+"""Tests for tax-lot accounting over fill history."""
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212.analytics import CostMethod, FillTable, LotEngine, compute_lots  # noqa: E402
+from t212.models.history import HistoricalOrder  # noqa: E402
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _fill(
+    day: int, quantity: float, price: float, ticker: str = "AAPL_US_EQ", **fill: Any
+) -> HistoricalOrder:
+    return HistoricalOrder.model_validate(
+        {
+            "order": {"id": day, "ticker": ticker, "side": "BUY" if quantity > 0 else "SELL"},
+            "fill": {
+                "filledAt": (START + timedelta(days=day)).isoformat(),
+                "quantity": quantity,
+                "price": price,
+                "type": "TRADE",
+                **fill,
+            },
+        }
+    )
+
+
+HISTORY = [_fill(0, 10, 100.0), _fill(1, 10, 120.0), _fill(2, -15, 130.0)]
+
+
+class TestFillTable:
+    def test_columns(self) -> None:
+        table = FillTable.from_history([*HISTORY, HistoricalOrder()])
+        assert len(table) == 3
+        assert table.quantity.tolist() == [10, 10, -15]
+        assert table.filled_at[0] == np.datetime64("2024-01-01T00:00:00", "us")
+
+
+class TestLots:
+    def test_fifo(self) -> None:
+        report = compute_lots(HISTORY, CostMethod.FIFO)
+        assert report.position() == {"AAPL_US_EQ": 5}
+        assert report.average_cost() == {"AAPL_US_EQ": 120.0}
+        # 10 @ 100 and 5 @ 120 sold at 130
+        assert report.realized_pnl()["AAPL_US_EQ"] == pytest.approx(300 + 50)
+        assert report.realized.quantity.tolist() == [10, 5]
+
+    def test_lifo(self) -> None:
+        report = compute_lots(HISTORY, CostMethod.LIFO)
+        assert report.average_cost() == {"AAPL_US_EQ": 100.0}
+        assert report.realized_pnl()["AAPL_US_EQ"] == pytest.approx(100 + 150)
+
+    def test_average_cost(self) -> None:
+        report = compute_lots(HISTORY, CostMethod.AVERAGE)
+        assert report.average_cost()["AAPL_US_EQ"] == pytest.approx(110.0)
+        assert report.realized_pnl()["AAPL_US_EQ"] == pytest.approx(15 * 20)
+
+    def test_split_keeps_cost(self) -> None:
+        history = [
+            _fill(0, 10, 100.0),
+            _fill(1, 10, 0.0, type="STOCK_SPLIT"),  # 2-for-1
+            _fill(2, -5, 60.0),
+        ]
+        report = compute_lots(history)
+        assert report.position() == {"AAPL_US_EQ": 15}
+        assert report.average_cost() == {"AAPL_US_EQ": 50.0}
+        assert report.realized_pnl()["AAPL_US_EQ"] == pytest.approx(5 * 10)
+
+    def test_sell_without_history_has_zero_basis(self) -> None:
+        report = compute_lots([_fill(0, -2, 10.0)])
+        assert report.realized.cost.tolist() == [0.0]
+        assert np.isnat(report.realized.opened_at[0])
+
+    def test_incremental_matches_batch(self) -> None:
+        msft = [_fill(3, 4, 90.0, "MSFT_US_EQ"), _fill(4, -1, 95.0, "MSFT_US_EQ")]
+        history = [*HISTORY, *msft]
+        engine = LotEngine()
+        engine.update(history[:2])
+        realized = engine.update(history[2:])
+        assert len(realized.quantity) == 3
+        assert engine.report().realized_pnl() == compute_lots(history).realized_pnl()
+        with pytest.raises(ValueError, match="older"):
+            engine.update(history[:1])
+
+    def test_parallel_workers(self) -> None:
+        history = [_fill(d, 1 if d % 2 == 0 else -1, 10.0 + d, t) for d in range(6) for t in "ABC"]
+        parallel = compute_lots(history, workers=2)
+        assert parallel.realized_pnl() == compute_lots(history).realized_pnl()
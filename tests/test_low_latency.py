@@ -0,0 +1,104 @@
+"""Tests for the low-latency order path: cached serializers, submit and warm connections."""
+import json
+import time
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, Trading212Client
+from t212._serialize import encode
+from t212.models.enums import TimeValidity
+from t212.models.orders import (
+    LimitOrderRequest,
+    MarketOrderRequest,
+    StopLimitOrderRequest,
+    StopOrderRequest,
+)
+
+from .conftest import DEMO_URL, ORDER_JSON, RATE_LIMIT_HEADERS
+
+ORDERS_URL = f"{DEMO_URL}/api/v0/equity/orders"
+
+REQUESTS = [
+    (MarketOrderRequest(ticker="AAPL_US_EQ", quantity=1.0), "market"),
+    (LimitOrderRequest(ticker="AAPL_US_EQ", quantity=1.0, limit_price=150.0), "limit"),
+    (
+        StopOrderRequest(
+            ticker="AAPL_US_EQ",
+            quantity=-1.0,
+            stop_price=140.0,
+            time_validity=TimeValidity.GOOD_TILL_CANCEL,
+        ),
+        "stop",
+    ),
+    (
+        StopLimitOrderRequest(
+            ticker="AAPL_US_EQ", quantity=1.0, limit_price=151.0, stop_price=150.0
+        ),
+        "stop_limit",
+    ),
+]
+
+
+class TestEncode:
+    @pytest.mark.parametrize("request_model", [r for r, _ in REQUESTS])
+    def test_matches_model_dump(self, request_model: MarketOrderRequest) -> None:
+        expected = request_model.model_dump(mode="json", by_alias=True, exclude_none=True)
+        assert json.loads(encode(request_model)) == expected
+
+
+class TestSubmit:
+    @pytest.mark.parametrize(("request_model", "path"), REQUESTS)
+    def test_routes_by_request_type(
+        self, httpx_mock: HTTPXMock, request_model: MarketOrderRequest, path: str
+    ) -> None:
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{ORDERS_URL}/{path}",
+            match_json=request_model.model_dump(mode="json", by_alias=True),
+            json=ORDER_JSON,
+            headers=RATE_LIMIT_HEADERS,
+        )
+        result = Trading212Client("key", "secret").orders.submit(request_model)
+        assert result.data.id == ORDER_JSON["id"]
+        assert result.rate_limit.remaining == 9
+        request = httpx_mock.get_requests()[0]
+        assert request.headers["content-type"] == "application/json"
+
+    async def test_async_submit(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=f"{ORDERS_URL}/market", json=ORDER_JSON, headers=RATE_LIMIT_HEADERS
+        )
+        async with AsyncTrading212Client("key", "secret") as client:
+            result = await client.orders.submit(MarketOrderRequest(ticker="X", quantity=1))
+        assert result.data.ticker == "AAPL_US_EQ"
+
+
+class TestWarmConnections:
+    def test_warm_opens_connection_with_head(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(method="HEAD", url=f"{DEMO_URL}/")
+        Trading212Client("key", "secret").warm()
+        assert httpx_mock.get_requests()[0].method == "HEAD"
+
+    def test_close_waits_for_keepalive_warm(self, httpx_mock: HTTPXMock) -> None:
+        def slow_head(request: httpx.Request) -> httpx.Response:
+            time.sleep(0.05)
+            return httpx.Response(200)
+
+        httpx_mock.add_callback(slow_head, method="HEAD", url=f"{DEMO_URL}/")
+        client = Trading212Client("key", "secret", low_latency=True)
+        thread = client._engine._keepalive_thread
+        client.close()
+        assert thread is not None and not thread.is_alive()
+        assert httpx_mock.get_requests()[0].method == "HEAD"
+
+    async def test_low_latency_mode_keeps_pool_alive(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(method="HEAD", url=f"{DEMO_URL}/")
+        async with AsyncTrading212Client("key", "secret", low_latency=True) as client:
+            limits = client._engine._client_kwargs["limits"]
+            assert limits.keepalive_expiry == 60.0
+            await client.warm()
+            task = client._engine._keepalive_task
+            assert task is not None and not task.done()
+        assert task.cancelled()
@@ -0,0 +1,141 @@
+"""Tests for cash, NAV and return reconstruction."""
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212.analytics import PerformanceEngine, compute_performance  # noqa: E402
+from t212.ledger import LedgerEntry, merge_ledger  # noqa: E402
+from t212.models.history import (  # noqa: E402
+    HistoricalOrder,
+    HistoryDividendItem,
+    HistoryTransactionItem,
+)
+
+from .conftest import DIVIDEND_JSON, HISTORICAL_ORDER_JSON, TRANSACTION_JSON  # noqa: E402
+
+
+def _buy(at: str, quantity: float, value: float) -> HistoricalOrder:
+    raw = HISTORICAL_ORDER_JSON
+    return HistoricalOrder.model_validate(
+        {
+            "order": raw["order"],
+            "fill": {
+                **raw["fill"],
+                "filledAt": at,
+                "quantity": quantity,
+                "walletImpact": {**raw["fill"]["walletImpact"], "netValue": -value},
+            },
+        }
+    )
+
+
+def _dividend(at: str, amount: float) -> HistoryDividendItem:
+    return HistoryDividendItem.model_validate({**DIVIDEND_JSON, "paidOn": at, "amount": amount})
+
+
+def _transaction(at: str, type: str, amount: float) -> HistoryTransactionItem:
+    return HistoryTransactionItem.model_validate(
+        {**TRANSACTION_JSON, "dateTime": at, "type": type, "amount": amount}
+    )
+
+
+def _ledger(
+    orders: list[HistoricalOrder],
+    dividends: list[HistoryDividendItem],
+    transactions: list[HistoryTransactionItem],
+) -> list[LedgerEntry]:
+    return list(merge_ledger(orders, dividends, transactions))
+
+
+ORDERS = [_buy("2024-01-02T15:00:00Z", 10.0, 500.0)]
+DIVIDENDS = [_dividend("2024-01-03T00:00:00Z", 10.0)]
+TRANSACTIONS = [
+    _transaction("2024-01-04T09:00:00Z", "WITHDRAW", 100.0),
+    _transaction("2024-01-01T09:00:00Z", "DEPOSIT", 1000.0),
+]
+LEDGER = _ledger(ORDERS, DIVIDENDS, TRANSACTIONS)
+
+
+class TestDailySeries:
+    def test_cash_and_nav_at_cost(self) -> None:
+        series = compute_performance(LEDGER)
+        assert series.date[0] == np.datetime64("2024-01-01")
+        np.testing.assert_allclose(series.cash, [1000, 500, 510, 410])
+        np.testing.assert_allclose(series.invested, [0, 500, 500, 500])
+        np.testing.assert_allclose(series.flows, [1000, 0, 0, -100])
+        np.testing.assert_allclose(series.income, [0, 0, 10, 0])
+        np.testing.assert_allclose(series.quantity["AAPL_US_EQ"], [0, 10, 10, 10])
+        assert series.twr() == pytest.approx(0.01)
+
+    def test_valued_at_market(self) -> None:
+        series = compute_performance(LEDGER).valued({"AAPL_US_EQ": [np.nan, 50, 55, np.nan]})
+        np.testing.assert_allclose(series.nav, [1000, 1000, 1060, 960])
+        np.testing.assert_allclose(series.twr_curve()[:3], [0, 0, 0.06])
+        assert series.twr() == pytest.approx(0.06)
+
+    def test_realized_profit_stays_in_nav_after_reentry(self) -> None:
+        ledger = _ledger(
+            [
+                _buy("2024-01-02T15:00:00Z", 10.0, 1000.0),
+                _buy("2024-01-03T15:00:00Z", -10.0, -1200.0),
+                _buy("2024-01-04T15:00:00Z", 10.0, 1000.0),
+                _buy("2024-01-05T15:00:00Z", -5.0, -500.0),
+            ],
+            [],
+            [_transaction("2024-01-01T09:00:00Z", "DEPOSIT", 1000.0)],
+        )
+        series = compute_performance(ledger)
+        np.testing.assert_allclose(series.cash, [1000, 0, 1200, 200, 700])
+        np.testing.assert_allclose(series.cost["AAPL_US_EQ"], [0, 1000, 0, 1000, 500])
+        np.testing.assert_allclose(series.nav, [1000, 1000, 1200, 1200, 1200])
+        assert series.twr() == pytest.approx(0.2)
+
+    def test_money_weighted_return(self) -> None:
+        ledger = _ledger(
+            [],
+            [_dividend("2023-06-01T00:00:00Z", 100.0)],
+            [_transaction("2023-01-01T00:00:00Z", "DEPOSIT", 1000.0)],
+        )
+        series = compute_performance(ledger, until=date(2023, 12, 31))
+        assert len(series) == 365
+        assert series.mwr() == pytest.approx(0.10)
+
+
+class TestPerformanceEngine:
+    def test_incremental_matches_full(self) -> None:
+        engine = PerformanceEngine()
+        first = engine.extend([e for e in LEDGER if e.at and e.at.day <= 2])
+        engine.extend([e for e in LEDGER if e.at and e.at.day > 2], until=date(2024, 1, 6))
+        assert len(first) == 2
+        assert engine.last_day == date(2024, 1, 6)
+        full = compute_performance(LEDGER, until=date(2024, 1, 6))
+        series = engine.series()
+        np.testing.assert_allclose(series.nav, full.nav)
+        np.testing.assert_allclose(series.quantity["AAPL_US_EQ"], full.quantity["AAPL_US_EQ"])
+        assert series.twr() == pytest.approx(full.twr())
+
+    def test_cost_basis_carries_across_batches(self) -> None:
+        buys = [
+            _buy("2024-01-02T15:00:00Z", 10.0, 1000.0),
+            _buy("2024-01-03T15:00:00Z", 10.0, 1400.0),
+        ]
+        engine = PerformanceEngine(opening_cash=3000.0)
+        engine.extend(_ledger(buys, [], []))
+        days = engine.extend(_ledger([_buy("2024-01-04T15:00:00Z", -5.0, -700.0)], [], []))
+        np.testing.assert_allclose(days.cost["AAPL_US_EQ"], [1800])
+        np.testing.assert_allclose(days.nav, [3100])
+
+    def test_rejects_processed_days(self) -> None:
+        engine = PerformanceEngine()
+        engine.extend(LEDGER)
+        with pytest.raises(ValueError, match="already processed"):
+            engine.extend(LEDGER[:1])
+
+    def test_quiet_days_carry_balances(self) -> None:
+        engine = PerformanceEngine(opening_cash=50.0)
+        engine.extend([], until=date(2024, 1, 1))
+        days = engine.extend([], until=date(2024, 1, 3))
+        np.testing.assert_allclose(days.cash, [50, 50])
+        assert days.opening == 50.0
@@ -0,0 +1,105 @@
+"""Tests for local pre-flight order checks."""
+from datetime import UTC, datetime
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import (
+    AsyncTrading212Client,
+    InstrumentCatalog,
+    OrderStore,
+    Preflight,
+    PreflightError,
+    SimulatedExchange,
+    Trading212Client,
+    ValidationError,
+)
+from t212.models.instruments import Exchange, TradableInstrument
+from t212.models.orders import LimitOrderRequest, MarketOrderRequest, Order
+
+from .conftest import DEMO_URL, EXCHANGE_JSON, INSTRUMENT_JSON, ORDER_JSON
+
+METADATA_URL = f"{DEMO_URL}/api/v0/equity/metadata"
+OPEN = datetime(2024, 1, 15, 15, 0, tzinfo=UTC)
+CLOSED = datetime(2024, 1, 15, 22, 0, tzinfo=UTC)
+
+
+def _catalog(**instrument: object) -> InstrumentCatalog:
+    return InstrumentCatalog(
+        [TradableInstrument.model_validate({**INSTRUMENT_JSON, **instrument})],
+        [Exchange.model_validate(EXCHANGE_JSON)],
+    )
+
+
+class TestPreflight:
+    def test_valid_order_passes(self) -> None:
+        Preflight(_catalog()).check(MarketOrderRequest(ticker="AAPL_US_EQ", quantity=5), OPEN)
+
+    def test_unknown_ticker(self) -> None:
+        with pytest.raises(PreflightError, match="Unknown ticker"):
+            Preflight(_catalog()).check(MarketOrderRequest(ticker="NOPE", quantity=1), OPEN)
+
+    def test_max_open_quantity_applies_to_sells(self) -> None:
+        with pytest.raises(PreflightError, match="max open quantity"):
+            Preflight(_catalog()).check(
+                MarketOrderRequest(ticker="AAPL_US_EQ", quantity=-20000), OPEN
+            )
+
+    def test_extended_hours_must_be_supported(self) -> None:
+        request = MarketOrderRequest(ticker="AAPL_US_EQ", quantity=1, extended_hours=True)
+        with pytest.raises(PreflightError, match="extended hours"):
+            Preflight(_catalog(extendedHours=False)).check(request, OPEN)
+
+    def test_market_order_outside_session(self) -> None:
+        preflight = Preflight(_catalog())
+        with pytest.raises(PreflightError, match="closed"):
+            preflight.check(MarketOrderRequest(ticker="AAPL_US_EQ", quantity=1), CLOSED)
+        # Limit orders may rest while the market is closed.
+        preflight.check(LimitOrderRequest(ticker="AAPL_US_EQ", quantity=1, limit_price=1), CLOSED)
+
+    def test_unknown_schedule_is_not_checked(self) -> None:
+        request = MarketOrderRequest(ticker="AAPL_US_EQ", quantity=1)
+        Preflight(_catalog(workingScheduleId=99)).check(request, CLOSED)
+
+    def test_pending_order_limit(self) -> None:
+        store = OrderStore()
+        for order_id in range(50):
+            store.apply(Order.model_validate({**ORDER_JSON, "id": order_id}))
+        preflight = Preflight(_catalog(), store)
+        with pytest.raises(PreflightError, match="50 pending"):
+            preflight.check(MarketOrderRequest(ticker="AAPL_US_EQ", quantity=1), OPEN)
+
+    def test_is_a_validation_error(self) -> None:
+        assert issubclass(PreflightError, ValidationError)
+
+
+class TestOrdersIntegration:
+    def test_rejected_order_is_not_sent(self, httpx_mock: HTTPXMock) -> None:
+        client = Trading212Client("key", "secret")
+        client.orders.preflight = Preflight(_catalog(), client.orders.store)
+        with pytest.raises(PreflightError):
+            client.orders.place_market(MarketOrderRequest(ticker="NOPE", quantity=1))
+        assert httpx_mock.get_requests() == []
+
+    def test_filled_orders_free_the_pending_limit_after_list(self) -> None:
+        exchange = SimulatedExchange()
+        client = Trading212Client("key", "secret", transport=exchange)
+        client.orders.preflight = Preflight(_catalog(), client.orders.store)
+        request = LimitOrderRequest(ticker="AAPL_US_EQ", quantity=1, limit_price=100.0)
+        for _ in range(50):
+            exchange.fill(client.orders.place_limit(request).data.id, price=100.0)
+        with pytest.raises(PreflightError, match="50 pending"):
+            client.orders.place_limit(request)
+        assert client.orders.list().data == []
+        assert client.orders.place_limit(request).data.id in exchange.orders
+
+    async def test_load_preflight(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=f"{METADATA_URL}/instruments", json=[INSTRUMENT_JSON])
+        httpx_mock.add_response(url=f"{METADATA_URL}/exchanges", json=[EXCHANGE_JSON])
+        async with AsyncTrading212Client("key", "secret") as client:
+            preflight = await client.orders.load_preflight()
+            assert client.orders.preflight is preflight
+            assert preflight.store is client.orders.store
+            assert "AAPL_US_EQ" in preflight.catalog.instruments
+            with pytest.raises(PreflightError):
+                await client.orders.submit(MarketOrderRequest(ticker="NOPE", quantity=1))
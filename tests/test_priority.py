@@ -0,0 +1,100 @@
+"""Tests for request priority classes and the admission gates."""
+import asyncio
+import threading
+
+from t212 import Priority, Trading212Client
+from t212._priority import _AsyncPriorityGate, _PriorityGate, classify, request_priority
+
+
+class TestClassify:
+    def test_order_writes_are_critical(self) -> None:
+        assert classify("POST /api/v0/equity/orders/limit") is Priority.CRITICAL
+        assert classify("DELETE /api/v0/equity/orders/{id}") is Priority.CRITICAL
+
+    def test_history_and_metadata_are_bulk(self) -> None:
+        assert classify("GET /api/v0/equity/history/orders") is Priority.BULK
+        assert classify("POST /api/v0/equity/history/exports") is Priority.BULK
+        assert classify("GET /api/v0/equity/metadata/instruments") is Priority.BULK
+
+    def test_everything_else_is_normal(self) -> None:
+        assert classify("GET /api/v0/equity/positions") is Priority.NORMAL
+        assert classify("GET /api/v0/equity/orders/{id}") is Priority.NORMAL
+
+    def test_prioritized_overrides_classification(self) -> None:
+        client = Trading212Client("key", "secret")
+        with client.prioritized(Priority.BULK):
+            assert request_priority("GET /api/v0/equity/positions") is Priority.BULK
+        assert request_priority("GET /api/v0/equity/positions") is Priority.NORMAL
+
+
+class TestAsyncPriorityGate:
+    async def test_critical_preempts_queued_bulk(self) -> None:
+        gate = _AsyncPriorityGate(max_in_flight=1)
+        started: list[str] = []
+
+        async def request(priority: Priority, name: str) -> None:
+            async with gate.slot(priority):
+                started.append(name)
+                await asyncio.sleep(0)
+
+        async with gate.slot(Priority.NORMAL):
+            bulk = asyncio.create_task(request(Priority.BULK, "bulk"))
+            await asyncio.sleep(0)
+            critical = asyncio.create_task(request(Priority.CRITICAL, "critical"))
+            await asyncio.sleep(0)
+            assert started == []
+        await asyncio.gather(bulk, critical)
+        assert started == ["critical", "bulk"]
+
+    async def test_reservation_pauses_bulk_only(self) -> None:
+        gate = _AsyncPriorityGate()
+        started: list[Priority] = []
+
+        async def request(priority: Priority) -> None:
+            async with gate.slot(priority):
+                started.append(priority)
+
+        async with gate.reserve(2):
+            tasks = [asyncio.create_task(request(p)) for p in Priority]
+            await asyncio.sleep(0.01)
+            assert started == [Priority.CRITICAL, Priority.NORMAL]
+        await asyncio.gather(*tasks)
+        assert started[-1] is Priority.BULK
+
+    async def test_reserved_slots_are_kept_for_critical(self) -> None:
+        gate = _AsyncPriorityGate(max_in_flight=2)
+        async with gate.reserve(1), gate.slot(Priority.NORMAL):
+            assert not gate._can_start(Priority.NORMAL)
+            assert gate._can_start(Priority.CRITICAL)
+
+
+class TestPriorityGate:
+    def test_waiters_admitted_by_priority(self) -> None:
+        gate = _PriorityGate(max_in_flight=1)
+        started: list[str] = []
+        release = threading.Event()
+
+        def request(priority: Priority, name: str) -> None:
+            with gate.slot(priority):
+                started.append(name)
+
+        def hold() -> None:
+            with gate.slot(Priority.NORMAL):
+                release.wait(1.0)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        while gate.in_flight == 0:
+            pass
+        bulk = threading.Thread(target=request, args=(Priority.BULK, "bulk"))
+        bulk.start()
+        while gate.waiting[Priority.BULK] == 0:
+            pass
+        critical = threading.Thread(target=request, args=(Priority.CRITICAL, "critical"))
+        critical.start()
+        while gate.waiting[Priority.CRITICAL] == 0:
+            pass
+        release.set()
+        for thread in (holder, bulk, critical):
+            thread.join(1.0)
+        assert started == ["critical", "bulk"]
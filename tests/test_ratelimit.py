@@ -0,0 +1,125 @@
+"""Tests for endpoint rate-limit bookkeeping and the shared stores."""
+import time
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import (
+    FileRateLimitStore,
+    MemoryRateLimitStore,
+    RateLimitInfo,
+    RateLimitStore,
+    RedisRateLimitStore,
+    Trading212Client,
+)
+from t212._ratelimit import _claim, endpoint_key
+
+from .conftest import ACCOUNT_SUMMARY_JSON, DEMO_URL, RATE_LIMIT_HEADERS
+
+SUMMARY_KEY = "GET /api/v0/equity/account/summary"
+SUMMARY_URL = f"{DEMO_URL}/api/v0/equity/account/summary"
+
+
+def _info(remaining: int, reset: int | None = None) -> RateLimitInfo:
+    return RateLimitInfo(
+        limit=10, period=60, remaining=remaining, reset=reset, used=10 - remaining
+    )
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+
+    def get(self, name: str) -> Any:
+        return self.data.get(name)
+
+    def set(self, name: str, value: Any, ex: int | None = None) -> None:
+        self.data[name] = value
+
+
+class TestEndpointKey:
+    def test_ids_are_normalised(self) -> None:
+        key = endpoint_key("get", "/api/v0/equity/orders/123")
+        assert key == "GET /api/v0/equity/orders/{id}"
+        assert (
+            endpoint_key("POST", "/api/v0/equity/pies/9/duplicate")
+            == "POST /api/v0/equity/pies/{id}/duplicate"
+        )
+
+    def test_query_is_dropped(self) -> None:
+        key = endpoint_key("GET", "/api/v0/equity/history/orders?limit=1&cursor=999")
+        assert key == "GET /api/v0/equity/history/orders"
+
+
+class TestClaim:
+    def test_claim_decrements_remaining(self) -> None:
+        info, delay = _claim(_info(3, reset=2_000), now=1_000)
+        assert delay == 0.0
+        assert info is not None
+        assert info.remaining == 2
+        assert info.used == 8
+
+    def test_exhausted_window_waits_for_reset(self) -> None:
+        _, delay = _claim(_info(0, reset=1_030), now=1_000)
+        assert delay == 30
+
+    def test_expired_window_is_dropped(self) -> None:
+        assert _claim(_info(0, reset=999), now=1_000) == (None, 0.0)
+
+
+class TestStores:
+    def test_store_must_implement_get_and_set(self) -> None:
+        class _GetOnly(RateLimitStore):
+            def get(self, key: str) -> RateLimitInfo | None:
+                return None
+
+        with pytest.raises(TypeError):
+            _GetOnly()  # type: ignore[abstract]
+
+    def test_file_store_is_shared_and_persistent(self, tmp_path: Any) -> None:
+        path = tmp_path / "ratelimits.json"
+        FileRateLimitStore(path).set(SUMMARY_KEY, _info(1, reset=2_000))
+        other = FileRateLimitStore(path)
+        assert other.consume(SUMMARY_KEY, now=1_000) == 0.0
+        assert FileRateLimitStore(path).consume(SUMMARY_KEY, now=1_000) == 1_000
+
+    def test_redis_store_round_trip(self) -> None:
+        store = RedisRateLimitStore(_FakeRedis())
+        store.set(SUMMARY_KEY, _info(5, reset=int(time.time()) + 30))
+        assert store.consume(SUMMARY_KEY, now=time.time()) == 0.0
+        info = store.get(SUMMARY_KEY)
+        assert info is not None
+        assert info.remaining == 4
+
+
+class TestEngineBudget:
+    def test_responses_are_recorded(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON, headers=RATE_LIMIT_HEADERS
+        )
+        store = MemoryRateLimitStore()
+        client = Trading212Client("key", "secret", rate_limit_store=store)
+        client.account.get_summary()
+        assert store.get(SUMMARY_KEY) == _info(9, reset=1700000000)
+
+    def test_exhausted_budget_sleeps_until_reset(
+        self, httpx_mock: HTTPXMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        httpx_mock.add_response(url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON)
+        slept: list[float] = []
+        monkeypatch.setattr("t212._base.time.sleep", slept.append)
+        store = MemoryRateLimitStore()
+        store.set(SUMMARY_KEY, _info(0, reset=int(time.time()) + 5))
+        client = Trading212Client("key", "secret", rate_limit_store=store)
+        client.account.get_summary()
+        assert len(slept) == 1
+        assert 0 < slept[0] <= 5
+
+    def test_client_rebuilt_after_fork(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON)
+        client = Trading212Client("key", "secret")
+        parent_client = client._engine._client
+        client._engine._pid = -1  # as seen from a forked child
+        client.account.get_summary()
+        assert client._engine._client is not parent_client
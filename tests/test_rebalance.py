@@ -0,0 +1,114 @@
+"""Tests for the target-weight rebalancer."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from t212 import InstrumentCatalog  # noqa: E402
+from t212.analytics import Rebalancer  # noqa: E402
+from t212.models.account import Cash  # noqa: E402
+from t212.models.instruments import TradableInstrument  # noqa: E402
+from t212.models.orders import LimitOrderRequest, MarketOrderRequest, Order  # noqa: E402
+from t212.models.positions import Position  # noqa: E402
+
+from .conftest import INSTRUMENT_JSON, ORDER_JSON, POSITION_JSON  # noqa: E402
+
+
+def _position(ticker: str, quantity: float, price: float, value: float) -> Position:
+    return Position.model_validate(
+        {
+            **POSITION_JSON,
+            "instrument": {**POSITION_JSON["instrument"], "ticker": ticker},
+            "quantity": quantity,
+            "quantityAvailableForTrading": quantity,
+            "currentPrice": price,
+            "walletImpact": {**POSITION_JSON["walletImpact"], "currentValue": value},
+        }
+    )
+
+
+def _order(ticker: str, quantity: float, side: str = "BUY") -> Order:
+    return Order.model_validate(
+        {**ORDER_JSON, "ticker": ticker, "quantity": quantity, "side": side}
+    )
+
+
+# USD instruments in a GBP account at 0.8 GBP per USD.
+POSITIONS = [
+    _position("AAPL_US_EQ", 10.0, 100.0, 800.0),
+    _position("MSFT_US_EQ", 5.0, 200.0, 800.0),
+]
+CASH = Cash(available_to_trade=400.0, reserved_for_orders=0.0)
+
+
+class TestRebalancer:
+    def test_sells_before_buys(self) -> None:
+        plan = Rebalancer().plan(
+            {"AAPL_US_EQ": 0.25, "MSFT_US_EQ": 0.25, "VOD_L_EQ": 0.5},
+            POSITIONS,
+            CASH,
+            prices={"VOD_L_EQ": 1.0},
+        )
+        assert plan.nav == 2000.0
+        trades = dict(zip(plan.ticker.tolist(), plan.trade.tolist(), strict=True))
+        expected = {"AAPL_US_EQ": -3.75, "MSFT_US_EQ": -1.875, "VOD_L_EQ": 1000.0}
+        assert trades == pytest.approx(expected)
+        assert [o.ticker for o in plan.orders] == ["AAPL_US_EQ", "MSFT_US_EQ", "VOD_L_EQ"]
+        assert all(isinstance(o, MarketOrderRequest) for o in plan.orders)
+        assert plan.orders[0].quantity == pytest.approx(-3.75)
+        assert plan.cash == pytest.approx(0.0)
+        assert plan.weights_after()["VOD_L_EQ"] == pytest.approx(0.5)
+
+    def test_whole_shares_and_limits(self) -> None:
+        catalog = InstrumentCatalog(
+            [TradableInstrument.model_validate({**INSTRUMENT_JSON, "maxOpenQuantity": 12.0})],
+            [],
+        )
+        plan = Rebalancer(catalog, step=1.0, limit_offset=0.01).plan(
+            {"AAPL_US_EQ": 0.7, "MSFT_US_EQ": 0.3}, POSITIONS, CASH
+        )
+        trades = dict(zip(plan.ticker.tolist(), plan.trade.tolist(), strict=True))
+        # AAPL wants 17.5 shares but is capped at 12; MSFT 3.75 → sell 1 whole share.
+        assert trades == {"AAPL_US_EQ": 2.0, "MSFT_US_EQ": -1.0}
+        sell, buy = plan.orders
+        assert isinstance(sell, LimitOrderRequest) and sell.limit_price == 198.0
+        assert isinstance(buy, LimitOrderRequest) and buy.limit_price == 101.0
+
+    def test_nets_open_orders(self) -> None:
+        open_orders = [_order("AAPL_US_EQ", 2.0), _order("MSFT_US_EQ", -5.0, "SELL")]
+        plan = Rebalancer().plan(
+            {"AAPL_US_EQ": 1.0}, POSITIONS, Cash(available_to_trade=0.0), open_orders
+        )
+        current = dict(zip(plan.ticker.tolist(), plan.current.tolist(), strict=True))
+        assert current == {"AAPL_US_EQ": 12.0, "MSFT_US_EQ": 0.0}
+        # The pending MSFT sale pays for the pending AAPL buy and 8 more shares.
+        (buy,) = plan.orders
+        assert buy.quantity == pytest.approx(8.0)
+        assert plan.cash == pytest.approx(0.0)
+
+    def test_cancelling_orders_still_count(self) -> None:
+        cancelling = Order.model_validate(
+            {**ORDER_JSON, "ticker": "AAPL_US_EQ", "quantity": 2.0, "status": "CANCELLING"}
+        )
+        plan = Rebalancer().plan({"AAPL_US_EQ": 0.5}, POSITIONS, CASH, [cancelling])
+        current = dict(zip(plan.ticker.tolist(), plan.current.tolist(), strict=True))
+        assert current["AAPL_US_EQ"] == 12.0
+
+    def test_scales_buys_to_cash(self) -> None:
+        locked = POSITIONS[1].model_copy(update={"quantity_available_for_trading": 2.0})
+        plan = Rebalancer().plan(
+            {"AAPL_US_EQ": 1.0}, [POSITIONS[0], locked], Cash(available_to_trade=0.0)
+        )
+        sell, buy = plan.orders
+        # Only 2 MSFT shares can be sold; their 320 buys 4 AAPL, not the 10 wanted.
+        assert (sell.quantity, buy.quantity) == (-2.0, pytest.approx(4.0))
+        assert plan.cash == pytest.approx(0.0)
+
+    def test_min_value_drops_small_trades(self) -> None:
+        plan = Rebalancer(min_value=50.0).plan(
+            {"AAPL_US_EQ": 0.42, "MSFT_US_EQ": 0.3}, POSITIONS, CASH
+        )
+        assert [o.ticker for o in plan.orders] == ["MSFT_US_EQ"]
+
+    def test_missing_price(self) -> None:
+        with pytest.raises(ValueError, match="VOD_L_EQ"):
+            Rebalancer().plan({"VOD_L_EQ": 0.1}, POSITIONS, CASH)
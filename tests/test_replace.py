@@ -0,0 +1,100 @@
+"""Tests for cancel-and-replace with a minimal gap."""
+import json
+from typing import Any
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, SimulatedExchange, Trading212Client
+from t212.models.enums import OrderStatus
+from t212.models.orders import LimitOrderRequest
+
+from .conftest import DEMO_URL, HISTORICAL_ORDER_JSON, ORDER_JSON
+
+TICKER = "AAPL_US_EQ"
+ORDERS_URL = f"{DEMO_URL}/api/v0/equity/orders"
+ORDER_ID = ORDER_JSON["id"]
+
+
+def _limit(price: float, quantity: float = 1) -> LimitOrderRequest:
+    return LimitOrderRequest(ticker=TICKER, quantity=quantity, limit_price=price)
+
+
+def _gone(httpx_mock: HTTPXMock, **order: Any) -> None:
+    """The order is no longer pending; history holds its final state."""
+    httpx_mock.add_response(method="DELETE", url=f"{ORDERS_URL}/{ORDER_ID}")
+    httpx_mock.add_response(method="GET", url=f"{ORDERS_URL}/{ORDER_ID}", status_code=404)
+    item = {**HISTORICAL_ORDER_JSON, "order": {**ORDER_JSON, **order}}
+    httpx_mock.add_response(
+        url=f"{DEMO_URL}/api/v0/equity/history/orders?limit=50",
+        json={"items": [item], "nextPagePath": None},
+    )
+
+
+class TestReplace:
+    def test_replaces_resting_order(self) -> None:
+        exchange = SimulatedExchange()
+        client = Trading212Client("key", "secret", transport=exchange)
+        old = client.orders.place_limit(_limit(100.0)).data
+        result = client.orders.replace(old.id, _limit(101.0))
+        assert result.previous is not None and result.previous.status == OrderStatus.CANCELLED
+        assert result.order is not None and result.order.limit_price == 101.0
+        assert exchange.orders[result.order.id].status == OrderStatus.NEW
+        assert 0 <= result.cancel_confirmed <= result.gap
+
+    def test_filled_order_is_not_replaced(self) -> None:
+        exchange = SimulatedExchange()
+        client = Trading212Client("key", "secret", transport=exchange)
+        old = client.orders.place_limit(_limit(100.0)).data
+        exchange.fill(old.id, price=100.0)
+        result = client.orders.replace(old.id, _limit(101.0))
+        assert result.order is None
+        assert result.previous is not None and result.previous.status == OrderStatus.FILLED
+        assert len(exchange.orders) == 1
+
+    def test_partly_filled_order_is_replaced_with_the_rest(self) -> None:
+        exchange = SimulatedExchange()
+        client = Trading212Client("key", "secret", transport=exchange)
+        old = client.orders.place_limit(_limit(100.0, quantity=10)).data
+        exchange.fill(old.id, quantity=4, price=100.0)
+        result = client.orders.replace(old.id, _limit(101.0, quantity=10))
+        assert result.previous is not None and result.previous.filled_quantity == 4
+        assert result.order is not None and result.order.quantity == 6
+
+    def test_order_filled_during_cancel_is_not_replaced(self, httpx_mock: HTTPXMock) -> None:
+        _gone(httpx_mock, status="FILLED", filledQuantity=ORDER_JSON["quantity"])
+        result = Trading212Client("key", "secret").orders.replace(ORDER_ID, _limit(101.0))
+        assert result.order is None
+        assert result.previous is not None and result.previous.status == OrderStatus.FILLED
+        assert not httpx_mock.get_requests(method="POST")
+
+    @pytest.mark.parametrize(("filled", "placed"), [(0.0, -10.0), (2.5, -7.5)])
+    async def test_cancelled_order_found_in_history(
+        self, httpx_mock: HTTPXMock, filled: float, placed: float
+    ) -> None:
+        _gone(httpx_mock, status="CANCELLED", filledQuantity=filled)
+        httpx_mock.add_response(method="POST", url=f"{ORDERS_URL}/limit", json=ORDER_JSON)
+        async with AsyncTrading212Client("key", "secret") as client:
+            result = await client.orders.replace(ORDER_ID, _limit(99.0, quantity=-10))
+        assert result.previous is not None and result.previous.status == OrderStatus.CANCELLED
+        assert result.order is not None
+        (post,) = httpx_mock.get_requests(method="POST")
+        assert json.loads(post.content)["quantity"] == placed
+
+    async def test_waits_out_cancelling(self) -> None:
+        exchange = SimulatedExchange(cancel_delay=0.1)
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            old = (await client.orders.place_limit(_limit(100.0))).data
+            result = await client.orders.replace(old.id, _limit(99.0))
+        assert result.previous is not None and result.previous.status == OrderStatus.CANCELLED
+        assert result.order is not None
+        assert result.cancel_confirmed >= 0.1
+
+    async def test_gives_up_after_timeout(self) -> None:
+        exchange = SimulatedExchange(cancel_delay=10.0)
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            old = (await client.orders.place_limit(_limit(100.0))).data
+            result = await client.orders.replace(old.id, _limit(99.0), timeout=0.1)
+        assert result.order is None
+        assert result.previous is not None
+        assert result.previous.status == OrderStatus.CANCELLING
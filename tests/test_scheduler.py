@@ -0,0 +1,63 @@
+"""Tests for the budget-aware poll scheduler."""
+import asyncio
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, Feed, RateLimitError, RateLimitInfo
+
+from .conftest import ACCOUNT_SUMMARY_JSON, DEMO_URL, POSITION_JSON, RATE_LIMIT_HEADERS
+
+SUMMARY_URL = f"{DEMO_URL}/api/v0/equity/account/summary"
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+
+
+class TestPollScheduler:
+    async def test_subscribers_share_one_fetch(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL, json=[POSITION_JSON], headers=RATE_LIMIT_HEADERS
+        )
+        async with AsyncTrading212Client("key", "secret") as client:
+            first = client.scheduler.subscribe(Feed.POSITIONS, max_age=30.0)
+            second = client.scheduler.subscribe(Feed.POSITIONS, max_age=60.0)
+            a, b = await asyncio.wait_for(asyncio.gather(anext(first), anext(second)), 1.0)
+        assert a is b
+        assert a.data[0].quantity == 5.0
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_fresh_response_served_to_late_subscriber(
+        self, httpx_mock: HTTPXMock
+    ) -> None:
+        httpx_mock.add_response(
+            url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON, headers=RATE_LIMIT_HEADERS
+        )
+        async with AsyncTrading212Client("key", "secret") as client:
+            early = client.scheduler.subscribe(Feed.SUMMARY, max_age=30.0)
+            await asyncio.wait_for(anext(early), 1.0)
+            late = client.scheduler.subscribe(Feed.SUMMARY, max_age=30.0)
+            response = await asyncio.wait_for(anext(late), 1.0)
+        assert response.data.currency == "GBP"
+        assert len(httpx_mock.get_requests()) == 1
+
+    async def test_interval_respects_endpoint_limit(self) -> None:
+        async with AsyncTrading212Client("key", "secret") as client:
+            client.scheduler.subscribe(Feed.SUMMARY, max_age=0.1)
+            # GET /account/summary is limited to 1 req / 5s.
+            assert client.scheduler.next_interval(Feed.SUMMARY) == 5.0
+
+    async def test_interval_backs_off_when_budget_is_low(self) -> None:
+        async with AsyncTrading212Client("key", "secret") as client:
+            client.scheduler.subscribe(Feed.POSITIONS, max_age=10.0)
+            assert client.scheduler.next_interval(Feed.POSITIONS) == 10.0
+            client._engine.rate_limit_store.set(
+                "GET /api/v0/equity/positions",
+                RateLimitInfo(limit=10, period=60, remaining=1, reset=None, used=9),
+            )
+            assert client.scheduler.next_interval(Feed.POSITIONS) == 20.0
+
+    async def test_errors_are_delivered(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=POSITIONS_URL, status_code=429, text="Limited: 1 / 1s")
+        async with AsyncTrading212Client("key", "secret") as client:
+            subscription = client.scheduler.subscribe(Feed.POSITIONS, max_age=1.0)
+            with pytest.raises(RateLimitError):
+                await asyncio.wait_for(anext(subscription), 1.0)
@@ -0,0 +1,60 @@
+"""Tests for the composite account snapshot."""
+import threading
+
+import httpx
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, Trading212Client
+
+from .conftest import ACCOUNT_SUMMARY_JSON, DEMO_URL, ORDER_JSON, POSITION_JSON
+
+SUMMARY_URL = f"{DEMO_URL}/api/v0/equity/account/summary"
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+ORDERS_URL = f"{DEMO_URL}/api/v0/equity/orders"
+
+OTHER_ORDER_JSON = {**ORDER_JSON, "id": 1, "ticker": "MSFT_US_EQ"}
+
+
+def _mock_account(httpx_mock: HTTPXMock) -> None:
+    httpx_mock.add_response(url=SUMMARY_URL, json=ACCOUNT_SUMMARY_JSON)
+    httpx_mock.add_response(url=POSITIONS_URL, json=[POSITION_JSON])
+    httpx_mock.add_response(url=ORDERS_URL, json=[ORDER_JSON, OTHER_ORDER_JSON])
+
+
+class TestSnapshot:
+    def test_sync_requests_are_concurrent(self, httpx_mock: HTTPXMock) -> None:
+        barrier = threading.Barrier(3, timeout=2.0)
+        bodies = {
+            SUMMARY_URL: ACCOUNT_SUMMARY_JSON,
+            POSITIONS_URL: [POSITION_JSON],
+            ORDERS_URL: [ORDER_JSON, OTHER_ORDER_JSON],
+        }
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            barrier.wait()  # only passes once all three requests are in flight
+            return httpx.Response(200, json=bodies[str(request.url)])
+
+        httpx_mock.add_callback(respond, is_reusable=True)
+        snapshot = Trading212Client("key", "secret").snapshot()
+        assert snapshot.summary.currency == "GBP"
+        assert len(snapshot.positions) == 1
+        assert len(snapshot.orders) == 2
+        assert snapshot.requested_at <= min(
+            snapshot.summary_at, snapshot.positions_at, snapshot.orders_at
+        )
+
+    def test_positions_joined_to_orders(self, httpx_mock: HTTPXMock) -> None:
+        _mock_account(httpx_mock)
+        views = Trading212Client("key", "secret").snapshot().by_ticker
+        assert views["AAPL_US_EQ"].position is not None
+        assert [o.id for o in views["AAPL_US_EQ"].orders] == [ORDER_JSON["id"]]
+        assert views["MSFT_US_EQ"].position is None
+        assert [o.id for o in views["MSFT_US_EQ"].orders] == [1]
+
+    async def test_async_snapshot(self, httpx_mock: HTTPXMock) -> None:
+        _mock_account(httpx_mock)
+        async with AsyncTrading212Client("key", "secret") as client:
+            snapshot = await client.snapshot()
+        assert snapshot.summary.currency == "GBP"
+        assert snapshot.skew.total_seconds() >= 0
+        assert set(snapshot.by_ticker) == {"AAPL_US_EQ", "MSFT_US_EQ"}
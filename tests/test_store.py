@@ -0,0 +1,94 @@
+"""Tests for the write-through order store."""
+import time
+
+from pytest_httpx import HTTPXMock
+
+from t212 import AsyncTrading212Client, OrderStore, Trading212Client
+from t212.models.enums import OrderStatus
+from t212.models.orders import MarketOrderRequest, Order
+from t212.store import valid_transition
+
+from .conftest import DEMO_URL, ORDER_JSON
+
+ORDERS_URL = f"{DEMO_URL}/api/v0/equity/orders"
+ORDER_ID = ORDER_JSON["id"]
+
+
+def _order(status: OrderStatus, order_id: int = 1, **fields: object) -> Order:
+    return Order.model_validate({**ORDER_JSON, "id": order_id, "status": status, **fields})
+
+
+class TestTransitions:
+    def test_forward_moves_are_valid(self) -> None:
+        assert valid_transition(OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED)
+        assert valid_transition(OrderStatus.CANCELLING, OrderStatus.FILLED)
+        assert valid_transition(OrderStatus.NEW, OrderStatus.NEW)
+
+    def test_backward_moves_are_invalid(self) -> None:
+        assert not valid_transition(OrderStatus.CANCELLED, OrderStatus.NEW)
+        assert not valid_transition(OrderStatus.PARTIALLY_FILLED, OrderStatus.NEW)
+        assert not valid_transition(OrderStatus.FILLED, OrderStatus.CANCELLED)
+
+
+class TestOrderStore:
+    def test_stale_snapshot_is_dropped(self) -> None:
+        store = OrderStore()
+        assert store.apply(_order(OrderStatus.CANCELLED))
+        assert not store.apply(_order(OrderStatus.NEW))
+        stored = store.get(1)
+        assert stored is not None and stored.status == OrderStatus.CANCELLED
+
+    def test_freshness(self) -> None:
+        store = OrderStore()
+        store.apply(_order(OrderStatus.NEW))
+        assert store.get(1, max_age=60.0) is not None
+        assert store.get(1, max_age=-1.0) is None
+        store.apply(_order(OrderStatus.FILLED))
+        assert store.get(1, max_age=-1.0) is not None  # terminal orders never go stale
+
+    def test_closed_orders_are_evicted(self) -> None:
+        store = OrderStore(max_closed=2)
+        store.apply(_order(OrderStatus.NEW, order_id=1))
+        for order_id in (2, 3, 4):
+            store.apply(_order(OrderStatus.FILLED, order_id=order_id))
+        assert 2 not in store
+        assert all(order_id in store for order_id in (1, 3, 4))
+        assert [o.id for o in store.open_orders()] == [1]
+
+    def test_reconcile_forgets_orders_no_longer_listed(self) -> None:
+        store = OrderStore()
+        store.apply(_order(OrderStatus.NEW, order_id=1))
+        store.apply(_order(OrderStatus.FILLED, order_id=2))
+        since = time.monotonic()
+        store.apply(_order(OrderStatus.NEW, order_id=3))  # placed while the list was in flight
+        store.reconcile([_order(OrderStatus.NEW, order_id=4)], since)
+        assert 1 not in store
+        assert [o.id for o in store.open_orders()] == [3, 4]
+        assert 2 in store
+
+
+class TestWriteThrough:
+    def test_place_then_lookup_reads_from_memory(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=f"{ORDERS_URL}/market", json=ORDER_JSON)
+        client = Trading212Client("key", "secret")
+        placed = client.orders.place_market(MarketOrderRequest(ticker="AAPL_US_EQ", quantity=1))
+        assert client.orders.lookup(ORDER_ID) == placed.data
+        assert len(httpx_mock.get_requests()) == 1
+
+    def test_cancel_marks_cancelling(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=ORDERS_URL, json=[ORDER_JSON])
+        httpx_mock.add_response(method="DELETE", url=f"{ORDERS_URL}/{ORDER_ID}")
+        client = Trading212Client("key", "secret")
+        client.orders.list()
+        client.orders.cancel(ORDER_ID)
+        stored = client.orders.store.get(ORDER_ID)
+        assert stored is not None and stored.status == OrderStatus.CANCELLING
+
+    async def test_stale_entry_is_refetched(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=f"{ORDERS_URL}/{ORDER_ID}", json=ORDER_JSON, is_reusable=True)
+        async with AsyncTrading212Client("key", "secret") as client:
+            await client.orders.lookup(ORDER_ID)
+            await client.orders.lookup(ORDER_ID, max_age=60.0)
+            assert len(httpx_mock.get_requests()) == 1
+            await client.orders.lookup(ORDER_ID, max_age=-1.0)
+            assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,81 @@
+"""Tests for sharing one sync client across threads."""
+import threading
+import time
+
+import httpx
+from pytest_httpx import HTTPXMock
+
+from t212 import Priority, Trading212Client
+
+from .conftest import DEMO_URL, ORDER_JSON, POSITION_JSON
+
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+
+
+class _Concurrency:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(self.delay)
+        with self._lock:
+            self.current -= 1
+        order_id = int(request.url.path.rsplit("/", 1)[1])
+        return httpx.Response(200, json={**ORDER_JSON, "id": order_id})
+
+
+class TestMap:
+    def test_results_in_input_order(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_callback(_Concurrency(0.01), is_reusable=True)
+        client = Trading212Client("key", "secret")
+        ids = list(range(1, 21))
+        orders = client.map(lambda i: client.orders.get(i).data, ids)
+        assert [order.id for order in orders] == ids
+
+    def test_runs_in_parallel_within_max_in_flight(self, httpx_mock: HTTPXMock) -> None:
+        tracker = _Concurrency(0.02)
+        httpx_mock.add_callback(tracker, is_reusable=True)
+        client = Trading212Client("key", "secret", max_in_flight=3)
+        client.map(lambda i: client.orders.get(i), range(1, 13), max_workers=8)
+        assert tracker.peak == 3
+
+    def test_context_is_propagated(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_callback(_Concurrency(0.0), is_reusable=True)
+        client = Trading212Client("key", "secret")
+        seen: list[Priority] = []
+        original = client._engine.gate.slot
+
+        def slot(priority: Priority):  # type: ignore[no-untyped-def]
+            seen.append(priority)
+            return original(priority)
+
+        client._engine.gate.slot = slot  # type: ignore[method-assign]
+        with client.prioritized(Priority.BULK):
+            client.map(lambda i: client.orders.get(i), [1, 2])
+        assert seen == [Priority.BULK, Priority.BULK]
+
+
+class TestThreadMetrics:
+    def test_requests_are_counted_per_thread(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=POSITIONS_URL, json=[POSITION_JSON], is_reusable=True)
+        client = Trading212Client("key", "secret")
+        threads = [
+            threading.Thread(target=lambda: [client.positions.get() for _ in range(5)], name=n)
+            for n in ("worker-a", "worker-b")
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        metrics = client.metrics()
+        assert metrics.threads["worker-a"].requests == 5
+        assert metrics.threads["worker-b"].requests == 5
+        assert metrics.requests == 10
+        assert metrics.errors == 0
+        assert metrics.threads["worker-a"].mean_latency is not None
@@ -0,0 +1,230 @@
+"""Tests for the snapshot-diffing order and positions trackers."""
+import pytest
+from pytest_httpx import HTTPXMock
+
+from t212 import (
+    AsyncOrderTracker,
+    AsyncPositionsTracker,
+    AsyncTrading212Client,
+    Environment,
+    OrderEventType,
+    OrderTracker,
+    PositionEventType,
+    PositionsTracker,
+    Trading212Client,
+)
+from t212.models.orders import Order
+
+from .conftest import DEMO_URL, ORDER_JSON, POSITION_JSON, RATE_LIMIT_HEADERS
+
+ORDERS_URL = f"{DEMO_URL}/api/v0/equity/orders"
+POSITIONS_URL = f"{DEMO_URL}/api/v0/equity/positions"
+HISTORY_URL = f"{DEMO_URL}/api/v0/equity/history/orders?limit=50"
+
+
+def _order(order_id: int, **overrides: object) -> dict[str, object]:
+    return {**ORDER_JSON, "id": order_id, **overrides}
+
+
+def _history(*orders: dict[str, object]) -> dict[str, object]:
+    return {"items": [{"order": order} for order in orders], "nextPagePath": None}
+
+
+@pytest.fixture
+def client() -> Trading212Client:
+    return Trading212Client("key", "secret", env=Environment.DEMO)
+
+
+class TestOrderTracker:
+    def test_first_poll_emits_new(self, client: Trading212Client, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=ORDERS_URL, json=[_order(1), _order(2)], headers=RATE_LIMIT_HEADERS
+        )
+        tracker = OrderTracker(client.orders)
+        events = tracker.poll()
+        assert [e.type for e in events] == [OrderEventType.NEW, OrderEventType.NEW]
+        assert set(tracker.orders) == {1, 2}
+
+    def test_unchanged_snapshot_emits_nothing(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        httpx_mock.add_response(
+            url=ORDERS_URL, json=[_order(1)], headers=RATE_LIMIT_HEADERS, is_reusable=True
+        )
+        tracker = OrderTracker(client.orders)
+        tracker.poll()
+        assert tracker.poll() == []
+
+    def test_partial_fill_and_status_change(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        tracker = OrderTracker(client.orders)
+        tracker.track(Order.model_validate(_order(1)))
+        tracker.track(Order.model_validate(_order(2)))
+        httpx_mock.add_response(
+            url=ORDERS_URL,
+            json=[
+                _order(1, status="PARTIALLY_FILLED", filledQuantity=0.5),
+                _order(2, status="CANCELLING"),
+            ],
+            headers=RATE_LIMIT_HEADERS,
+        )
+        events = {e.order.id: e for e in tracker.poll()}
+        assert events[1].type == OrderEventType.PARTIALLY_FILLED
+        assert events[1].previous is not None
+        assert events[1].previous.filled_quantity == 0.0
+        assert events[2].type == OrderEventType.UPDATED
+
+    def test_vanished_order_resolved_from_history(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        tracker = OrderTracker(client.orders)
+        tracker.track(Order.model_validate(_order(1)))
+        httpx_mock.add_response(url=ORDERS_URL, json=[], headers=RATE_LIMIT_HEADERS)
+        httpx_mock.add_response(
+            url=HISTORY_URL,
+            json=_history(_order(2), _order(1, status="FILLED", filledQuantity=1.0)),
+            headers=RATE_LIMIT_HEADERS,
+        )
+        events = tracker.poll()
+        assert [e.type for e in events] == [OrderEventType.FILLED]
+        assert tracker.orders == {}
+
+    def test_vanished_order_not_found_is_closed(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        tracker = OrderTracker(client.orders)
+        tracker.track(Order.model_validate(_order(1)))
+        httpx_mock.add_response(url=ORDERS_URL, json=[], headers=RATE_LIMIT_HEADERS)
+        httpx_mock.add_response(url=HISTORY_URL, json=_history(), headers=RATE_LIMIT_HEADERS)
+        events = tracker.poll()
+        assert [e.type for e in events] == [OrderEventType.CLOSED]
+        assert events[0].order.id == 1
+
+    def test_vanished_orders_share_one_history_search(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        tracker = OrderTracker(client.orders)
+        for order_id in (1, 2, 3):
+            tracker.track(Order.model_validate(_order(order_id)))
+        httpx_mock.add_response(url=ORDERS_URL, json=[], headers=RATE_LIMIT_HEADERS)
+        httpx_mock.add_response(
+            url=HISTORY_URL,
+            json=_history(_order(2, status="CANCELLED"), _order(1, status="FILLED")),
+            headers=RATE_LIMIT_HEADERS,
+        )
+        events = {e.order.id: e.type for e in tracker.poll()}
+        assert events == {
+            1: OrderEventType.FILLED,
+            2: OrderEventType.CANCELLED,
+            3: OrderEventType.CLOSED,
+        }
+        assert len(httpx_mock.get_requests(url=HISTORY_URL)) == 1
+        assert tracker.orders == {}
+
+    def test_poll_without_lookup_defers_vanished_orders(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        tracker = OrderTracker(client.orders)
+        tracker.track(Order.model_validate(_order(1)))
+        httpx_mock.add_response(url=ORDERS_URL, json=[], headers=RATE_LIMIT_HEADERS)
+        assert tracker.poll(lookup=False) == []
+        assert set(tracker.orders) == {1}
+
+
+class TestAsyncOrderTracker:
+    async def test_poll(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=ORDERS_URL,
+            json=[_order(1, status="REJECTED")],
+            headers=RATE_LIMIT_HEADERS,
+        )
+        async with AsyncTrading212Client("key", "secret") as client:
+            tracker = AsyncOrderTracker(client.orders)
+            events = await tracker.poll()
+        assert [e.type for e in events] == [OrderEventType.REJECTED]
+        assert tracker.orders == {}
+
+    async def test_vanished_order_resolved_from_history(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(url=ORDERS_URL, json=[], headers=RATE_LIMIT_HEADERS)
+        httpx_mock.add_response(
+            url=HISTORY_URL,
+            json=_history(_order(1, status="CANCELLED")),
+            headers=RATE_LIMIT_HEADERS,
+        )
+        async with AsyncTrading212Client("key", "secret") as client:
+            tracker = AsyncOrderTracker(client.orders)
+            tracker.track(Order.model_validate(_order(1)))
+            events = await tracker.poll()
+        assert [e.type for e in events] == [OrderEventType.CANCELLED]
+
+
+def _position(ticker: str, **overrides: object) -> dict[str, object]:
+    instrument = {**POSITION_JSON["instrument"], "ticker": ticker}
+    return {**POSITION_JSON, "instrument": instrument, **overrides}
+
+
+class TestPositionsTracker:
+    def test_opened_and_totals(self, client: Trading212Client, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL,
+            json=[_position("AAPL_US_EQ"), _position("MSFT_US_EQ")],
+            headers=RATE_LIMIT_HEADERS,
+        )
+        tracker = PositionsTracker(client.positions)
+        events = tracker.poll()
+        assert [e.type for e in events] == [PositionEventType.OPENED] * 2
+        assert tracker.totals.positions == 2
+        assert tracker.totals.current_value == pytest.approx(2 * 877.50)
+        assert tracker.totals.unrealized_profit_loss == pytest.approx(2 * 126.25)
+
+    def test_emits_only_deltas(self, client: Trading212Client, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL,
+            json=[_position("AAPL_US_EQ"), _position("MSFT_US_EQ"), _position("TSLA_US_EQ")],
+            headers=RATE_LIMIT_HEADERS,
+        )
+        moved_impact = {**POSITION_JSON["walletImpact"], "currentValue": 1000.0}
+        httpx_mock.add_response(
+            url=POSITIONS_URL,
+            json=[
+                _position("AAPL_US_EQ", quantity=6.0),
+                _position("MSFT_US_EQ", currentPrice=200.0, walletImpact=moved_impact),
+            ],
+            headers=RATE_LIMIT_HEADERS,
+        )
+        tracker = PositionsTracker(client.positions, price_threshold=0.05)
+        tracker.poll()
+        events = {e.ticker: e.type for e in tracker.poll()}
+        assert events == {
+            "AAPL_US_EQ": PositionEventType.QUANTITY_CHANGED,
+            "MSFT_US_EQ": PositionEventType.PRICE_MOVED,
+            "TSLA_US_EQ": PositionEventType.CLOSED,
+        }
+        assert tracker.totals.positions == 2
+        assert tracker.totals.current_value == pytest.approx(877.50 + 1000.0)
+
+    def test_small_price_move_is_quiet(
+        self, client: Trading212Client, httpx_mock: HTTPXMock
+    ) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL, json=[_position("AAPL_US_EQ")], headers=RATE_LIMIT_HEADERS
+        )
+        httpx_mock.add_response(
+            url=POSITIONS_URL,
+            json=[_position("AAPL_US_EQ", currentPrice=176.0)],
+            headers=RATE_LIMIT_HEADERS,
+        )
+        tracker = PositionsTracker(client.positions, price_threshold=0.01)
+        tracker.poll()
+        assert tracker.poll() == []
+        assert tracker.positions["AAPL_US_EQ"].current_price == 176.0
+
+    async def test_async_poll(self, httpx_mock: HTTPXMock) -> None:
+        httpx_mock.add_response(
+            url=POSITIONS_URL, json=[_position("AAPL_US_EQ")], headers=RATE_LIMIT_HEADERS
+        )
+        async with AsyncTrading212Client("key", "secret") as client:
+            tracker = AsyncPositionsTracker(client.positions)
+            events = await tracker.poll()
+        assert [e.ticker for e in events] == ["AAPL_US_EQ"]
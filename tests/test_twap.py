@@ -0,0 +1,144 @@
+"""Tests for the TWAP slice executor, run against the simulated exchange."""
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+
+from t212 import (
+    AsyncTrading212Client,
+    SimulatedExchange,
+    TwapExecutor,
+    TwapOrder,
+    TwapProgress,
+)
+from t212.models.orders import MarketOrderRequest, Order
+
+from .conftest import ORDER_JSON
+
+TICKER = "AAPL_US_EQ"
+HISTORY_KEY = "GET /api/v0/equity/history/orders"
+
+
+class _LaggingHistory(SimulatedExchange):
+    """An exchange whose order history is empty for the first ``lag`` requests."""
+
+    def __init__(self, lag: int) -> None:
+        super().__init__()
+        self.lag = lag
+
+    def _history_page(self, params: httpx.QueryParams) -> dict[str, Any]:
+        if self.lag > 0:
+            self.lag -= 1
+            return {"items": [], "nextPagePath": None}
+        return super()._history_page(params)
+
+
+def _executor(client: AsyncTrading212Client, max_pending: int = 50) -> TwapExecutor:
+    executor = TwapExecutor(client.orders, poll_interval=0.01, max_pending_per_ticker=max_pending)
+    executor.spacing = 0.0  # don't pace at the real market-order limit in tests
+    return executor
+
+
+class TestTwap:
+    async def test_slices_fill_parent(self) -> None:
+        exchange = SimulatedExchange()
+        exchange.set_price(TICKER, 100.0)
+        updates: list[TwapProgress] = []
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            executor = _executor(client)
+            twap = executor.execute(
+                MarketOrderRequest(ticker=TICKER, quantity=-10),
+                horizon=0.1,
+                slices=3,
+                step=1.0,
+                on_progress=updates.append,
+            )
+            async with asyncio.timeout(2.0):
+                progress = await twap.wait()
+            await executor.aclose()
+        assert progress.done
+        assert progress.filled_quantity == 10
+        assert progress.average_price == pytest.approx(100.0)
+        assert [abs(c.quantity) for c in twap.children.values()] == [3, 3, 4]
+        assert all(c.quantity < 0 for c in twap.children.values())
+        assert updates[-1] == progress
+
+    async def test_remaining_slices_adapt_to_short_fills(self) -> None:
+        exchange = SimulatedExchange()
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            executor = _executor(client)
+            twap = executor.execute(
+                MarketOrderRequest(ticker=TICKER, quantity=10), horizon=0.3, slices=2
+            )
+            await asyncio.sleep(0.05)
+            (first,) = twap.children
+            exchange.fill(first, quantity=2, price=50.0)
+            await client.orders.cancel(first)  # the rest of the slice goes unfilled
+            exchange.set_price(TICKER, 60.0)
+            async with asyncio.timeout(2.0):
+                progress = await twap.wait()
+            await executor.aclose()
+        assert [c.quantity for c in twap.children.values()] == [5, 8]
+        assert progress.filled_quantity == 10
+        assert progress.average_price == pytest.approx((2 * 50 + 8 * 60) / 10)
+
+    async def test_pending_cap_per_ticker(self) -> None:
+        exchange = SimulatedExchange()
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            executor = _executor(client, max_pending=2)
+            twap = executor.execute(
+                MarketOrderRequest(ticker=TICKER, quantity=4), horizon=0.0, slices=4
+            )
+            await asyncio.sleep(0.1)
+            assert twap.slices_sent == 2  # unfilled children hold the ticker at its cap
+            exchange.set_price(TICKER, 10.0)
+            async with asyncio.timeout(2.0):
+                progress = await twap.wait()
+            await executor.aclose()
+        assert progress.slices_sent == 4
+        assert progress.filled_quantity == 4
+
+    async def test_lagging_history_is_retried_with_back_off(self) -> None:
+        exchange = _LaggingHistory(lag=2)
+        exchange.set_price(TICKER, 100.0)
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            executor = _executor(client)
+            twap = executor.execute(
+                MarketOrderRequest(ticker=TICKER, quantity=2), horizon=0.0, slices=1
+            )
+            async with asyncio.timeout(2.0):
+                progress = await twap.wait()
+            await executor.aclose()
+        assert progress.filled_quantity == 2
+        assert progress.average_price == pytest.approx(100.0)
+        assert exchange.requests.count(HISTORY_KEY) == 3
+        assert twap.unknown == set()
+
+    async def test_child_missing_from_history_is_given_up_as_unknown(self) -> None:
+        exchange = _LaggingHistory(lag=100)
+        async with AsyncTrading212Client("key", "secret", transport=exchange) as client:
+            executor = _executor(client)
+            twap = executor.execute(
+                MarketOrderRequest(ticker=TICKER, quantity=2), horizon=0.0, slices=1
+            )
+            await asyncio.sleep(0.05)
+            (child,) = twap.children
+            await client.orders.cancel(child)
+            async with asyncio.timeout(2.0):
+                progress = await twap.wait()
+            await executor.aclose()
+        assert twap.unknown == {child}
+        assert progress.unknown_quantity == 2
+        assert progress.pending_quantity == 0
+        assert progress.remaining_quantity == 0
+        assert exchange.requests.count(HISTORY_KEY) == 5
+
+    def test_average_price_unknown_without_fills(self) -> None:
+        parent = MarketOrderRequest(ticker=TICKER, quantity=2)
+        twap = TwapOrder(parent, horizon=1.0, slices=1, step=None, on_progress=None)
+        child = Order.model_validate({**ORDER_JSON, "status": "FILLED", "filledQuantity": 2.0})
+        twap.children[ORDER_JSON["id"]] = child
+        progress = twap.progress
+        assert progress.filled_quantity == 2.0
+        assert progress.average_price is None